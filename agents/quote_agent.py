@@ -4,17 +4,30 @@ and returns STRICT JSON {"customer", "items", "total"}.
 """
 
 import json
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List
 
 from langchain.memory import ConversationBufferMemory
 
-from .weblink_agent import index_issue, query_related
+from .weblink_agent import index_issue, index_issues, query_related, query_related_batch
 
 from logic.job_parser import parse_followup, parse_prompt
 from logic.pricing_rules import calculate_price
 from modular_ai_agent.agents.base_agent import get_llm
 
 
+def quote_result(scope: Dict[str, Any]) -> Dict[str, Any]:
+    """Price ``scope`` and return the quote dict shared by every entry point."""
+    pricing = calculate_price(scope)
+    result = {
+        "customer": "Test Customer",
+        "items": pricing["items"],
+        "total": pricing["total"],
+    }
+    if "memory_result" in pricing:
+        result["memory_result"] = pricing["memory_result"]
+    return result
+
+
 class QuoteAgent:
     """Stateful quote agent keeping short conversation history."""
 
@@ -39,15 +52,7 @@ class QuoteAgent:
         self._last_issue = issue
 
         self.memory.chat_memory.add_user_message(prompt)
-        customer = "Test Customer"
-        pricing = calculate_price(scope)
-        result = {
-            "customer": customer,
-            "items": pricing["items"],
-            "total": pricing["total"],
-        }
-        if "memory_result" in pricing:
-            result["memory_result"] = pricing["memory_result"]
+        result = quote_result(scope)
 
         response = json.dumps(result)
         self.memory.chat_memory.add_ai_message(response)
@@ -67,3 +72,33 @@ def run_quote(prompt: str) -> str:
     data = json.loads(output)
     assert all(k in data for k in ("customer", "items", "total"))
     return output
+
+
+def run_quote_batch(prompts: List[str]) -> List[Dict[str, Any]]:
+    """Quote independent prompts together; one result dict per prompt.
+
+    Each prompt is a fresh conversation, like `run_quote`. Issues are indexed
+    and looked up with one embedding call for the whole batch, and failures
+    are returned as ``{"error": message}`` in place of that prompt's quote.
+    If indexing or the related lookup fails, quotes come back with no
+    related links.
+    """
+    results: List[Dict[str, Any]] = [{} for _ in prompts]
+    ok: List[int] = []
+    for i, prompt in enumerate(prompts):
+        try:
+            results[i] = quote_result(parse_prompt(prompt))
+        except Exception as exc:
+            results[i] = {"error": str(exc)}
+            continue
+        ok.append(i)
+
+    descs = [prompts[i] for i in ok]
+    try:
+        index_issues([{"description": d} for d in descs])
+        related = [[list(pair) for pair in r] for r in query_related_batch(descs)]
+    except Exception:
+        related = [[] for _ in descs]
+    for i, links in zip(ok, related):
+        results[i]["related"] = links
+    return results
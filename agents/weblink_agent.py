@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import numpy as np
-
-from modular_ai_agent.memory.memory_setup import _get_embeddings
+from .weblink_index import IssueIndex
+from .weblink_store import SegmentStore
 
 CONFIG_PATH = Path(__file__).parent.parent / "configs" / "weblink.json"
 GRAPH_PATH = Path(os.getenv("WEBLINK_GRAPH_PATH", "storage/weblink_graph.json"))
+# Append-only segment files; GRAPH_PATH is only read to migrate old graphs.
+GRAPH_DIR = Path(os.getenv("WEBLINK_GRAPH_DIR", str(GRAPH_PATH.with_suffix(""))))
+
+# Embedder and graph are created on first use so importing this module (and
+# everything that imports ``agents.quote_agent``) stays cheap. ``_lock`` is
+# re-entrant: the graph loads (under it) through `_get_store`, which takes it.
+_lock = threading.RLock()
+_write_lock = threading.Lock()
+_config: Optional[Dict[str, Any]] = None
+_embedder: Any = None
+_wrap: Optional[Callable[[Any], Any]] = None
+_index: Optional[IssueIndex] = None
+_store: Optional[SegmentStore] = None
 
 
 def _load_config() -> Dict[str, Any]:
@@ -20,64 +34,165 @@ def _load_config() -> Dict[str, Any]:
     return {"top_k": 3}
 
 
-_config = _load_config()
-DEFAULT_TOP_K = int(_config.get("top_k", 3))
+def _get_config() -> Dict[str, Any]:
+    global _config
+    if _config is None:
+        _config = _load_config()
+    return _config
+
+
+def _default_top_k() -> int:
+    return int(_get_config().get("top_k", 3))
+
+
+def _get_embedder() -> Any:
+    """Return the process-wide embedder, creating it on first use."""
+    global _embedder
+    if _embedder is None:
+        with _lock:
+            if _embedder is None:
+                from modular_ai_agent.memory.memory_setup import _get_embeddings
+
+                embedder = _get_embeddings()
+                _embedder = _wrap(embedder) if _wrap is not None else embedder
+    return _embedder
+
+
+def configure_embedder(wrap: Callable[[Any], Any]) -> Any:
+    """Route the embedder through ``wrap``; return it if already created.
+
+    The wrapper is applied now if the embedder exists, otherwise when it is
+    first created, so configuring never loads the model. Used by the API to
+    route queries through a shared micro-batcher.
+    """
+    global _embedder, _wrap
+    with _lock:
+        _wrap = wrap
+        if _embedder is not None:
+            _embedder = wrap(_embedder)
+        return _embedder
+
 
-_embedder = _get_embeddings()
-_nodes: Dict[str, Dict[str, Any]] = {}
+def current_embedder() -> Any:
+    """Return the embedder if it has been created, else None."""
+    return _embedder
 
 
-def _load_graph() -> None:
-    global _nodes
-    if GRAPH_PATH.exists():
+def reset_embedder() -> Any:
+    """Drop the embedder and its wrapper; return the old one to close it."""
+    global _embedder, _wrap
+    with _lock:
+        embedder, _embedder, _wrap = _embedder, None, None
+        return embedder
+
+
+def warm_up() -> None:
+    """Create the embedder now so the first query does not pay for it."""
+    _get_embedder()
+
+
+def _get_store() -> SegmentStore:
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                cfg = _get_config()
+                store = SegmentStore(
+                    GRAPH_DIR,
+                    fsync_every=int(cfg.get("fsync_every", 32)),
+                    fsync_interval=float(cfg.get("fsync_interval", 1.0)),
+                    compact_ratio=float(cfg.get("compact_ratio", 0.5)),
+                )
+                atexit.register(store.close)
+                _store = store
+    return _store
+
+
+def _load_graph() -> IssueIndex:
+    store = _get_store()
+    ann_threshold = _get_config().get("ann_threshold")
+    if not store.exists() and GRAPH_PATH.exists():
+        # One-time migration from the legacy JSON graph.
         with open(GRAPH_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
-            _nodes = data.get("nodes", {})
-    else:
-        _nodes = {}
+        return store.import_nodes(data.get("nodes", {}), ann_threshold)
+    return store.load(ann_threshold)
 
 
-def _save_graph() -> None:
-    GRAPH_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(GRAPH_PATH, "w", encoding="utf-8") as f:
-        json.dump({"nodes": _nodes}, f)
+def _get_index() -> IssueIndex:
+    """Return the issue index, loading it from disk on first use."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = _load_graph()
+    return _index
 
 
-_load_graph()
+def _insert_locked(issue: Dict[str, Any], desc: str, emb: List[float]) -> None:
+    global _index
+    store = _get_store()
+    index = _get_index()
+    issue_id = str(issue.get("id", len(index) + 1))
+    vec = index.add(issue_id, desc, emb)
+    store.append(issue_id, desc, vec)
+    if store.should_compact(index):
+        _index = store.compact(index)
 
 
 def index_issue(issue: Dict[str, Any]) -> None:
     """Add ``issue`` to the graph with its embedding."""
-    issue_id = str(issue.get("id", len(_nodes) + 1))
     desc = str(issue.get("description", ""))
-    emb = _embedder.embed_query(desc)
-    _nodes[issue_id] = {"snippet": desc, "embedding": emb}
-    _save_graph()
+    emb = _get_embedder().embed_query(desc)
+    with _write_lock:
+        _insert_locked(issue, desc, emb)
 
 
-def _cosine(a: np.ndarray, b: np.ndarray) -> float:
-    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
-    if denom == 0:
-        return 0.0
-    return float(np.dot(a, b) / denom)
+def index_issues(issues: List[Dict[str, Any]]) -> None:
+    """Add several issues, embedding their descriptions in one call."""
+    if not issues:
+        return
+    descs = [str(issue.get("description", "")) for issue in issues]
+    embs = _get_embedder().embed_documents(descs)
+    with _write_lock:
+        for issue, desc, emb in zip(issues, descs, embs):
+            _insert_locked(issue, desc, emb)
+
+
+def flush() -> None:
+    """Force pending graph appends to disk."""
+    if _store is not None:
+        _store.flush()
 
 
 def query_related(text: str, top_k: int | None = None) -> List[Tuple[str, str]]:
     """Return related node IDs and snippets for ``text``."""
     if top_k is None:
-        top_k = DEFAULT_TOP_K
-    if not _nodes:
+        top_k = _default_top_k()
+    index = _get_index()
+    if not len(index):
         return []
-    query_emb = np.array(_embedder.embed_query(text))
-    scores = []
-    for node_id, data in _nodes.items():
-        emb = np.array(data["embedding"])
-        scores.append((node_id, _cosine(query_emb, emb)))
-    scores.sort(key=lambda x: x[1], reverse=True)
-    result: List[Tuple[str, str]] = []
-    for node_id, _ in scores[:top_k]:
-        result.append((node_id, _nodes[node_id]["snippet"]))
-    return result
-
-
-__all__ = ["index_issue", "query_related"]
+    return index.search(_get_embedder().embed_query(text), top_k)
+
+
+def query_related_batch(
+    texts: List[str], top_k: int | None = None
+) -> List[List[Tuple[str, str]]]:
+    """Return `query_related` results for each text, embedding them together."""
+    if top_k is None:
+        top_k = _default_top_k()
+    index = _get_index()
+    if not texts or not len(index):
+        return [[] for _ in texts]
+    embs = _get_embedder().embed_documents(texts)
+    return [index.search(emb, top_k) for emb in embs]
+
+
+__all__ = [
+    "configure_embedder",
+    "flush",
+    "index_issue",
+    "index_issues",
+    "query_related",
+    "query_related_batch",
+]
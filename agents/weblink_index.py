@@ -0,0 +1,187 @@
+"""
+In-memory nearest-neighbour index for the weblink issue graph.
+
+Embeddings are kept L2-normalised in float32 so a query is a mat-vec product
+followed by an ``argpartition`` top-k. Rows are append-only: the loaded base
+matrix may be a read-only memory map, new issues go to a growable tail, and
+re-indexing an ID appends a new row and retires the old one. Once the live
+node count passes ``ann_threshold`` an HNSW index (FAISS) proposes candidates
+that are then re-scored exactly.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+ANN_OVERFETCH = 4
+
+
+def _normalize(vec: Sequence[float] | np.ndarray) -> np.ndarray:
+    arr = np.asarray(vec, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm > 0 else arr
+
+
+class IssueIndex:
+    """Append-only cosine-similarity index keyed by issue ID."""
+
+    def __init__(self, ann_threshold: Optional[int] = None) -> None:
+        self.ann_threshold = ann_threshold
+        self.ids: List[str] = []
+        self.snippets: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._dead: Set[int] = set()
+        self._base = np.zeros((0, 0), dtype=np.float32)
+        self._tail = np.zeros((0, 0), dtype=np.float32)
+        self._tail_len = 0
+        self._ann: Any = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        matrix: np.ndarray,
+        ids: Sequence[str],
+        snippets: Sequence[str],
+        ann_threshold: Optional[int] = None,
+    ) -> "IssueIndex":
+        """Wrap already-normalised rows (e.g. a memmap) without copying.
+
+        Later rows win when an ID repeats.
+        """
+        index = cls(ann_threshold=ann_threshold)
+        index._base = matrix
+        index.ids = list(ids)
+        index.snippets = list(snippets)
+        for row, issue_id in enumerate(index.ids):
+            previous = index._rows.get(issue_id)
+            if previous is not None:
+                index._dead.add(previous)
+            index._rows[issue_id] = row
+        return index
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def row_count(self) -> int:
+        """Rows stored, including ones retired by a later re-index."""
+        return len(self.ids)
+
+    @property
+    def dead_count(self) -> int:
+        return len(self._dead)
+
+    @property
+    def dim(self) -> int:
+        return self._base.shape[1] if len(self._base) else self._tail.shape[1]
+
+    def _row(self, row: int) -> np.ndarray:
+        base = len(self._base)
+        vec: np.ndarray = self._base[row] if row < base else self._tail[row - base]
+        return vec
+
+    def _matmul(self, query: np.ndarray) -> np.ndarray:
+        tail = self._tail[: self._tail_len]
+        scores: np.ndarray
+        if not len(self._base):
+            scores = tail @ query
+        elif not len(tail):
+            scores = self._base @ query
+        else:
+            scores = np.concatenate([self._base @ query, tail @ query])
+        return scores
+
+    def _append_tail(self, vec: np.ndarray) -> None:
+        if self.ids and vec.shape[0] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {vec.shape[0]} does not match index "
+                f"dimension {self.dim}"
+            )
+        if self._tail_len == len(self._tail):
+            grown = np.zeros(
+                (max(64, 2 * len(self._tail)), vec.shape[0]), dtype=np.float32
+            )
+            if self._tail_len:
+                grown[: self._tail_len] = self._tail[: self._tail_len]
+            self._tail = grown
+        self._tail[self._tail_len] = vec
+        self._tail_len += 1
+
+    def add(
+        self, issue_id: str, snippet: str, embedding: Sequence[float] | np.ndarray
+    ) -> np.ndarray:
+        """Insert or replace ``issue_id``; return the stored (normalised) row."""
+        vec = _normalize(embedding)
+        self._append_tail(vec)
+        row = len(self.ids)
+        self.ids.append(issue_id)
+        self.snippets.append(snippet)
+        previous = self._rows.get(issue_id)
+        if previous is not None:
+            self._dead.add(previous)
+        self._rows[issue_id] = row
+        if self._ann is not None:
+            self._ann.add(vec.reshape(1, -1))
+        return vec
+
+    def items(self) -> Iterator[Tuple[str, str, np.ndarray]]:
+        """Yield live (issue_id, snippet, normalised embedding) in row order."""
+        for row, issue_id in enumerate(self.ids):
+            if row not in self._dead:
+                yield issue_id, self.snippets[row], self._row(row)
+
+    def _maybe_build_ann(self) -> Any:
+        if self._ann is not None:
+            return self._ann
+        if self.ann_threshold is None or len(self) < self.ann_threshold:
+            return None
+        try:
+            import faiss
+        except ImportError:  # pragma: no cover - optional dependency
+            return None
+        ann = faiss.IndexHNSWFlat(self.dim, 32, faiss.METRIC_INNER_PRODUCT)
+        if len(self._base):
+            ann.add(np.ascontiguousarray(self._base))
+        if self._tail_len:
+            ann.add(self._tail[: self._tail_len])
+        self._ann = ann
+        return ann
+
+    def search(
+        self, embedding: Sequence[float] | np.ndarray, top_k: int
+    ) -> List[Tuple[str, str]]:
+        """Return up to ``top_k`` (issue_id, snippet) pairs, best first."""
+        if not self._rows or top_k <= 0:
+            return []
+        query = _normalize(embedding)
+        ann = self._maybe_build_ann()
+        if ann is None:
+            rows = None
+            scores = self._matmul(query)
+            dead = list(self._dead)
+            if dead:
+                scores[np.array(dead, dtype=np.int64)] = -np.inf
+        else:
+            fetch = (top_k + len(self._dead)) * ANN_OVERFETCH
+            _, found = ann.search(query.reshape(1, -1), fetch)
+            rows = np.array(
+                [
+                    r
+                    for r in np.unique(found[0]).tolist()
+                    if r >= 0 and r not in self._dead
+                ],
+                dtype=np.int64,
+            )
+            scores = np.array([self._row(r) @ query for r in rows.tolist()])
+
+        k = min(top_k, len(self), len(scores))
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        # Highest score first; ties keep insertion order like a stable sort.
+        order = best[np.lexsort((best, -scores[best]))]
+        picked = order if rows is None else rows[order]
+        return [(self.ids[r], self.snippets[r]) for r in picked.tolist()]
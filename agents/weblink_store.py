@@ -0,0 +1,322 @@
+"""
+Append-only on-disk format for the weblink issue graph.
+
+A graph directory holds one *generation* of files::
+
+    meta.json              {"generation": g, "dim": d}
+    embeddings.<g>.f32     raw float32 rows, normalised, appended in order
+    nodes.<g>.jsonl        one {"id", "snippet"} line per embedding row
+
+Inserts append one row and one log line instead of rewriting the graph, and
+fsyncs are batched (every ``fsync_every`` inserts or ``fsync_interval``
+seconds). Loading memory-maps the embeddings file, so startup does not parse
+or copy vectors. ``compact`` writes live rows into the next generation and
+switches ``meta.json`` atomically; a crash at any point leaves the previous
+generation readable.
+
+Several processes (e.g. API workers) may share a directory. Loads, appends
+and compactions hold an advisory lock on ``lock``; before writing, a store
+follows a generation switch and skips past rows other processes appended,
+and compaction re-reads every process's rows from disk. A process's
+in-memory index sees other processes' rows after its next `load` or
+`compact`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from storage.locks import file_lock
+
+from .weblink_index import IssueIndex
+
+META_FILE = "meta.json"
+LOCK_FILE = "lock"
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # pragma: no cover - e.g. Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SegmentStore:
+    """Durable, append-only storage backing an `IssueIndex`."""
+
+    def __init__(
+        self,
+        directory: Path,
+        fsync_every: int = 32,
+        fsync_interval: float = 1.0,
+        compact_ratio: float = 0.5,
+    ) -> None:
+        self.directory = Path(directory)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_ratio = compact_ratio
+        self.generation = 0
+        self.dim = 0
+        self._lock = threading.Lock()
+        self._emb_f: Optional[IO[bytes]] = None
+        self._log_f: Optional[IO[bytes]] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Disk state as of this store's last look: the meta.json it read,
+        # the rows in the current generation and the valid node-log bytes.
+        self._meta_stamp: Optional[Tuple[int, int]] = None
+        self._rows = 0
+        self._log_end = 0
+
+    def _paths(self, generation: int) -> Tuple[Path, Path]:
+        return (
+            self.directory / f"embeddings.{generation}.f32",
+            self.directory / f"nodes.{generation}.jsonl",
+        )
+
+    def exists(self) -> bool:
+        return (self.directory / META_FILE).exists()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock, file_lock(self.directory / LOCK_FILE):
+            yield
+
+    def _stamp_meta(self) -> None:
+        stat = (self.directory / META_FILE).stat()
+        self._meta_stamp = (stat.st_ino, stat.st_mtime_ns)
+
+    def _read_meta(self) -> None:
+        with open(self.directory / META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.generation = int(meta["generation"])
+        self.dim = int(meta["dim"])
+        self._stamp_meta()
+        self._rows = self._log_end = 0
+
+    def _write_meta(self) -> None:
+        tmp = self.directory / (META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"generation": self.generation, "dim": self.dim}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.directory / META_FILE)
+        _fsync_dir(self.directory)
+        self._stamp_meta()
+
+    def _scan(self, start: int, max_rows: int) -> Tuple[List[str], List[str], int]:
+        """Read whole node lines from byte ``start``, at most ``max_rows``.
+
+        Returns the ids, the snippets and the offset after the last line.
+        """
+        ids: List[str] = []
+        snippets: List[str] = []
+        log_path = self._paths(self.generation)[1]
+        if not log_path.exists():
+            return ids, snippets, start
+        with open(log_path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n") or len(ids) >= max_rows:
+                    break
+                try:
+                    node = json.loads(line)
+                except ValueError:
+                    break
+                ids.append(str(node["id"]))
+                snippets.append(str(node["snippet"]))
+                start += len(line)
+        return ids, snippets, start
+
+    def _emb_rows(self) -> int:
+        emb_path = self._paths(self.generation)[0]
+        row_bytes = self.dim * 4
+        if not row_bytes or not emb_path.exists():
+            return 0
+        return emb_path.stat().st_size // row_bytes
+
+    def _trim(self) -> None:
+        """Cut both files back to ``_rows`` aligned rows (drops torn tails)."""
+        emb_path, log_path = self._paths(self.generation)
+        self._truncate(log_path, self._log_end)
+        self._truncate(emb_path, self._rows * self.dim * 4)
+
+    def load(self, ann_threshold: Optional[int] = None) -> IssueIndex:
+        """Open the current generation and return an index over it.
+
+        Rows are validated against the node log; a torn tail left by a crash
+        is truncated so later appends stay aligned.
+        """
+        if not self.exists():
+            self.close()
+            return IssueIndex(ann_threshold=ann_threshold)
+        with self._locked():
+            return self._load_locked(ann_threshold)
+
+    def _load_locked(self, ann_threshold: Optional[int]) -> IssueIndex:
+        self._close_files()
+        if not self.exists():
+            return IssueIndex(ann_threshold=ann_threshold)
+        self._read_meta()
+        ids, snippets, self._log_end = self._scan(0, self._emb_rows())
+        self._rows = rows = len(ids)
+        self._trim()
+        matrix: np.ndarray
+        if rows:
+            matrix = np.memmap(
+                self._paths(self.generation)[0],
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self.dim),
+            )
+        else:
+            matrix = np.zeros((0, self.dim), dtype=np.float32)
+        return IssueIndex.from_rows(matrix, ids, snippets, ann_threshold=ann_threshold)
+
+    @staticmethod
+    def _truncate(path: Path, size: int) -> None:
+        if path.exists() and path.stat().st_size > size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+    def _catch_up(self) -> None:
+        """Follow a generation switch and rows other processes appended."""
+        stat = (self.directory / META_FILE).stat()
+        if (stat.st_ino, stat.st_mtime_ns) != self._meta_stamp:
+            self._close_files()
+            self._read_meta()
+        emb_path, log_path = self._paths(self.generation)
+        log_size = log_path.stat().st_size if log_path.exists() else 0
+        emb_rows = self._emb_rows()
+        if log_size == self._log_end and emb_rows == self._rows:
+            return
+        ids, _, self._log_end = self._scan(self._log_end, emb_rows - self._rows)
+        self._rows += len(ids)
+        self._trim()
+
+    def _open_for_append(self, dim: int) -> None:
+        if not self.exists():
+            self._close_files()
+            self.dim = dim
+            self._write_meta()
+        self._catch_up()
+        if self._emb_f is None:
+            emb_path, log_path = self._paths(self.generation)
+            self._emb_f = open(emb_path, "ab")
+            self._log_f = open(log_path, "ab")
+
+    def append(self, issue_id: str, snippet: str, vec: np.ndarray) -> None:
+        """Append one normalised row; fsync when the batch window closes."""
+        record = (json.dumps({"id": issue_id, "snippet": snippet}) + "\n").encode()
+        with self._locked():
+            self._open_for_append(vec.shape[0])
+            if vec.shape[0] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {vec.shape[0]} does not match "
+                    f"store dimension {self.dim}"
+                )
+            assert self._emb_f is not None and self._log_f is not None
+            # Embedding first: a node line never points at a missing row.
+            # Both reach the OS before the lock is released.
+            self._emb_f.write(np.asarray(vec, dtype=np.float32).tobytes())
+            self._emb_f.flush()
+            self._log_f.write(record)
+            self._log_f.flush()
+            self._rows += 1
+            self._log_end += len(record)
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        for f in (self._emb_f, self._log_f):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self) -> None:
+        """Force buffered appends to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def _close_files(self) -> None:
+        self._sync_locked()
+        for f in (self._emb_f, self._log_f):
+            if f is not None:
+                f.close()
+        self._emb_f = self._log_f = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_files()
+
+    def should_compact(self, index: IssueIndex) -> bool:
+        return index.row_count >= 64 and (
+            index.dead_count >= self.compact_ratio * index.row_count
+        )
+
+    def compact(self, index: IssueIndex) -> IssueIndex:
+        """Rewrite live rows into a new generation and reload from it.
+
+        The rows are read back from disk, so rows other processes appended
+        since this process loaded ``index`` are kept.
+        """
+        with self._locked():
+            if self.exists():
+                index = self._load_locked(index.ann_threshold)
+            return self._rewrite_locked(index)
+
+    def _rewrite_locked(self, index: IssueIndex) -> IssueIndex:
+        self._close_files()
+        old_emb, old_log = self._paths(self.generation)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        new_emb, new_log = self._paths(self.generation + 1)
+        with open(new_emb, "wb") as ef, open(new_log, "wb") as lf:
+            for issue_id, snippet, vec in index.items():
+                ef.write(np.asarray(vec, dtype=np.float32).tobytes())
+                record = {"id": issue_id, "snippet": snippet}
+                lf.write((json.dumps(record) + "\n").encode("utf-8"))
+            for f in (ef, lf):
+                f.flush()
+                os.fsync(f.fileno())
+        self.generation += 1
+        self.dim = self.dim or index.dim
+        self._write_meta()
+        for path in (old_emb, old_log):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:  # pragma: no cover - still mapped on Windows
+                pass
+        return self._load_locked(index.ann_threshold)
+
+    def import_nodes(
+        self, nodes: Dict[str, Dict[str, Any]], ann_threshold: Optional[int] = None
+    ) -> IssueIndex:
+        """Seed the store from the legacy ``{"nodes": {...}}`` JSON layout."""
+        with self._locked():
+            if self.exists():  # another process imported first
+                return self._load_locked(ann_threshold)
+            index = IssueIndex(ann_threshold=ann_threshold)
+            for node_id, node in nodes.items():
+                index.add(node_id, node["snippet"], node["embedding"])
+            if len(index):
+                self.dim = index.dim
+                return self._rewrite_locked(index)
+            return index
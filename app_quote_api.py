@@ -1,13 +1,150 @@
 # --- Similar Quotes Endpoint ---
+import asyncio
 import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    IO,
+    List,
+    Tuple,
+    TypeVar,
+)
 
-from fastapi import Body, FastAPI, HTTPException
+from fastapi import Body, Depends, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from agents.quote_agent import run_quote
+from agents import weblink_agent
+from agents.quote_agent import run_quote, run_quote_batch
+from logic.pricing_rules import pricing_stats, quote_cache_stats
+from modular_ai_agent.memory.embedding_batcher import batcher_of, micro_batch
+from modular_ai_agent.memory.embedding_cache import embedding_cache_stats
+from modular_ai_agent.tools import memory_tool
 from vector_store.quote_embedder import QuoteVectorStore
 
-app = FastAPI(title="Quote API")
+T = TypeVar("T")
+
+_store_lock = threading.Lock()
+BATCH_CHUNK = int(os.getenv("QUOTE_BATCH_CHUNK", "256"))
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_WORKERS = int(
+    os.getenv("QUOTE_API_WORKERS", str(min(32, (os.cpu_count() or 1) + 4)))
+)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one computation.
+
+    The first caller starts the work; callers arriving while it runs await the
+    same result (or exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shield so one disconnected client does not cancel the others' work.
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+_flights = SingleFlight()
+
+
+def shared_store(app: FastAPI) -> QuoteVectorStore:
+    """Return the app-wide vector store, creating it on first use.
+
+    The store owns the Chroma client and the embedding model, so it is built
+    once per process instead of once per request. ``build_index`` serialises
+    writers internally; queries run concurrently.
+    """
+    store = getattr(app.state, "quote_store", None)
+    if store is None:
+        with _store_lock:
+            store = getattr(app.state, "quote_store", None)
+            if store is None:
+                store = QuoteVectorStore()
+                # Concurrent queries share one embed_documents call.
+                store.embedding_model = micro_batch(store.embedding_model)
+                app.state.quote_store = store
+    return store
+
+
+def get_quote_store(request: Request) -> QuoteVectorStore:
+    return shared_store(request.app)
+
+
+def _executor(app: FastAPI) -> ThreadPoolExecutor:
+    executor = getattr(app.state, "executor", None)
+    if executor is None:
+        with _store_lock:
+            executor = getattr(app.state, "executor", None)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_WORKERS, thread_name_prefix="quote-api"
+                )
+                app.state.executor = executor
+    return executor
+
+
+async def offload(app: FastAPI, fn: Callable[..., T], *args: Any) -> T:
+    """Run blocking embedding/pricing work on the app's bounded executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(app), fn, *args)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Weblink queries share a micro-batcher, applied when the model loads.
+    weblink_agent.configure_embedder(micro_batch)
+    # Set QUOTE_API_WARMUP=0 to skip loading the models at startup.
+    if os.getenv("QUOTE_API_WARMUP", "1") != "0":
+        await offload(app, shared_store(app).warm_up)
+        await offload(app, weblink_agent.warm_up)
+        # Pricing fallbacks search memory; load FAISS now, not mid-request.
+        await offload(app, memory_tool.warm_up)
+    yield
+    store = getattr(app.state, "quote_store", None)
+    for embedder in (
+        store.embedding_model if store is not None else None,
+        weblink_agent.reset_embedder(),
+    ):
+        batcher = batcher_of(embedder)
+        if batcher is not None:
+            batcher.close()
+    executor = getattr(app.state, "executor", None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+    app.state.executor = None
+    app.state.quote_store = None
+
+
+app = FastAPI(title="Quote API", lifespan=lifespan)
 
 
 class SimilarQuoteRequest(BaseModel):
@@ -17,19 +154,28 @@ class SimilarQuoteRequest(BaseModel):
 
 class SimilarQuoteMatch(BaseModel):
     content: str
-    metadata: dict
+    metadata: Dict[str, Any]
 
 
 class SimilarQuoteResponse(BaseModel):
     matches: list[SimilarQuoteMatch]
 
 
-@app.post("/quote/similar", response_model=SimilarQuoteResponse)
-def get_similar_quotes(request: SimilarQuoteRequest = Body(...)):
-    vs = QuoteVectorStore()
+def _similar(vs: QuoteVectorStore, prompt: str, top_k: int) -> Dict[str, Any]:
     vs.build_index()
-    matches = vs.query(request.prompt, top_k=request.top_k)
-    return {"matches": matches}
+    return {"matches": vs.query(prompt, top_k=top_k)}
+
+
+@app.post("/quote/similar", response_model=SimilarQuoteResponse)
+async def get_similar_quotes(
+    http_request: Request,
+    request: SimilarQuoteRequest = Body(...),
+    vs: QuoteVectorStore = Depends(get_quote_store),
+) -> Dict[str, Any]:
+    return await _flights.do(
+        ("similar", request.prompt, request.top_k),
+        lambda: offload(http_request.app, _similar, vs, request.prompt, request.top_k),
+    )
 
 
 class QuoteRequest(BaseModel):
@@ -38,19 +184,150 @@ class QuoteRequest(BaseModel):
 
 class QuoteResponse(BaseModel):
     customer: str
-    items: list
+    items: List[Any]
     total: float
     memory_result: str | None = None
 
 
+def _quote(prompt: str) -> Dict[str, Any]:
+    data: Dict[str, Any] = json.loads(run_quote(prompt))
+    # Ensure memory_result is always present in response (None if missing)
+    if "memory_result" not in data:
+        data["memory_result"] = None
+    return data
+
+
 @app.post("/quote", response_model=QuoteResponse)
-def get_quote(request: QuoteRequest):
+async def get_quote(request: QuoteRequest, http_request: Request) -> Dict[str, Any]:
     try:
-        output = run_quote(request.prompt)
-        data = json.loads(output)
-        # Ensure memory_result is always present in response (None if missing)
-        if "memory_result" not in data:
-            data["memory_result"] = None
-        return data
+        return await _flights.do(
+            ("quote", request.prompt),
+            lambda: offload(http_request.app, _quote, request.prompt),
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _spool_body(request: Request) -> IO[bytes]:
+    """Copy the request body to a temp file that spills to disk when large.
+
+    The body has to be read before streaming starts: once a
+    ``StreamingResponse`` is running, Starlette listens on the same channel
+    for client disconnects.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+async def _ndjson_items(spool: IO[bytes]) -> AsyncIterator[Any]:
+    try:
+        for line in spool:
+            if line.strip():
+                yield line
+    finally:
+        spool.close()
+
+
+async def _list_items(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _prompt_of(item: Any) -> str:
+    if isinstance(item, bytes):
+        item = json.loads(item)
+    if isinstance(item, dict):
+        item = item.get("prompt")
+    if not isinstance(item, str):
+        raise ValueError('expected a prompt string or {"prompt": ...}')
+    return item
+
+
+def _quote_one(prompt: str) -> Dict[str, Any]:
+    try:
+        return run_quote_batch([prompt])[0]
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _quote_chunk(chunk: List[Tuple[int, Any]]) -> bytes:
+    lines: Dict[int, Dict[str, Any]] = {}
+    valid: List[Tuple[int, str]] = []
+    for index, item in chunk:
+        try:
+            valid.append((index, _prompt_of(item)))
+        except ValueError as e:
+            lines[index] = {"error": str(e)}
+    try:
+        quotes = run_quote_batch([prompt for _, prompt in valid])
+    except Exception:
+        # Retry one by one so a single bad prompt cannot fail the chunk.
+        quotes = [_quote_one(prompt) for _, prompt in valid]
+    for (index, _), quote in zip(valid, quotes):
+        lines[index] = quote
+    return b"".join(
+        json.dumps({"index": index, **lines[index]}).encode("utf-8") + b"\n"
+        for index, _ in chunk
+    )
+
+
+async def _quote_stream(
+    app: FastAPI, items: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    chunk: List[Tuple[int, Any]] = []
+    index = 0
+    async for item in items:
+        chunk.append((index, item))
+        index += 1
+        if len(chunk) >= BATCH_CHUNK:
+            yield await offload(app, _quote_chunk, chunk)
+            chunk = []
+    if chunk:
+        yield await offload(app, _quote_chunk, chunk)
+
+
+@app.post("/quote/batch")
+async def quote_batch(request: Request) -> StreamingResponse:
+    """Quote many prompts; stream one NDJSON line per prompt, in input order.
+
+    The body is either a JSON list of prompts (strings or ``{"prompt": ...}``)
+    or, with ``Content-Type: application/x-ndjson``, one prompt per line.
+    Prompts are processed in chunks of ``QUOTE_BATCH_CHUNK``, and a bad item
+    yields ``{"index": i, "error": ...}`` instead of failing the batch.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = _ndjson_items(await _spool_body(request))
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body is not valid JSON")
+        if not isinstance(body, list):
+            raise HTTPException(status_code=422, detail="Expected a JSON list")
+        items = _list_items(body)
+    return StreamingResponse(
+        _quote_stream(request.app, items), media_type="application/x-ndjson"
+    )
+
+
+@app.get("/stats")
+async def get_stats(request: Request) -> Dict[str, Any]:
+    """Report request coalescing, embedding batching, cache and pricing counters."""
+    store = getattr(request.app.state, "quote_store", None)
+    batchers = {
+        "quotes": batcher_of(store.embedding_model if store is not None else None),
+        "weblink": batcher_of(weblink_agent.current_embedder()),
+    }
+    return {
+        "single_flight": _flights.stats(),
+        "embedding_batches": {
+            name: batcher.stats() for name, batcher in batchers.items() if batcher
+        },
+        "embedding_cache": embedding_cache_stats(),
+        "quote_cache": quote_cache_stats(),
+        "pricing": pricing_stats(),
+    }
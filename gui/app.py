@@ -1,4 +1,3 @@
-
 import os
 import sys
 from pathlib import Path
@@ -29,24 +28,26 @@ def main() -> None:
 
     left, right = st.columns(2)
 
-
     def generate_and_clear():
         prompt = st.session_state.get("prompt_input", "")
         if prompt.strip():
             output = run_quote(prompt.strip())
             data = parse_quote_output(output)
             st.session_state.history.append({"prompt": prompt.strip(), "data": data})
-            # --- Store prompt and quote in data/quotes.jsonl and vector store ---
-            import json
+            # --- Store prompt and quote in the configured job store and vector store ---
+            from storage.job_store import JobStore, open_job_store
             from vector_store.quote_embedder import QuoteVectorStore
+
             quote_entry = {"prompt": prompt.strip(), "result": data}
-            quotes_path = Path("data/quotes.jsonl")
-            quotes_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(quotes_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(quote_entry, ensure_ascii=False) + "\n")
-            # Add to vector store
-            vs = QuoteVectorStore(data_path=str(quotes_path))
-            vs.build_index()
+            store = open_job_store()
+            try:
+                store.save(quote_entry)
+            finally:
+                store.close()
+            # Add to vector store (it indexes the JSONL log)
+            if isinstance(store, JobStore):
+                vs = QuoteVectorStore(data_path=str(store.path))
+                vs.build_index()
         # Clear the input after quote generation
         st.session_state["prompt_input"] = ""
 
@@ -80,6 +81,7 @@ def main() -> None:
         st.subheader("Vector Store Stats")
         try:
             from vector_store.quote_embedder import QuoteVectorStore
+
             quotes_path = Path("data/quotes.jsonl")
             vs = QuoteVectorStore(data_path=str(quotes_path))
             count = vs.count()
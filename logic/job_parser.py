@@ -1,7 +1,115 @@
 from __future__ import annotations
 
+import argparse
+import json
+import os
 import re
-from typing import Any, Dict, List
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Keywords the parser cares about; matched as substrings of the lowercased
+# prompt, exactly like the original chain of ``in`` checks.
+_KEYWORDS = {
+    "window": "window",
+    "pressure": "pressure",
+    "power wash": "pressure",
+    "large": "large",
+    "rush": "urgent",
+    "urgent": "urgent",
+    "asap": "urgent",
+    "two storey": "two_storey",
+    "second floor": "two_storey",
+    "storey": "storey_word",
+    "story": "storey_word",
+    "floor": "storey_word",
+}
+
+# One zero-width scan: every match sits on a keyword or a digit and reports
+# each sub-pattern that would match at that position. Taking the first hit
+# per group reproduces the leftmost-match semantics of separate re.search()
+# calls in a single pass over the text.
+_SCAN = re.compile(
+    r"(?=(?P<kw>" + "|".join(re.escape(k) for k in _KEYWORDS) + r")|\d)"
+    r"(?:(?=(?P<unit>\d+)\s*(?:windows?|jobs?|areas?)))?"
+    r"(?:(?=(?P<num>\d+)\b))?"
+    r"(?:(?=(?P<storey>\d+)\s*(?:storey|story|floor)))?"
+    r"(?:(?=(?P<dash>2-storey)))?"
+)
+_STOREY_WORD = re.compile(r"(storey|story|floor)")
+
+
+class _Extract(NamedTuple):
+    service: str
+    qty: int
+    large: bool
+    storey: int
+    urgent: bool
+    has_digit: bool
+    storey_word: bool
+
+
+@lru_cache(maxsize=4096)
+def _extract(text: str) -> _Extract:
+    """Pull every field out of lowercased ``text`` in one regex pass."""
+    found = set()
+    unit = num = storey = None
+    has_digit = dash = False
+    for m in _SCAN.finditer(text):
+        kw, u, n, st, d = m.groups()
+        if kw is not None:
+            found.add(_KEYWORDS[kw])
+            continue
+        has_digit = True
+        if unit is None and u is not None:
+            unit = u
+        if num is None and n is not None:
+            num = n
+        if storey is None and st is not None:
+            storey = st
+        dash = dash or d is not None
+
+    if "window" in found:
+        service = "window"
+    elif "pressure" in found:
+        service = "pressure"
+    else:
+        service = ""
+
+    qty = unit if unit is not None else num
+    if storey is not None:
+        storeys = int(storey)
+    elif dash or "two_storey" in found:
+        storeys = 2
+    else:
+        storeys = 1
+
+    return _Extract(
+        service=service,
+        qty=int(qty) if qty is not None else 1,
+        large="large" in found,
+        storey=storeys,
+        urgent="urgent" in found,
+        has_digit=has_digit,
+        storey_word="storey_word" in found,
+    )
 
 
 # Natural language prompt parser
@@ -10,62 +118,46 @@ def parse_prompt(prompt: str) -> Dict[str, Any]:
     Parse a natural language job prompt into a structured job dict.
     Covers: service (window/pressure), qty, size (large), storey, rush/urgent.
     """
-    prompt = prompt.lower()
-    result: Dict[str, Any] = {}
-
-    # Service detection
-    if "window" in prompt:
-        result["service"] = "window"
-    elif "pressure" in prompt or "power wash" in prompt:
-        result["service"] = "pressure"
-    else:
-        result["service"] = ""
-
-    # Quantity (e.g., "10 windows", "5 jobs")
-    qty_match = re.search(r"(\d+)\s*(windows?|jobs?|areas?)", prompt)
-    if not qty_match:
-        qty_match = re.search(r"(\d+)\b", prompt)
-    result["qty"] = int(qty_match.group(1)) if qty_match else 1
-
-    # Size
-    result["size"] = "large" if "large" in prompt else ""
-
-    # Storey
-    storey_match = re.search(r"(\d+)\s*(storey|story|floor)s?", prompt)
-    if storey_match:
-        result["storey"] = int(storey_match.group(1))
-    elif "two storey" in prompt or "2-storey" in prompt or "second floor" in prompt:
-        result["storey"] = 2
-    else:
-        result["storey"] = 1
-
-    # Rush/Urgent
-    if "rush" in prompt or "urgent" in prompt or "asap" in prompt:
-        result.setdefault("surcharges", {})["urgent"] = True
-
+    ext = _extract(prompt.lower())
+    result: Dict[str, Any] = {
+        "service": ext.service,
+        "qty": ext.qty,
+        "size": "large" if ext.large else "",
+        "storey": ext.storey,
+    }
+    if ext.urgent:
+        result["surcharges"] = {"urgent": True}
     return result
 
 
 def parse_followup(prompt: str, last_scope: Dict[str, Any]) -> Dict[str, Any]:
     """Merge follow-up instructions into ``last_scope``."""
-    updates = parse_prompt(prompt)
+    lowered = prompt.lower()
+    ext = _extract(lowered)
     merged = dict(last_scope)
 
-    if updates.get("service"):
-        merged["service"] = updates["service"]
+    # "large" and storey words only count when written in lowercase.
+    if lowered == prompt:
+        has_large, has_storey_word = ext.large, ext.storey_word
+    else:
+        has_large = "large" in prompt
+        has_storey_word = _STOREY_WORD.search(prompt) is not None
+
+    if ext.service:
+        merged["service"] = ext.service
 
-    if re.search(r"\d", prompt):
-        merged["qty"] = updates.get("qty", merged.get("qty", 1))
+    if ext.has_digit:
+        merged["qty"] = ext.qty
 
-    if "large" in prompt:
-        merged["size"] = updates.get("size", merged.get("size", ""))
+    if has_large:
+        merged["size"] = "large" if ext.large else ""
 
-    if re.search(r"(storey|story|floor)", prompt):
-        merged["storey"] = updates.get("storey", merged.get("storey", 1))
+    if has_storey_word:
+        merged["storey"] = ext.storey
 
-    if updates.get("surcharges"):
+    if ext.urgent:
         sur = merged.get("surcharges", {}).copy()
-        sur.update(updates["surcharges"])
+        sur["urgent"] = True
         merged["surcharges"] = sur
 
     return merged
@@ -86,3 +178,112 @@ def parse_job(data: Dict[str, Any]) -> Dict[str, Any]:
 # Example usage for mypy strict compliance
 def parse_jobs(data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [parse_job(d) for d in data_list]
+
+
+def parse_prompts_stream(prompts: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Lazily parse ``prompts`` one at a time, keeping memory flat."""
+    for prompt in prompts:
+        yield parse_prompt(prompt)
+
+
+@dataclass
+class ChunkStats:
+    index: int
+    lines: int
+    errors: int
+    seconds: float
+
+    @property
+    def lines_per_sec(self) -> float:
+        return self.lines / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _parse_line(lineno: int, line: str) -> Dict[str, Any]:
+    """Parse one JSONL line (an object with ``prompt`` or a bare string)."""
+    try:
+        data = json.loads(line)
+        prompt = data.get("prompt") if isinstance(data, dict) else data
+        if not isinstance(prompt, str):
+            raise ValueError("expected a prompt string")
+        return {"line": lineno, "job": parse_prompt(prompt)}
+    except Exception as exc:
+        return {"line": lineno, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _parse_chunk(
+    chunk: List[Tuple[int, str]],
+) -> Tuple[List[Dict[str, Any]], float]:
+    start = time.perf_counter()
+    results = [_parse_line(lineno, line) for lineno, line in chunk]
+    return results, time.perf_counter() - start
+
+
+def _read_chunks(path: Path, chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        numbered = ((i, line) for i, line in enumerate(f, 1) if line.strip())
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def parse_jsonl(
+    path: str | Path,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    on_chunk: Optional[Callable[[ChunkStats], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream parsed jobs from a JSONL file of prompts, in input order.
+
+    Each output record is ``{"line": n, "job": {...}}`` or, for malformed
+    lines, ``{"line": n, "error": "..."}``. With ``workers > 1`` chunks are
+    parsed in a process pool with at most ``2 * workers`` chunks in flight,
+    so memory stays bounded regardless of file size. ``on_chunk`` receives
+    per-chunk throughput as each chunk is emitted.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = enumerate(_read_chunks(Path(path), chunk_size))
+
+    def _emit(
+        index: int, results: List[Dict[str, Any]], seconds: float
+    ) -> Iterator[Dict[str, Any]]:
+        if on_chunk is not None:
+            errors = sum(1 for r in results if "error" in r)
+            on_chunk(ChunkStats(index, len(results), errors, seconds))
+        yield from results
+
+    if workers <= 1:
+        for index, chunk in chunks:
+            yield from _emit(index, *_parse_chunk(chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Tuple[int, Future[Any]]] = deque()
+        for index, chunk in chunks:
+            pending.append((index, pool.submit(_parse_chunk, chunk)))
+            if len(pending) >= 2 * workers:
+                done_index, future = pending.popleft()
+                yield from _emit(done_index, *future.result())
+        while pending:
+            done_index, future = pending.popleft()
+            yield from _emit(done_index, *future.result())
+
+
+def parse_jsonl_cli() -> None:
+    parser = argparse.ArgumentParser(description="Parse a JSONL file of prompts")
+    parser.add_argument("path", type=Path, help="JSONL file with prompts")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    def _report(stats: ChunkStats) -> None:
+        print(
+            f"chunk {stats.index}: {stats.lines} lines, {stats.errors} errors, "
+            f"{stats.lines_per_sec:,.0f} lines/s",
+            file=sys.stderr,
+        )
+
+    for record in parse_jsonl(args.path, args.workers, args.chunk_size, _report):
+        print(json.dumps(record))
@@ -0,0 +1,161 @@
+"""
+Vectorized batch pricing over columnar job arrays.
+
+`calculate_prices_batch` prices many jobs at once with NumPy and returns the
+same subtotals and totals as `CompiledPricing.quote` would for each job.
+Surcharges are passed as a bitmask per job; bit ``i`` corresponds to
+``surcharge_keys(rules)[i]``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from logic.pricing_engine import CompiledPricing, default_engine
+
+
+@dataclass
+class JobBatch:
+    """Columnar batch of jobs; all arrays share the same length."""
+
+    service: np.ndarray
+    qty: np.ndarray
+    large: np.ndarray
+    storey: np.ndarray
+    surcharges: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.qty)
+
+
+@dataclass
+class BatchPrices:
+    unit_price: np.ndarray
+    subtotal: np.ndarray
+    total: np.ndarray
+    known: np.ndarray
+
+
+def surcharge_keys(rules: CompiledPricing) -> List[str]:
+    """Return surcharge names in bitmask order."""
+    return list(rules.surcharges)
+
+
+def batch_from_scopes(
+    scopes: Iterable[Dict[str, Any]], rules: Optional[CompiledPricing] = None
+) -> JobBatch:
+    """Build a `JobBatch` from scope dicts as produced by ``parse_prompt``.
+
+    Surcharges are encoded as on/off flags, so numeric (scaled) surcharge
+    values raise ``ValueError``.
+    """
+    if rules is None:
+        rules = default_engine().rules
+    bits = {key: 1 << i for i, key in enumerate(surcharge_keys(rules))}
+    service: List[str] = []
+    qty: List[int] = []
+    large: List[bool] = []
+    storey: List[int] = []
+    masks: List[int] = []
+    for scope in scopes:
+        service.append(str(scope.get("service") or ""))
+        qty.append(int(scope.get("qty", 1)))
+        large.append(str(scope.get("size", "")).lower() == "large")
+        storey.append(int(scope.get("storey", 1)))
+        mask = 0
+        for key, value in scope.get("surcharges", {}).items():
+            if key not in bits or not value:
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                raise ValueError(
+                    f"Scaled surcharge {key}={value!r} cannot be batch-priced"
+                )
+            mask |= bits[key]
+        masks.append(mask)
+    return JobBatch(
+        service=np.array(service, dtype=object),
+        qty=np.array(qty, dtype=np.int64),
+        large=np.array(large, dtype=bool),
+        storey=np.array(storey, dtype=np.int64),
+        surcharges=np.array(masks, dtype=np.int64),
+    )
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Round like Python's ``round(x, 2)``.
+
+    ``np.round`` scales by 100 first and can disagree with the scalar path on
+    ties, so round each distinct value with Python and scatter back.
+    """
+    uniq, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(v, 2) for v in uniq.tolist()], dtype=np.float64)
+    return rounded[inverse.reshape(values.shape)]
+
+
+def _service_codes(service: np.ndarray, names: List[str]) -> np.ndarray:
+    """Map service names (or precomputed int codes) onto ``names`` indices."""
+    if np.issubdtype(service.dtype, np.integer):
+        return service.astype(np.int64)
+    lookup = {name: i for i, name in enumerate(names)}
+    uniq, inverse = np.unique(service.astype(str), return_inverse=True)
+    codes = np.array([lookup.get(name, -1) for name in uniq.tolist()], dtype=np.int64)
+    return codes[inverse.reshape(service.shape)]
+
+
+def calculate_prices_batch(
+    batch: JobBatch, rules: Optional[CompiledPricing] = None
+) -> BatchPrices:
+    """Price every job in ``batch`` with vectorized NumPy operations.
+
+    Jobs whose service is not in the config get zero subtotal/total and
+    ``known == False``; callers decide how to handle them (the scalar
+    ``calculate_price`` falls back to a memory search).
+    """
+    if rules is None:
+        rules = default_engine().rules
+    names = list(rules.services)
+    codes = _service_codes(np.asarray(batch.service), names)
+    known = (codes >= 0) & (codes < len(names))
+    # Unknown services index a trailing zero-price slot.
+    safe = np.where(known, codes, len(names))
+
+    base = np.array([rules.services[n].base_price for n in names] + [0.0])
+    mult = np.array(
+        [
+            (
+                rules.services[n].large_multiplier
+                if rules.services[n].large_multiplier is not None
+                else 1.0
+            )
+            for n in names
+        ]
+        + [1.0]
+    )
+
+    qty = np.asarray(batch.qty, dtype=np.int64)
+    unit_price = base[safe]
+    price = unit_price * qty
+    large = np.asarray(batch.large, dtype=bool)
+    price = np.where(large, price * mult[safe], price)
+
+    masks = np.asarray(batch.surcharges, dtype=np.int64)
+    keys = surcharge_keys(rules)
+    if "two_storey" in rules.surcharges and "window" in names:
+        bit = 1 << keys.index("two_storey")
+        upstairs = (safe == names.index("window")) & (np.asarray(batch.storey) >= 2)
+        masks = np.where(upstairs, masks | bit, masks)
+
+    surcharge_total = np.zeros(len(qty), dtype=np.float64)
+    for i, key in enumerate(keys):
+        surcharge_total += np.where(masks & (1 << i), rules.surcharges[key], 0.0)
+
+    zero = np.zeros(len(qty), dtype=np.float64)
+    return BatchPrices(
+        unit_price=np.where(known, unit_price, zero),
+        subtotal=np.where(known, _round2(price), zero),
+        total=np.where(known, _round2(price + surcharge_total), zero),
+        known=known,
+    )
@@ -0,0 +1,223 @@
+"""
+Compiled pricing rules with mtime-driven hot reload.
+
+The JSON pricing config is parsed once into flat lookup tables
+(`CompiledPricing`). `PricingEngine` keeps the compiled rules in memory and
+only re-reads the file when its mtime/size changes, checking at most once per
+`check_interval` seconds so quoting does no disk I/O on the hot path.
+
+This is the single pricing kernel shared by `logic.pricing_rules` (agent
+path) and `llama3_model.utils.condition_logic` (inference fallback).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+CONFIG_PATH = Path(__file__).parent.parent / "configs" / "pricing.json"
+DEFAULT_CHECK_INTERVAL = float(os.getenv("PRICING_RELOAD_INTERVAL", "1.0"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ServiceRate:
+    base_price: float
+    large_multiplier: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CompiledPricing:
+    """Flat lookup tables built from one version of the pricing config."""
+
+    services: Dict[str, ServiceRate] = field(default_factory=dict)
+    surcharges: Dict[str, float] = field(default_factory=dict)
+    version: int = 0
+
+    def quote(self, scope: Dict[str, Any]) -> Dict[str, Any]:
+        """Price ``scope``; unknown services yield no items and a zero total."""
+        service = scope.get("service")
+        rate = self.services.get(service)  # type: ignore[arg-type]
+        surcharges = dict(scope.get("surcharges", {}))
+
+        # Automatically apply two_storey surcharge if storey >= 2
+        if service == "window" and int(scope.get("storey", 1)) >= 2:
+            surcharges["two_storey"] = True
+
+        if rate is None:
+            return {"items": [], "surcharges": surcharges, "total": 0.0}
+
+        qty = int(scope.get("qty", 1))
+        size = scope.get("size", "")
+        price = rate.base_price * qty
+        if rate.large_multiplier is not None and str(size).lower() == "large":
+            price *= rate.large_multiplier
+
+        # Flags add the flat amount; numeric values scale it (e.g. heavy_soil: 2).
+        surcharge_total = 0.0
+        table = self.surcharges
+        for key, value in surcharges.items():
+            amount = table.get(key)
+            if amount is None or not value:
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                surcharge_total += amount * value
+            else:
+                surcharge_total += amount
+
+        item = {
+            "service": service,
+            "qty": qty,
+            "unit_price": rate.base_price,
+            "size": size,
+            "subtotal": round(price, 2),
+        }
+        return {
+            "items": [item],
+            "surcharges": surcharges,
+            "total": round(price + surcharge_total, 2),
+        }
+
+
+def compile_pricing(config: Dict[str, Any], version: int = 0) -> CompiledPricing:
+    """Validate ``config`` and flatten it into a `CompiledPricing`."""
+    services: Dict[str, ServiceRate] = {}
+    for name, cfg in config.items():
+        if name == "surcharge":
+            continue
+        if not isinstance(cfg, dict) or "base_price" not in cfg:
+            raise ValueError(f"Pricing entry {name!r} has no base_price")
+        for key in ("base_price", "large_multiplier"):
+            value = cfg.get(key)
+            if value is not None and (
+                not isinstance(value, (int, float)) or isinstance(value, bool)
+            ):
+                raise ValueError(f"Pricing entry {name!r} has a non-numeric {key}")
+        services[name] = ServiceRate(
+            base_price=cfg["base_price"],
+            large_multiplier=cfg.get("large_multiplier"),
+        )
+
+    # Only truthy numeric surcharges ever contribute to a total.
+    surcharges = {
+        key: value
+        for key, value in config.get("surcharge", {}).items()
+        if isinstance(value, (int, float)) and value
+    }
+    return CompiledPricing(services=services, surcharges=surcharges, version=version)
+
+
+class PricingEngine:
+    """Serve compiled pricing rules, reloading them when the file changes."""
+
+    def __init__(
+        self, path: Path, check_interval: float = DEFAULT_CHECK_INTERVAL
+    ) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.hits = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._rules: Optional[CompiledPricing] = None
+
+    def _stat(self) -> Tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self) -> CompiledPricing:
+        """Re-read and compile the config file unconditionally."""
+        with self._lock:
+            return self._reload_locked()
+
+    def _reload_locked(self) -> CompiledPricing:
+        signature = self._stat()
+        with open(self.path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        rules = compile_pricing(config, version=self.reloads + 1)
+        self._rules = rules
+        self._signature = signature
+        self.reloads += 1
+        self._next_check = time.monotonic() + self.check_interval
+        return rules
+
+    def _reload_failed(
+        self, exc: Exception, signature: Optional[Tuple[int, int]]
+    ) -> None:
+        """Keep the last good rules after a bad or half-written config.
+
+        The failed file's signature is remembered, so it is retried only
+        once it changes again rather than on every quote.
+        """
+        self.errors += 1
+        self.last_error = f"{type(exc).__name__}: {exc}"
+        self._signature = signature
+        logger.warning(
+            "Keeping pricing rules v%d; reloading %s failed: %s",
+            self._rules.version if self._rules else 0,
+            self.path,
+            self.last_error,
+        )
+
+    @property
+    def rules(self) -> CompiledPricing:
+        """Return current rules, reloading if the file changed on disk.
+
+        Only the first load raises; later load or compile errors are logged
+        and the last compiled rules keep serving.
+        """
+        rules = self._rules
+        if rules is not None and time.monotonic() < self._next_check:
+            self.hits += 1
+            return rules
+        with self._lock:
+            if self._rules is None:
+                return self._reload_locked()
+            signature: Optional[Tuple[int, int]] = None
+            try:
+                signature = self._stat()
+                if signature != self._signature:
+                    return self._reload_locked()
+            except Exception as exc:
+                self._reload_failed(exc, signature)
+            self._next_check = time.monotonic() + self.check_interval
+            self.hits += 1
+            return self._rules
+
+    @property
+    def version(self) -> int:
+        return self.rules.version
+
+    def calculate(self, scope: Dict[str, Any]) -> Dict[str, Any]:
+        return self.rules.quote(scope)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "version": self._rules.version if self._rules else 0,
+            "reloads": self.reloads,
+            "cache_hits": self.hits,
+            "reload_errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+_default_engine: Optional[PricingEngine] = None
+
+
+def default_engine() -> PricingEngine:
+    """Return the process-wide engine for ``configs/pricing.json``."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = PricingEngine(CONFIG_PATH)
+    return _default_engine
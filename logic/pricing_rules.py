@@ -1,17 +1,34 @@
 """
 Pricing engine for window cleaning & pressure washing.
 Exposes `calculate_price(scope: dict) -> dict`.
-Reads `configs/pricing.json` at runtime.
+Rules from `configs/pricing.json` are compiled once and hot-reloaded when
+the file changes (see `logic.pricing_engine`). Results are cached per
+canonical scope until the config reloads (see `logic.quote_cache`).
+Unknown services are looked up in the material → price sidecar written by
+`load_pricing.ingest` before falling back to a (cached) memory search
+restricted to ``doc_type: pricing`` documents.
 """
 
-import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from logic.pricing_engine import CONFIG_PATH, default_engine
+from logic.quote_cache import DEFAULT_TTL, QuoteCache, canonical_scope
+from modular_ai_agent.memory.pricing_index import format_record, load_pricing_index
 from modular_ai_agent.tools.memory_tool import memory_search
 
-CONFIG_PATH = Path(__file__).parent.parent / "configs" / "pricing.json"
+_engine = default_engine()
+_quote_cache = QuoteCache()
+
+PRICING_STORE_PATH = Path(os.getenv("VECTOR_STORE_PATH", "memory/vector_store"))
+MEMORY_CACHE_SIZE = 256
+_memory_cache: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+_memory_lock = threading.Lock()
 
 
 @dataclass
@@ -26,63 +43,70 @@ class PricingRecord:
 
 def calculate_price(scope: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate price based on scope and pricing config."""
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        config = json.load(f)
-
-    service = scope.get("service")
-    qty = int(scope.get("qty", 1))
-    size = scope.get("size", "")
-    surcharges = dict(scope.get("surcharges", {}))
-
-    # Automatically apply two_storey surcharge if storey >= 2
-    if service == "window" and int(scope.get("storey", 1)) >= 2:
-        surcharges["two_storey"] = True
-
-    items = []
-    total = 0.0
-
-    if service not in config:
-        # Fallback: search memory for price per m2
-        query = f"price per m2 {service}"
-        if hasattr(memory_search, "invoke"):
-            memory_result = memory_search.invoke(query)
-        else:
-            memory_result = memory_search(query)
-        return {
-            "items": [],
-            "surcharges": surcharges,
-            "total": 0.0,
-            "memory_result": memory_result,
-        }
-
-    base_price = config[service]["base_price"]
-    price = base_price * qty
-
-    # Apply size multiplier if applicable
-    if size and "large_multiplier" in config[service] and size == "large":
-        price *= config[service]["large_multiplier"]
-
-    items.append(
-        {
-            "service": service,
-            "qty": qty,
-            "unit_price": base_price,
-            "size": size,
-            "subtotal": round(price, 2),
-        }
-    )
-
-    # Apply surcharges
-    surcharge_total = 0.0
-    for key, value in (surcharges or {}).items():
-        surcharge_cfg = config.get("surcharge", {}).get(key)
-        if surcharge_cfg:
-            if isinstance(surcharge_cfg, (int, float)):
-                surcharge = surcharge_cfg if value else 0
-            else:
-                surcharge = 0
-            surcharge_total += surcharge
-
-    total = price + surcharge_total
-
-    return {"items": items, "surcharges": surcharges, "total": round(total, 2)}
+    rules = _engine.rules
+    key = canonical_scope(scope)
+    if key is not None:
+        cached = _quote_cache.get(key, rules.version)
+        if cached is not None:
+            return cached
+
+    result = rules.quote(scope)
+    if not result["items"]:
+        result["memory_result"] = _memory_fallback(scope)
+    if key is not None:
+        _quote_cache.put(key, rules.version, result)
+    return result
+
+
+def _memory_fallback(scope: Dict[str, Any]) -> Any:
+    # Unknown service: exact/fuzzy material lookup, then memory for price per m2
+    service = str(scope.get("service") or "")
+    record = load_pricing_index(PRICING_STORE_PATH).lookup(service)
+    if record is not None:
+        return format_record(record)
+    return _search_memory(f"doc_type:pricing price per m2 {scope.get('service')}")
+
+
+def _search_memory(query: str) -> Any:
+    """Run ``memory_search`` at most once per query and TTL window."""
+    with _memory_lock:
+        entry = _memory_cache.get(query)
+        if entry is not None and entry[0] > time.monotonic():
+            _memory_cache.move_to_end(query)
+            return entry[1]
+    if hasattr(memory_search, "invoke"):
+        result = memory_search.invoke(query)
+    else:
+        result = memory_search(query)
+    with _memory_lock:
+        _memory_cache[query] = (time.monotonic() + DEFAULT_TTL, result)
+        _memory_cache.move_to_end(query)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return result
+
+
+def pricing_stats() -> Dict[str, Any]:
+    """Return reload and cache-hit counters for the pricing engine."""
+    return _engine.stats()
+
+
+def quote_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the scope-keyed result cache."""
+    return _quote_cache.stats()
+
+
+def clear_quote_cache() -> None:
+    _quote_cache.clear()
+    with _memory_lock:
+        _memory_cache.clear()
+
+
+__all__ = [
+    "CONFIG_PATH",
+    "PricingRecord",
+    "calculate_price",
+    "clear_quote_cache",
+    "pricing_stats",
+    "quote_cache_stats",
+]
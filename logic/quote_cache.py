@@ -0,0 +1,104 @@
+"""
+Result cache for `calculate_price`, keyed by canonical job scope.
+
+Prompts that differ only in wording parse to the same scope, so the priced
+result (including any memory-search fallback) is reused. Entries are tied to
+the pricing config version: the first lookup after a reload clears the cache.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("QUOTE_CACHE_SIZE", "4096"))
+DEFAULT_TTL = float(os.getenv("QUOTE_CACHE_TTL", "300"))
+
+
+def canonical_scope(scope: Dict[str, Any]) -> Optional[str]:
+    """Return a stable key for the fields pricing reads, or ``None``.
+
+    Defaults are filled in the same way `CompiledPricing.quote` fills them, so
+    ``{"service": "window", "qty": 3}`` and the same scope with an explicit
+    ``"storey": 1`` share a key. JSON keeps ``True`` and ``1`` distinct.
+    """
+    try:
+        return json.dumps(
+            [
+                scope.get("service"),
+                int(scope.get("qty", 1)),
+                scope.get("size", ""),
+                int(scope.get("storey", 1)),
+                dict(scope.get("surcharges", {})),
+            ],
+            sort_keys=True,
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+class QuoteCache:
+    """Thread-safe LRU with a per-entry TTL and config-version invalidation."""
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version_locked(self, version: int) -> None:
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key: str, version: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._check_version_locked(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[1]
+        return copy.deepcopy(result)
+
+    def put(self, key: str, version: int, result: Dict[str, Any]) -> None:
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._check_version_locked(version)
+            self._entries[key] = (time.monotonic() + self.ttl, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,183 @@
+"""Micro-batching scheduler for concurrent ``embed_query`` calls."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from .embedding_cache import CachedEmbeddings
+
+DEFAULT_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "32"))
+DEFAULT_MAX_WAIT = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5")) / 1000
+# Upper bounds of the batch size histogram buckets; the last is open-ended.
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+_Pending = Tuple[str, "Future[List[float]]", float]
+
+
+class MicroBatchEmbedder(Embeddings):
+    """Collect concurrent ``embed_query`` calls into one ``embed_documents``.
+
+    A background worker takes the first waiting query, then keeps collecting
+    until ``max_batch`` texts are queued or ``max_wait`` seconds have passed,
+    and embeds them in a single call. ``embed_documents`` is already batched
+    and goes straight to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ) -> None:
+        self.inner = inner
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.batches = 0
+        self.texts = 0
+        self.max_queue_depth = 0
+        self.histogram = {str(b): 0 for b in BATCH_BUCKETS}
+        self.histogram[f">{BATCH_BUCKETS[-1]}"] = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None and not self._closed:
+            with self._lock:
+                if self._worker is None and not self._closed:
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def embed_query(self, text: str) -> List[float]:
+        self._ensure_worker()
+        fut: "Future[List[float]]" = Future()
+        with self._lock:
+            # Checked under the lock so nothing is queued behind close().
+            if self._closed:
+                return self.inner.embed_query(text)
+            self._queue.put((text, fut, time.perf_counter()))
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return fut.result()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.inner.embed_documents(texts)
+
+    def _collect(self, first: _Pending) -> Tuple[List[_Pending], bool]:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            self._embed(batch)
+
+    def _embed(self, batch: List[_Pending]) -> None:
+        started = time.perf_counter()
+        texts = [text for text, _, _ in batch]
+        try:
+            vectors = self.inner.embed_documents(texts)
+        except Exception as exc:
+            for _, fut, _ in batch:
+                fut.set_exception(exc)
+        else:
+            for (_, fut, _), vec in zip(batch, vectors):
+                fut.set_result(vec)
+        with self._lock:
+            self.batches += 1
+            self.texts += len(batch)
+            self.histogram[_bucket(len(batch))] += 1
+            for _, _, queued in batch:
+                waited = started - queued
+                self.total_wait += waited
+                self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    def close(self) -> None:
+        """Stop the worker after draining queued requests."""
+        with self._lock:
+            self._closed = True
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "batches": self.batches,
+                "texts": self.texts,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "batch_size_histogram": dict(self.histogram),
+                "mean_wait_ms": (
+                    self.total_wait / self.texts * 1000 if self.texts else 0.0
+                ),
+                "max_wait_ms": self.max_wait_seen * 1000,
+            }
+
+
+def _bucket(size: int) -> str:
+    for bound in BATCH_BUCKETS:
+        if size <= bound:
+            return str(bound)
+    return f">{BATCH_BUCKETS[-1]}"
+
+
+def micro_batch(
+    embeddings: Embeddings,
+    max_batch: int = DEFAULT_MAX_BATCH,
+    max_wait: float = DEFAULT_MAX_WAIT,
+) -> Embeddings:
+    """Return ``embeddings`` with queries routed through a `MicroBatchEmbedder`.
+
+    For a `CachedEmbeddings` the batcher goes underneath the cache, so cache
+    hits never wait in the queue.
+    """
+    if isinstance(embeddings, CachedEmbeddings):
+        if isinstance(embeddings.inner, MicroBatchEmbedder):
+            return embeddings
+        return CachedEmbeddings(
+            MicroBatchEmbedder(embeddings.inner, max_batch, max_wait),
+            model_name=embeddings.model_name,
+            cache=embeddings.cache,
+        )
+    if isinstance(embeddings, MicroBatchEmbedder):
+        return embeddings
+    return MicroBatchEmbedder(embeddings, max_batch, max_wait)
+
+
+def batcher_of(embeddings: Any) -> Optional[MicroBatchEmbedder]:
+    """Return the `MicroBatchEmbedder` inside ``embeddings``, if any."""
+    if isinstance(embeddings, CachedEmbeddings):
+        embeddings = embeddings.inner
+    return embeddings if isinstance(embeddings, MicroBatchEmbedder) else None
@@ -0,0 +1,169 @@
+"""Shared embedding cache keyed by model name and text hash."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+
+
+def _key(model: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """In-memory LRU with an optional on-disk SQLite tier.
+
+    Vectors are stored per ``(model, sha256(text))`` so every call site that
+    uses the same model shares entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sqlite_path: str | Path | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if sqlite_path is not None:
+            Path(sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(sqlite_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = _key(model, text)
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return vec
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vec = array("f", row[0]).tolist()
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+                    return vec
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        key = _key(model, text)
+        vec = list(vector)
+        with self._lock:
+            self._remember(key, vec)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, array("f", vec).tobytes()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vec: List[float]) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+def _model_name(embeddings: Any) -> str:
+    for attr in ("model", "model_name"):
+        name = getattr(embeddings, attr, None)
+        if isinstance(name, str) and name:
+            return name
+    size = getattr(embeddings, "size", None)
+    suffix = f"-{size}" if size else ""
+    return f"{type(embeddings).__name__}{suffix}"
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain ``Embeddings`` wrapper that consults an `EmbeddingCache`.
+
+    Query and document embeddings share entries; every model used in this
+    repo embeds both the same way.
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        model_name: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ) -> None:
+        self.inner = inner
+        self.model_name = model_name or _model_name(inner)
+        self.cache = cache if cache is not None else default_cache()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = [self.cache.get(self.model_name, t) for t in texts]
+        missing = list(dict.fromkeys(t for t, v in zip(texts, found) if v is None))
+        if missing:
+            computed = dict(zip(missing, self.inner.embed_documents(missing)))
+            for text, vec in computed.items():
+                self.cache.put(self.model_name, text, vec)
+            found = [v if v is not None else computed[t] for t, v in zip(texts, found)]
+        return found  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        vec = self.cache.get(self.model_name, text)
+        if vec is None:
+            vec = self.inner.embed_query(text)
+            self.cache.put(self.model_name, text, vec)
+        return vec
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> EmbeddingCache:
+    """Return the process-wide cache (SQLite tier via ``EMBEDDING_CACHE_PATH``)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = EmbeddingCache(
+                    sqlite_path=os.getenv("EMBEDDING_CACHE_PATH") or None
+                )
+    return _default_cache
+
+
+def embedding_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the shared embedding cache."""
+    return default_cache().stats()
@@ -0,0 +1,138 @@
+"""
+Append-only delta log for a FAISS store saved with ``save_local``.
+
+``<store>/delta/`` holds inserts and deletes made since the last full save::
+
+    vectors.f32    raw float32 embedding rows, appended in insert order
+    ops.jsonl      {"op": "add", "id", "text", "metadata", "row"} or
+                   {"op": "delete", "ids": [...]}, one per line
+
+Writing a delta costs O(new rows) instead of re-serialising the whole index
+and docstore pickle. `replay` re-applies the log after ``load_local`` without
+re-embedding anything; it is idempotent, so a crash between a full save and
+`clear` is harmless. Vectors are written and fsynced before their op line,
+so a durable op never points at a missing row. A row without an op line is
+ignored, a partial vector row is truncated by the next `append`, and a torn
+op line is closed off with a newline and skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+DELTA_DIR = "delta"
+
+
+class DeltaLog:
+    """Delta segment files next to a FAISS ``index.faiss``/``index.pkl``."""
+
+    def __init__(self, store_path: str | Path) -> None:
+        self.directory = Path(store_path) / DELTA_DIR
+        self.vectors_path = self.directory / "vectors.f32"
+        self.ops_path = self.directory / "ops.jsonl"
+
+    def exists(self) -> bool:
+        return self.ops_path.exists()
+
+    def rows(self, dim: int) -> int:
+        """Return how many vector rows the log holds."""
+        try:
+            return self.vectors_path.stat().st_size // (4 * dim)
+        except OSError:
+            return 0
+
+    def append(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        vectors: Sequence[Sequence[float]],
+    ) -> None:
+        """Log inserted documents; raises ``TypeError`` for non-JSON metadata."""
+        arr = np.asarray(vectors, dtype=np.float32)
+        if not len(arr):
+            return
+        lines = []
+        row = self.rows(arr.shape[1])
+        for i, (doc_id, text, meta) in enumerate(zip(ids, texts, metadatas)):
+            op = {"op": "add", "id": doc_id, "text": text, "metadata": meta}
+            lines.append(json.dumps({**op, "row": row + i}) + "\n")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        mode = "r+b" if self.vectors_path.exists() else "wb"
+        with open(self.vectors_path, mode) as f:
+            # Drop a partial row left by a crash mid-write so rows stay aligned.
+            f.truncate(row * arr.shape[1] * arr.itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(arr.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._append_ops(lines)
+
+    def append_delete(self, ids: Sequence[str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._append_ops([json.dumps({"op": "delete", "ids": list(ids)}) + "\n"])
+
+    def _append_ops(self, lines: List[str]) -> None:
+        with open(self.ops_path, "a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")  # close off a torn line from a crash
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def replay(self, store: Any) -> int:
+        """Apply the log to a freshly loaded ``FAISS`` store; return ops applied."""
+        if not self.exists():
+            return 0
+        dim = store.index.d
+        vectors = np.zeros((0, dim), dtype=np.float32)
+        if self.rows(dim):
+            vectors = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self.rows(dim), dim),
+            )
+        applied = 0
+        pending: List[Dict[str, Any]] = []
+        docs = store.docstore._dict
+
+        def _flush() -> None:
+            if pending:
+                store.add_embeddings(
+                    [(op["text"], vectors[op["row"]].tolist()) for op in pending],
+                    metadatas=[op["metadata"] for op in pending],
+                    ids=[op["id"] for op in pending],
+                )
+                pending.clear()
+
+        with open(self.ops_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a crash mid-append
+                if op["op"] == "add":
+                    if op["row"] < len(vectors) and op["id"] not in docs:
+                        pending.append(op)
+                        applied += 1
+                else:
+                    _flush()
+                    present = [i for i in op["ids"] if i in docs]
+                    if present:
+                        store.delete(present)
+                        applied += 1
+        _flush()
+        return applied
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,123 @@
+"""
+Configurable FAISS index types for the memory vector store.
+
+`get_vectorstore` seeds new stores with an exact flat index. Once a store
+grows, rebuild it with any ``faiss.index_factory`` string, e.g.
+``IVF1024,Flat``, ``IVF1024,PQ32``, ``HNSW32`` or ``SQ8``. Indexes that need
+training are trained on a random sample of the existing vectors::
+
+    python -m modular_ai_agent.memory.faiss_index memory/vector_store \\
+        --factory IVF1024,PQ32 --train-size 50000 --param nprobe=16
+
+Search parameters (``nprobe``, ``efSearch``) are stored in the index file.
+HNSW indexes cannot remove vectors, so stores that re-ingest changed files
+(`logic.kb_ingestor`) should use IVF or flat variants.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import faiss
+import numpy as np
+
+DEFAULT_FACTORY = os.getenv("VECTOR_STORE_INDEX", "Flat")
+DEFAULT_TRAIN_SIZE = 100_000
+
+
+def _metric(store: Any) -> int:
+    strategy = str(getattr(store, "distance_strategy", "")).upper()
+    if "INNER_PRODUCT" in strategy or "COSINE" in strategy:
+        return int(faiss.METRIC_INNER_PRODUCT)
+    return int(faiss.METRIC_L2)
+
+
+def set_search_params(index: faiss.Index, params: Dict[str, float]) -> None:
+    """Apply ``{"nprobe": 16}``-style parameters to ``index``."""
+    space = faiss.ParameterSpace()
+    for name, value in params.items():
+        space.set_index_parameter(index, name, value)
+
+
+def build_index(
+    vectors: np.ndarray,
+    factory: str = DEFAULT_FACTORY,
+    metric: int = faiss.METRIC_L2,
+    train_size: int = DEFAULT_TRAIN_SIZE,
+    params: Optional[Dict[str, float]] = None,
+    seed: int = 0,
+) -> faiss.Index:
+    """Build a ``factory`` index over ``vectors`` (row order is kept)."""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = faiss.index_factory(vectors.shape[1], factory, metric)
+    if not index.is_trained:
+        sample = vectors
+        if len(vectors) > train_size:
+            rng = np.random.default_rng(seed)
+            sample = vectors[rng.choice(len(vectors), train_size, replace=False)]
+        index.train(sample)
+    index.add(vectors)
+    if params:
+        set_search_params(index, params)
+    return index
+
+
+def index_vectors(index: faiss.Index) -> np.ndarray:
+    """Return every stored vector (approximate for quantised indexes)."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()
+    vectors: np.ndarray = index.reconstruct_n(0, index.ntotal)
+    return vectors
+
+
+def rebuild_vectorstore(
+    path: str | Path,
+    factory: str = DEFAULT_FACTORY,
+    train_size: int = DEFAULT_TRAIN_SIZE,
+    params: Optional[Dict[str, float]] = None,
+) -> Any:
+    """Re-index an existing store with ``factory`` and save it in place.
+
+    Documents and ids are unchanged; the placeholder seed is dropped.
+    """
+    from .memory_setup import compact, get_vectorstore, placeholder_id
+
+    store = get_vectorstore(path)
+    seed = placeholder_id(store)
+    if seed is not None and store.index.ntotal > 1:
+        store.delete([seed])
+    vectors = index_vectors(store.index)
+    store.index = build_index(vectors, factory, _metric(store), train_size, params)
+    compact(store, path)
+    return store
+
+
+def _parse_params(items: Any) -> Dict[str, float]:
+    params: Dict[str, float] = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        params[name] = float(value)
+    return params
+
+
+def rebuild_cli() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild a FAISS store's index")
+    parser.add_argument("store", type=Path, help="Vector store directory")
+    parser.add_argument("--factory", default=DEFAULT_FACTORY)
+    parser.add_argument("--train-size", type=int, default=DEFAULT_TRAIN_SIZE)
+    parser.add_argument(
+        "--param", action="append", help="search parameter, e.g. nprobe=16"
+    )
+    args = parser.parse_args()
+    store = rebuild_vectorstore(
+        args.store, args.factory, args.train_size, _parse_params(args.param)
+    )
+    print(f"✅ Rebuilt {args.store} as {args.factory} ({store.index.ntotal} vectors)")
+
+
+if __name__ == "__main__":
+    rebuild_cli()
@@ -0,0 +1,260 @@
+"""
+Metadata-filtered and hybrid (BM25 + vector) search over a FAISS store.
+
+`MetadataIndex` maps ``field -> value -> rows`` for scalar metadata, so a
+filter such as ``{"doc_type": "pricing"}`` resolves to candidate rows with
+dict lookups and one array intersection. The vector search then runs only
+over those rows: small candidate sets are scored exactly from their stored
+vectors, larger ones through a FAISS ``IDSelector``. `BM25Index` is an
+in-process keyword index; hybrid mode merges both rankings with
+reciprocal-rank fusion. Both indexes are built on first use from the
+docstore, in FAISS row order, and rebuilt once rows are added or removed;
+they work with memory-mapped stores too.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+EXACT_MAX = 4096
+RRF_K = 60
+MODES = ("vector", "bm25", "hybrid")
+_TOKEN = re.compile(r"\w+")
+_SCALARS = (str, int, float, bool)
+
+Hit = Tuple[int, float]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def rrf(rankings: Iterable[Sequence[int]], k: int = RRF_K) -> List[int]:
+    """Fuse ranked row lists: score(row) = sum of 1 / (k + rank)."""
+    scores: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            scores[row] += 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda row: -scores[row])
+
+
+class MetadataIndex:
+    """Per-field inverted index of scalar metadata values."""
+
+    def __init__(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        postings: Dict[str, Dict[Any, List[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for row, meta in enumerate(metadatas):
+            for field, value in (meta or {}).items():
+                if isinstance(value, _SCALARS):
+                    postings[field][value].append(row)
+        self.fields: Dict[str, Dict[Any, np.ndarray]] = {
+            field: {v: np.asarray(rows, dtype=np.int64) for v, rows in values.items()}
+            for field, values in postings.items()
+        }
+
+    def rows(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Return sorted rows matching every field; list values mean "any of"."""
+        result: Optional[np.ndarray] = None
+        for field, wanted in filters.items():
+            values = self.fields.get(field, {})
+            options = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            parts = [values[v] for v in options if v in values]
+            if not parts:
+                return np.zeros(0, dtype=np.int64)
+            rows = parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+            result = rows if result is None else np.intersect1d(result, rows, True)
+            if not len(result):
+                break
+        return result if result is not None else np.zeros(0, dtype=np.int64)
+
+
+class BM25Index:
+    """Okapi BM25 over documents in row order."""
+
+    def __init__(self, texts: Iterable[str], k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1, self.b = k1, b
+        postings: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+        lengths: List[int] = []
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            counts: Dict[str, int] = defaultdict(int)
+            for token in tokens:
+                counts[token] += 1
+            for token, tf in counts.items():
+                postings[token][0].append(row)
+                postings[token][1].append(tf)
+        self.size = len(lengths)
+        self.lengths = np.asarray(lengths, dtype=np.float32)
+        avg = float(self.lengths.mean()) if self.size else 0.0
+        self._norm = k1 * (1 - b + b * self.lengths / avg) if avg else self.lengths
+        self.postings = {
+            token: (np.asarray(rows, np.int64), np.asarray(tfs, np.float32))
+            for token, (rows, tfs) in postings.items()
+        }
+
+    def search(
+        self, query: str, k: int, rows: Optional[np.ndarray] = None
+    ) -> List[Hit]:
+        scores = np.zeros(self.size, dtype=np.float32)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            hits, tf = posting
+            idf = math.log(1 + (self.size - len(hits) + 0.5) / (len(hits) + 0.5))
+            scores[hits] += idf * tf * (self.k1 + 1) / (tf + self._norm[hits])
+        candidates = np.flatnonzero(scores) if rows is None else rows
+        candidates = candidates[scores[candidates] > 0]
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(row), float(scores[row])) for row in order]
+
+
+def _selector_params(index: Any, selector: Any) -> Any:
+    params: Any
+    if isinstance(index, faiss.IndexIVF):
+        params = faiss.SearchParametersIVF()
+        params.nprobe = index.nprobe
+    elif isinstance(index, faiss.IndexHNSW):
+        params = faiss.SearchParametersHNSW()  # type: ignore[attr-defined]
+        params.efSearch = index.hnsw.efSearch
+    else:
+        params = faiss.SearchParameters()
+    params.sel = selector
+    return params
+
+
+class HybridSearcher:
+    """Filter-aware vector, BM25 and hybrid search over one ``FAISS`` store."""
+
+    def __init__(self, store: Any, exact_max: int = EXACT_MAX) -> None:
+        self.store = store
+        self.exact_max = exact_max
+        self._lock = threading.Lock()
+        self._metadata: Optional[Tuple[Tuple[Any, ...], MetadataIndex]] = None
+        self._bm25: Optional[Tuple[Tuple[Any, ...], BM25Index]] = None
+
+    def _generation(self) -> Tuple[Any, ...]:
+        """Key that changes when rows are added, removed or re-indexed."""
+        store = self.store
+        rows = store.index.ntotal
+        ids = store.index_to_docstore_id
+        last = ids.get(rows - 1) if rows else None
+        return id(store.index), id(ids), rows, ids.get(0), last
+
+    def _docs(self) -> Iterable[Document]:
+        store = self.store
+        for row in range(store.index.ntotal):
+            yield store.docstore.search(store.index_to_docstore_id[row])
+
+    @property
+    def metadata(self) -> MetadataIndex:
+        generation = self._generation()
+        built = self._metadata
+        if built is None or built[0] != generation:
+            with self._lock:
+                built = self._metadata
+                if built is None or built[0] != generation:
+                    index = MetadataIndex(d.metadata for d in self._docs())
+                    built = self._metadata = (generation, index)
+        return built[1]
+
+    @property
+    def bm25(self) -> BM25Index:
+        generation = self._generation()
+        built = self._bm25
+        if built is None or built[0] != generation:
+            with self._lock:
+                built = self._bm25
+                if built is None or built[0] != generation:
+                    index = BM25Index(d.page_content for d in self._docs())
+                    built = self._bm25 = (generation, index)
+        return built[1]
+
+    def _query_vector(self, query: str) -> np.ndarray:
+        vector = np.asarray(
+            [self.store.embeddings.embed_query(query)], dtype=np.float32
+        )
+        if self.store._normalize_L2:
+            faiss.normalize_L2(vector)
+        return vector
+
+    def _exact(self, vector: np.ndarray, rows: np.ndarray, k: int) -> List[Hit]:
+        index = self.store.index
+        stored = index.reconstruct_batch(rows)
+        if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            scores = -(stored @ vector[0])
+        else:
+            scores = ((stored - vector) ** 2).sum(axis=1)
+        top = np.argsort(scores, kind="stable")[:k]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def vector_search(
+        self, query: str, k: int, rows: Optional[np.ndarray] = None
+    ) -> List[Hit]:
+        """Return (row, distance) pairs, restricted to ``rows`` if given."""
+        index = self.store.index
+        vector = self._query_vector(query)
+        if rows is None:
+            distances, found = index.search(vector, k)
+        else:
+            if len(rows) <= self.exact_max:
+                try:
+                    return self._exact(vector, rows, k)
+                except RuntimeError:
+                    pass  # no direct access to stored vectors (e.g. IVF)
+            selector = faiss.IDSelectorBatch(rows)
+            params = _selector_params(index, selector)
+            distances, found = index.search(vector, k, params=params)
+        return [(int(r), float(d)) for r, d in zip(found[0], distances[0]) if r >= 0]
+
+    def document(self, row: int) -> Document:
+        store = self.store
+        doc: Document = store.docstore.search(store.index_to_docstore_id[row])
+        return doc
+
+    def search(
+        self,
+        query: str,
+        k: int = 4,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+        fetch_k: Optional[int] = None,
+    ) -> List[Document]:
+        """Return the top ``k`` documents for ``query``.
+
+        ``filters`` restricts candidates before ranking. In ``hybrid`` mode
+        the top ``fetch_k`` (default ``max(20, 5 * k)``) of each ranking are
+        fused with RRF.
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        rows = self.metadata.rows(filters) if filters else None
+        if rows is not None and not len(rows):
+            return []
+        if mode == "vector":
+            order = [row for row, _ in self.vector_search(query, k, rows)]
+        elif mode == "bm25":
+            order = [row for row, _ in self.bm25.search(query, k, rows)]
+        else:
+            fetch = fetch_k or max(20, 5 * k)
+            order = rrf(
+                [
+                    [row for row, _ in self.vector_search(query, fetch, rows)],
+                    [row for row, _ in self.bm25.search(query, fetch, rows)],
+                ]
+            )
+        return [self.document(row) for row in order[:k]]
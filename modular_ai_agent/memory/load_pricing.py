@@ -4,6 +4,8 @@ Helper that loads a pricing CSV into the existing FAISS vector store.
 •  Uses the Pydantic `PricingRecord` model for validation.
 •  Adds each row as a LangChain Document with `metadata={"doc_type": "pricing"}`.
 •  Re-uses `get_vectorstore()` from memory_setup.
+•  Updates the material → price sidecar (`pricing_index.json`) used for O(1)
+   pricing fallbacks.
 •  Provides a CLI:  python -m modular_ai_agent.memory.load_pricing data/pricing_rules.csv
 """
 
@@ -18,6 +20,7 @@ from langchain.schema import Document
 from pydantic import BaseModel, PositiveFloat, ValidationError
 
 from .memory_setup import add_documents, get_vectorstore
+from .pricing_index import update_pricing_index
 
 
 class PricingRecord(BaseModel):
@@ -56,6 +59,7 @@ def ingest(csv_path: str, store_path: str = "memory/vector_store") -> int:
 
     if added:
         add_documents(vs, added, store_path)
+        update_pricing_index(store_path, added)
     print(f"✅  Ingested {len(added)} pricing records into {store_path}")
     return len(added)
 
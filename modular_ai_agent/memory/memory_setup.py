@@ -3,22 +3,42 @@
 from __future__ import annotations
 
 import os
+import uuid
 from pathlib import Path
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, Optional
 
 from langchain_community.embeddings import FakeEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 
+from .embedding_cache import CachedEmbeddings
+from .faiss_delta import DeltaLog
+from .mmap_store import META_FILE as MMAP_META_FILE
+from .mmap_store import export_mmap, load_mmap
+
 EMBED_DIM = 1536
+# New stores are seeded with one placeholder under this id (FAISS cannot be
+# saved empty); stores created before it existed hold it at position 0.
+PLACEHOLDER_ID = "__placeholder__"
+PLACEHOLDER_TEXT = "dummy"
+# "full" re-saves the index on every add; "delta" appends to <store>/delta/
+# and re-saves only once the delta outgrows DELTA_COMPACT_RATIO of the index.
+PERSIST_MODE = os.getenv("VECTOR_STORE_PERSIST", "full")
+DELTA_COMPACT_RATIO = float(os.getenv("VECTOR_STORE_DELTA_RATIO", "0.5"))
+# Serve retrievers from the memory-mapped export (see `mmap_store`).
+USE_MMAP = os.getenv("VECTOR_STORE_MMAP", "0") == "1"
+
 
+def _get_embeddings() -> CachedEmbeddings:
+    """Return embeddings implementation based on environment.
 
-def _get_embeddings() -> OpenAIEmbeddings | FakeEmbeddings:
-    """Return embeddings implementation based on environment."""
+    The model is wrapped in the shared embedding cache so repeated texts are
+    only embedded once per process (or once overall with a disk tier).
+    """
     if os.getenv("OPENAI_API_KEY"):
-        return OpenAIEmbeddings()
-    return FakeEmbeddings(size=EMBED_DIM)
+        return CachedEmbeddings(OpenAIEmbeddings())
+    return CachedEmbeddings(FakeEmbeddings(size=EMBED_DIM))
 
 
 def get_vectorstore(path: str | Path) -> FAISS:
@@ -26,39 +46,93 @@ def get_vectorstore(path: str | Path) -> FAISS:
     path = Path(path)
     embeddings = _get_embeddings()
     if (path / "index.faiss").exists():
-        return FAISS.load_local(
+        store = FAISS.load_local(
             str(path), embeddings, allow_dangerous_deserialization=True
         )
+        DeltaLog(path).replay(store)
+        return store
 
     path.mkdir(parents=True, exist_ok=True)
-    store = FAISS.from_documents([Document(page_content="dummy")], embeddings)
+    DeltaLog(path).clear()  # belongs to an index that no longer exists
+    store = FAISS.from_documents(
+        [Document(page_content=PLACEHOLDER_TEXT)], embeddings, ids=[PLACEHOLDER_ID]
+    )
     store.save_local(str(path))
     return store
 
 
+def placeholder_id(store: FAISS) -> Optional[str]:
+    """Return the docstore id of the seed document, if it is still present.
+
+    O(1): the placeholder is either stored under `PLACEHOLDER_ID` or, in
+    older stores, is the first vector.
+    """
+    docs = store.docstore._dict  # type: ignore[attr-defined]
+    if PLACEHOLDER_ID in docs:
+        return PLACEHOLDER_ID
+    first = store.index_to_docstore_id.get(0)
+    doc = docs.get(first) if first is not None else None
+    text = doc.page_content if isinstance(doc, Document) else doc
+    return first if text == PLACEHOLDER_TEXT else None
+
+
+def compact(store: FAISS, path: str | Path) -> None:
+    """Write the full index and docstore, then drop the delta log.
+
+    A memory-mapped export, if the store has one, is rewritten too.
+    """
+    store.save_local(str(path))
+    DeltaLog(path).clear()
+    if (Path(path) / MMAP_META_FILE).exists():
+        try:
+            export_mmap(store, path)
+        except TypeError:
+            pass  # non-JSON metadata: readers fall back to load_local
+
+
 def add_documents(
-    store: FAISS, docs: Iterable[str | Document], path: str | Path
+    store: FAISS,
+    docs: Iterable[str | Document],
+    path: str | Path,
+    persist: Optional[str] = None,
 ) -> None:
-    """Add text or ``Document`` objects to ``store`` and persist the index."""
+    """Add text or ``Document`` objects to ``store`` and persist the index.
+
+    ``persist`` is ``"full"`` or ``"delta"`` (default: `PERSIST_MODE`).
+    """
     prepared: List[Document] = []
     for d in docs:
         if isinstance(d, Document):
             prepared.append(d)
         else:
             prepared.append(Document(page_content=str(d)))
-    if prepared:
-        store.add_documents(prepared)
-        # Remove placeholder document if present using public API
-        for idx, doc_id in list(store.index_to_docstore_id.items()):
-            doc = store.docstore.search(doc_id)
-            # Handle both Document and str types safely
-            if isinstance(doc, Document):
-                if doc.page_content == "dummy":
-                    store.delete([doc_id])
-            elif isinstance(doc, str):
-                if doc == "dummy":
-                    store.delete([doc_id])
-        store.save_local(str(path))
+    if not prepared:
+        return
+    texts = [d.page_content for d in prepared]
+    metadatas = [dict(d.metadata) for d in prepared]
+    ids = [d.id or str(uuid.uuid4()) for d in prepared]
+    embeddings = store.embeddings
+    if embeddings is None:
+        raise ValueError("store has no Embeddings object to embed documents with")
+    vectors = embeddings.embed_documents(texts)
+    store.add_embeddings(zip(texts, vectors), metadatas=metadatas, ids=ids)
+    seed = placeholder_id(store)
+    if seed is not None:
+        store.delete([seed])
+
+    delta = DeltaLog(path)
+    if (persist or PERSIST_MODE) == "delta":
+        pending = delta.rows(store.index.d) + len(prepared)
+        if pending <= DELTA_COMPACT_RATIO * store.index.ntotal:
+            try:
+                delta.append(ids, texts, metadatas, vectors)
+            except TypeError:
+                pass  # metadata is not JSON; fall through to a full save
+            else:
+                if seed is not None:
+                    delta.append_delete([seed])
+                return
+    compact(store, path)
 
 
 def as_retriever(store: FAISS, *, k: int = 4) -> Any:
@@ -66,10 +140,21 @@ def as_retriever(store: FAISS, *, k: int = 4) -> Any:
     return store.as_retriever(search_kwargs={"k": k})
 
 
-def get_retriever(path: str | Path | None = None, *, k: int = 4) -> Any:
-    """Convenience wrapper to load a vector store and return its retriever."""
+def get_retriever(
+    path: str | Path | None = None, *, k: int = 4, mmap: Optional[bool] = None
+) -> Any:
+    """Convenience wrapper to load a vector store and return its retriever.
+
+    Memory-mapping is opt-in: with ``mmap=True`` (or ``VECTOR_STORE_MMAP=1``
+    when ``mmap`` is None) a fresh memory-mapped export is served read-only;
+    otherwise the store is loaded normally.
+    """
     if path is None:
         path = Path(os.getenv("VECTOR_STORE_PATH", "memory/vector_store"))
+    if USE_MMAP if mmap is None else mmap:
+        mapped = load_mmap(path, _get_embeddings())
+        if mapped is not None:
+            return as_retriever(mapped, k=k)
     store = get_vectorstore(path)
     if not store.index_to_docstore_id:
         store.add_documents([Document(page_content="hello world")])
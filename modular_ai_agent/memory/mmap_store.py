@@ -0,0 +1,178 @@
+"""
+Read-only, memory-mapped loading of a FAISS store.
+
+``load_local`` unpickles the docstore and reads the whole index into each
+process. For multi-worker serving, `export_mmap` writes the docstore in row
+order next to the index::
+
+    docstore.jsonl        {"id", "page_content", "metadata"} per FAISS row
+    docstore.offsets.u64  byte offset of every line, plus the end offset
+    docstore.meta.json    {"rows", "index_size", "index_mtime_ns"}
+
+`load_mmap` maps ``index.faiss`` (``IO_FLAG_MMAP_IFC`` covers flat, SQ/PQ
+codes and IVF lists; HNSW graph links are still read in) and the docstore
+files, so N workers share one page-cache copy and startup parses nothing.
+Documents are decoded only when a search returns them. An export is stale
+once the index is re-saved or a delta is pending; `load_mmap` then returns
+``None`` so callers fall back to a regular load.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import faiss
+import numpy as np
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+from .faiss_delta import DeltaLog
+
+DOCS_FILE = "docstore.jsonl"
+OFFSETS_FILE = "docstore.offsets.u64"
+META_FILE = "docstore.meta.json"
+
+
+def _index_signature(path: Path) -> Dict[str, int]:
+    st = (path / "index.faiss").stat()
+    return {"index_size": st.st_size, "index_mtime_ns": st.st_mtime_ns}
+
+
+def export_mmap(store: Any, path: str | Path) -> int:
+    """Write the docstore of a saved ``store`` in row order; return rows.
+
+    Call after ``save_local``; raises ``TypeError`` for non-JSON metadata.
+    """
+    path = Path(path)
+    (path / META_FILE).unlink(missing_ok=True)  # unusable until complete
+    rows: int = store.index.ntotal
+    offsets = np.zeros(rows + 1, dtype=np.uint64)
+    tmp = path / (DOCS_FILE + ".tmp")
+    with open(tmp, "wb") as f:
+        for row in range(rows):
+            doc_id = store.index_to_docstore_id[row]
+            doc = store.docstore.search(doc_id)
+            line = {
+                "id": doc_id,
+                "page_content": doc.page_content,
+                "metadata": doc.metadata,
+            }
+            f.write((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+            offsets[row + 1] = f.tell()
+    os.replace(tmp, path / DOCS_FILE)
+    offsets.tofile(path / OFFSETS_FILE)
+    with open(path / META_FILE, "w", encoding="utf-8") as f:
+        json.dump({"rows": rows, **_index_signature(path)}, f)
+    return rows
+
+
+def mmap_ready(path: str | Path) -> bool:
+    """Return True when an export matches the saved index and no delta."""
+    path = Path(path)
+    try:
+        with open(path / META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        signature = _index_signature(path)
+    except (OSError, ValueError):
+        return False
+    fresh = all(meta.get(k) == v for k, v in signature.items())
+    return fresh and not DeltaLog(path).exists()
+
+
+class RowId(str):
+    """Docstore id that also remembers its FAISS row."""
+
+    row: int
+
+
+class RowIds(Mapping[int, str]):
+    """``index_to_docstore_id`` view decoding ids from the mapped docstore."""
+
+    def __init__(self, docstore: "MmapDocstore") -> None:
+        self._docstore = docstore
+
+    def __getitem__(self, row: int) -> str:
+        if not 0 <= row < len(self._docstore):
+            raise KeyError(row)
+        return self._docstore.row_id(row)
+
+    def __len__(self) -> int:
+        return len(self._docstore)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._docstore)))
+
+
+class MmapDocstore(Docstore):
+    """Read-only docstore over `export_mmap` files (FAISS refuses adds)."""
+
+    def __init__(self, path: str | Path) -> None:
+        path = Path(path)
+        self._offsets = np.memmap(path / OFFSETS_FILE, dtype=np.uint64, mode="r")
+        with open(path / DOCS_FILE, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._rows_by_id: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _line(self, row: int) -> Dict[str, Any]:
+        start, stop = int(self._offsets[row]), int(self._offsets[row + 1])
+        return dict(json.loads(self._mm[start:stop]))
+
+    def row_id(self, row: int) -> str:
+        rid = RowId(self._line(row)["id"])
+        rid.row = row
+        return rid
+
+    def _row_of(self, search: str) -> Optional[int]:
+        row = getattr(search, "row", None)
+        if row is not None:
+            return int(row)
+        if self._rows_by_id is None:  # only for lookups by a plain id
+            self._rows_by_id = {self._line(r)["id"]: r for r in range(len(self))}
+        return self._rows_by_id.get(search)
+
+    def search(self, search: str) -> str | Document:
+        row = self._row_of(search)
+        if row is None:
+            return f"ID {search} not found."
+        line = self._line(row)
+        return Document(
+            id=line["id"], page_content=line["page_content"], metadata=line["metadata"]
+        )
+
+
+def read_index_mmap(path: str | Path) -> Any:
+    """Map ``index.faiss`` read-only instead of copying it into memory."""
+    fname = str(Path(path) / "index.faiss")
+    try:
+        return faiss.read_index(fname, faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        return faiss.read_index(fname, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+
+
+def load_mmap(path: str | Path, embeddings: Any) -> Optional[Any]:
+    """Return a read-only ``FAISS`` store over mapped files, or ``None``."""
+    from langchain_community.vectorstores import FAISS
+
+    if not mmap_ready(path):
+        return None
+    docstore = MmapDocstore(path)
+    # Read-only, so FAISS never calls the dict-only methods on the lazy view.
+    ids: Dict[int, str] = RowIds(docstore)  # type: ignore[assignment]
+    return FAISS(embeddings, read_index_mmap(path), docstore, ids)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python -m modular_ai_agent.memory.mmap_store <store_path>")
+    from .memory_setup import get_vectorstore
+
+    exported = export_mmap(get_vectorstore(sys.argv[1]), sys.argv[1])
+    print(f"Exported {exported} documents for memory-mapped loading")
@@ -0,0 +1,196 @@
+"""
+Material → price lookup built from ``doc_type == "pricing"`` documents.
+
+`load_pricing.ingest` writes the records to ``pricing_index.json`` next to
+the FAISS files, so pricing fallbacks can answer "what does X cost per m²"
+with a dict lookup instead of loading the retriever and running a vector
+search. Stores ingested before the sidecar existed can be indexed with::
+
+    python -m modular_ai_agent.memory.pricing_index memory/vector_store
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import os
+import sys
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+INDEX_FILE = "pricing_index.json"
+FUZZY_CUTOFF = 0.8
+FUZZY_CANDIDATES = 8
+FUZZY_BUDGET = 2048
+_PLURALS = (("ies", "y"), ("es", ""), ("s", ""))
+
+
+def _normalize(name: str) -> str:
+    return " ".join(str(name).lower().split())
+
+
+def _variants(key: str) -> Iterator[str]:
+    """Yield ``key`` and its singular forms."""
+    yield key
+    for plural, singular in _PLURALS:
+        if key.endswith(plural) and len(key) > len(plural):
+            yield key[: -len(plural)] + singular
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def format_record(record: Dict[str, Any]) -> str:
+    """Render a record the way `load_pricing.ingest` words its documents."""
+    return (
+        f"{record['material']} costs {record['price_per_m2']} "
+        f"{record.get('currency', 'USD')} per m²."
+    )
+
+
+class PricingIndex:
+    """Exact/singular alias lookup of material prices, then a fuzzy match.
+
+    Aliases (each key and its singular forms) and a trigram map are built
+    as records are added, so a miss scores only the few keys sharing the
+    most trigrams with the query (difflib ratio) instead of every key.
+    """
+
+    def __init__(self, records: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._grams: Dict[str, List[str]] = defaultdict(list)
+        for key, record in (records or {}).items():
+            self._put(key, record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _put(self, key: str, record: Dict[str, Any]) -> None:
+        if key not in self.records:
+            for alias in _variants(key):
+                self._aliases.setdefault(alias, key)
+            self._aliases[key] = key  # an exact key beats another's singular
+            for gram in _trigrams(key):
+                self._grams[gram].append(key)
+        self.records[key] = record
+
+    def add(self, material: str, price_per_m2: float, currency: str = "USD") -> None:
+        self._put(
+            _normalize(material),
+            {"material": material, "price_per_m2": price_per_m2, "currency": currency},
+        )
+
+    def update(self, other: "PricingIndex") -> None:
+        for key, record in other.records.items():
+            self._put(key, record)
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        # Rarest trigrams first; stop once FUZZY_BUDGET keys were counted so
+        # trigrams shared by most keys ("ton" in every "stone ...") are skipped.
+        postings = sorted(
+            (self._grams[g] for g in _trigrams(key) if g in self._grams), key=len
+        )
+        shared: Counter[str] = Counter()
+        counted = 0
+        for posting in postings:
+            if counted and counted + len(posting) > FUZZY_BUDGET:
+                break
+            shared.update(posting)
+            counted += len(posting)
+        scored = [
+            (difflib.SequenceMatcher(None, key, candidate).ratio(), candidate)
+            for candidate, _ in shared.most_common(FUZZY_CANDIDATES)
+        ]
+        ratio, best = max(scored, default=(0.0, None))
+        return best if ratio >= FUZZY_CUTOFF else None
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        key = _normalize(name)
+        if not key or not self.records:
+            return None
+        for variant in _variants(key):
+            match = self._aliases.get(variant)
+            if match is not None:
+                return self.records[match]
+        match = self._fuzzy(key)
+        return self.records[match] if match is not None else None
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[Any]) -> "PricingIndex":
+        index = cls()
+        for doc in docs:
+            meta = getattr(doc, "metadata", None) or {}
+            if meta.get("doc_type") == "pricing" and "material" in meta:
+                index.add(
+                    meta["material"],
+                    meta["price_per_m2"],
+                    meta.get("currency", "USD"),
+                )
+        return index
+
+    def save(self, store_path: str | Path) -> None:
+        path = Path(store_path) / INDEX_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"records": self.records}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+_cache: Dict[str, Tuple[Optional[Tuple[int, int]], PricingIndex]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_pricing_index(store_path: str | Path) -> PricingIndex:
+    """Return the sidecar index for ``store_path``, re-read when it changes.
+
+    A missing sidecar yields an empty index.
+    """
+    path = Path(store_path) / INDEX_FILE
+    try:
+        st = path.stat()
+        signature: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    key = str(path)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _cache_lock:
+        index = PricingIndex()
+        if signature is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                index = PricingIndex(json.load(f).get("records", {}))
+        _cache[key] = (signature, index)
+        return index
+
+
+def update_pricing_index(store_path: str | Path, docs: Iterable[Any]) -> PricingIndex:
+    """Merge pricing documents into the sidecar for ``store_path``."""
+    index = PricingIndex(load_pricing_index(store_path).records)
+    index.update(PricingIndex.from_documents(docs))
+    index.save(store_path)
+    return index
+
+
+def rebuild_pricing_index(store_path: str | Path) -> PricingIndex:
+    """Scan an existing FAISS store's docstore and rewrite the sidecar."""
+    from .memory_setup import get_vectorstore
+
+    store = get_vectorstore(store_path)
+    docs = store.docstore._dict  # type: ignore[attr-defined]
+    index = PricingIndex.from_documents(docs.values())
+    index.save(store_path)
+    return index
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python -m modular_ai_agent.memory.pricing_index <store_path>")
+    built = rebuild_pricing_index(sys.argv[1])
+    print(f"Indexed {len(built)} pricing records in {sys.argv[1]}")
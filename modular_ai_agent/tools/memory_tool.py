@@ -1,20 +1,175 @@
-"""LangChain tool for querying the FAISS retriever."""
+"""LangChain tool for querying the FAISS retriever.
+
+The retriever is built on first use, not at import, and cached per store
+path: importing this module (as `logic.pricing_rules` and the base agent
+do) no longer loads FAISS. Call `warm_up` at startup to pay the load up
+front, and `reload` to pick up an index that changed on disk.
+
+Queries may start with ``field:value`` filters on any metadata field the
+store has, e.g. ``doc_type:pricing material:slate price per m2``; repeated
+fields match any of their values. Filtered queries, and every query when
+``MEMORY_SEARCH_MODE`` is ``hybrid`` or ``bm25``, go through
+`memory.hybrid_search.HybridSearcher`.
+"""
 
 from __future__ import annotations
 
-from langchain.tools import tool
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Container, Dict, List, Optional, Tuple
+
 from langchain_core.documents import Document
-from langchain_core.tools import Tool
+from langchain_core.tools import Tool, tool
+
+_Signature = Optional[Tuple[int, ...]]
+
+_lock = threading.Lock()
+_retrievers: Dict[str, Tuple[_Signature, Any]] = {}
+_searchers: Dict[str, Tuple[Any, Any]] = {}
+
+SEARCH_MODE = os.getenv("MEMORY_SEARCH_MODE", "vector")
+_FILTER = re.compile(r"([A-Za-z_]\w*):(\S+)")
+
+
+def _store_path(path: str | Path | None) -> Path:
+    if path is None:
+        path = os.getenv("VECTOR_STORE_PATH", "memory/vector_store")
+    return Path(path)
+
+
+def _signature(path: Path) -> _Signature:
+    """Return (mtime_ns, size) of the index and of any pending delta log."""
+    parts = []
+    for name in ("index.faiss", "delta/ops.jsonl"):
+        try:
+            st = (path / name).stat()
+        except OSError:
+            continue
+        parts += [st.st_mtime_ns, st.st_size]
+    return tuple(parts) or None
+
+
+def _load(path: Path) -> Any:
+    from ..memory.memory_setup import get_retriever
+
+    retriever = get_retriever(path)
+    # get_retriever may have seeded and saved an empty store; sign after it.
+    _retrievers[str(path.resolve())] = (_signature(path), retriever)
+    return retriever
+
+
+def get_cached_retriever(path: str | Path | None = None) -> Any:
+    """Return the retriever for ``path``, loading it on first use."""
+    store = _store_path(path)
+    cached = _retrievers.get(str(store.resolve()))
+    if cached is not None:
+        return cached[1]
+    with _lock:
+        cached = _retrievers.get(str(store.resolve()))
+        return cached[1] if cached is not None else _load(store)
 
-from ..memory.memory_setup import get_retriever
 
-_retriever = get_retriever()
+def warm_up(path: str | Path | None = None) -> None:
+    """Load the retriever now so the first search does not pay for it."""
+    get_cached_retriever(path)
+
+
+def reload(path: str | Path | None = None, force: bool = False) -> bool:
+    """Rebuild the cached retriever if the index on disk changed.
+
+    Returns True when a new retriever was loaded. A path that was never
+    loaded is left for first use.
+    """
+    store = _store_path(path)
+    key = str(store.resolve())
+    with _lock:
+        cached = _retrievers.get(key)
+        if cached is None or (not force and cached[0] == _signature(store)):
+            return False
+        _load(store)
+        return True
+
+
+def clear_retrievers() -> None:
+    """Drop every cached retriever (they reload on next use)."""
+    with _lock:
+        _retrievers.clear()
+        _searchers.clear()
+
+
+def parse_query(
+    query: str, fields: Optional[Container[str]] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """Split leading ``field:value`` tokens off ``query``.
+
+    With ``fields``, only those fields are taken as filters; the first other
+    token (e.g. ``note:`` in free text) and everything after it stay in the
+    query text.
+    """
+    filters: Dict[str, Any] = {}
+    words = query.split()
+    while words:
+        match = _FILTER.fullmatch(words[0])
+        if match is None or (fields is not None and match.group(1) not in fields):
+            break
+        field, value = match.groups()
+        if field in filters:
+            previous = filters[field]
+            value = (previous if isinstance(previous, list) else [previous]) + [value]
+        filters[field] = value
+        words.pop(0)
+    return " ".join(words), filters
+
+
+def get_searcher(path: str | Path | None = None) -> Any:
+    """Return the `HybridSearcher` over the cached retriever's store."""
+    from ..memory.hybrid_search import HybridSearcher
+
+    retriever = get_cached_retriever(path)
+    key = str(_store_path(path).resolve())
+    cached = _searchers.get(key)
+    if cached is not None and cached[0] is retriever:
+        return cached[1]
+    with _lock:
+        cached = _searchers.get(key)
+        if cached is None or cached[0] is not retriever:
+            cached = (retriever, HybridSearcher(retriever.vectorstore))
+            _searchers[key] = cached
+        return cached[1]
+
+
+def search_memory(
+    query: str,
+    k: int = 4,
+    filters: Optional[Dict[str, Any]] = None,
+    mode: Optional[str] = None,
+    path: str | Path | None = None,
+) -> List[Document]:
+    """Return the top ``k`` documents, pre-filtered by metadata ``filters``."""
+    mode = mode or SEARCH_MODE
+    if not filters and mode == "vector":
+        retriever = get_cached_retriever(path)
+        if retriever.search_kwargs.get("k", 4) == k:
+            found: List[Document] = retriever.invoke(query)
+            return found
+    docs: List[Document] = get_searcher(path).search(query, k, filters, mode)
+    return docs
 
 
 @tool
 def memory_search(query: str) -> str:
-    """Search the FAISS memory and return matching document text."""
-    docs = _retriever.invoke(query)
+    """Search the FAISS memory and return matching document text.
+
+    Start the query with ``field:value`` tokens (e.g. ``doc_type:pricing``)
+    to search only documents with that metadata. Tokens naming a field no
+    document has are searched as plain text.
+    """
+    text, filters = parse_query(query)
+    if filters:  # only fields some document carries count as filters
+        text, filters = parse_query(query, get_searcher().metadata.fields)
+    docs = search_memory(text, filters=filters)
     if not docs:
         return "No documents found."
     if isinstance(docs[0], Document):
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Recall-vs-latency benchmark for FAISS index factories on synthetic vectors.
+
+Vectors are drawn around random cluster centres (closer to real embeddings
+than uniform noise). Ground truth comes from an exact flat index; each
+factory reports build time, serialized size, per-query latency and
+recall@k for every search setting.
+
+    python scripts/bench_faiss_index.py --vectors 200000 --dim 384 \\
+        --factory "IVF1024,PQ48:nprobe=8,32" --factory "HNSW32:efSearch=32,128"
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modular_ai_agent.memory.faiss_index import (  # noqa: E402
+    build_index,
+    set_search_params,
+)
+
+DEFAULT_FACTORIES = [
+    "Flat",
+    "IVF{nlist},Flat:nprobe=1,8,32",
+    "IVF{nlist},SQ8:nprobe=8,32",
+    "IVF{nlist},PQ{m}:nprobe=8,32",
+    "HNSW32:efSearch=16,64,256",
+    "SQ8",
+]
+
+
+def synthetic(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    noise = 0.3 * rng.standard_normal((n, dim)).astype(np.float32)
+    return centres[labels] + noise
+
+
+def _parse(spec: str) -> Tuple[str, str, List[float]]:
+    factory, _, sweep = spec.partition(":")
+    name, _, values = sweep.partition("=")
+    return factory, name, [float(v) for v in values.split(",")] if values else []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--train-size", type=int, default=50_000)
+    parser.add_argument("--factory", action="append", help="factory[:param=v1,v2]")
+    args = parser.parse_args()
+
+    data = synthetic(args.vectors, args.dim, max(16, args.vectors // 500), seed=0)
+    queries = synthetic(args.queries, args.dim, max(16, args.vectors // 500), seed=0)
+    queries += 0.05 * np.random.default_rng(1).standard_normal(queries.shape).astype(
+        np.float32
+    )
+    exact = faiss.IndexFlatL2(args.dim)
+    exact.add(data)
+    _, truth = exact.search(queries, args.k)
+
+    nlist = int(4 * np.sqrt(args.vectors))
+    m = max(d for d in range(1, min(args.dim // 4, 32) + 1) if args.dim % d == 0)
+    print(
+        f"{'factory':<22} {'param':<14} {'build s':>8} {'MB':>8} "
+        f"{'us/query':>9} {'recall@' + str(args.k):>10}"
+    )
+    for spec in args.factory or DEFAULT_FACTORIES:
+        factory, name, values = _parse(spec.format(nlist=nlist, m=m))
+        start = time.perf_counter()
+        index = build_index(data, factory, train_size=args.train_size)
+        build = time.perf_counter() - start
+        size = faiss.serialize_index(index).nbytes / 1e6
+        sweep: List[Optional[float]] = [*values] or [None]
+        for value in sweep:
+            if value is not None:
+                set_search_params(index, {name: value})
+            start = time.perf_counter()
+            _, found = index.search(queries, args.k)
+            latency = (time.perf_counter() - start) / args.queries * 1e6
+            recall = np.mean(
+                [len(set(f) & set(t)) / args.k for f, t in zip(found, truth)]
+            )
+            label = f"{name}={value:g}" if value is not None else "-"
+            print(
+                f"{factory:<22} {label:<14} {build:8.2f} {size:8.1f} "
+                f"{latency:9.1f} {recall:10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
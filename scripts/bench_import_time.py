@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Measure module import cost with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter; the script reports the
+cumulative import time of the module itself and the slowest dependencies.
+
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py agents.weblink_agent --top 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ["app_quote_api", "gui.app", "app", "agents.weblink_agent"]
+
+
+def import_profile(module: str) -> Tuple[int, List[Tuple[int, str]], str]:
+    """Return (cumulative_us, [(cumulative_us, name)], error) for ``module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows: List[Tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        rows.append((int(cumulative), name.strip()))
+    total = next((us for us, name in rows if name == module), 0)
+    error = "" if proc.returncode == 0 else proc.stderr.strip().splitlines()[-1]
+    return total, rows, error
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=3)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        total, rows, error = import_profile(module)
+        if error:
+            print(f"{module:<24} failed: {error}")
+            continue
+        print(f"{module:<24} {total / 1000:8.1f} ms")
+        # Top-level third-party packages dominate; skip submodules.
+        deps = sorted(r for r in rows if r[1] != module and "." not in r[1])
+        for us, name in deps[::-1][: args.top]:
+            print(f"    {name:<20} {us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
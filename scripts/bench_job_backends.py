@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Compare the JSONL and SQLite job store backends on the same workloads.
+
+* append: per-record ``save`` and group-committed ``JobWriter`` batches
+* scan: full ``iter_records`` and a projected scan
+* query: indexed ``filter`` by service/total and date range, ``get`` by row
+
+    python scripts/bench_job_backends.py --records 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storage.job_store import JobStore  # noqa: E402
+from storage.sqlite_job_store import SQLiteJobStore  # noqa: E402
+
+SERVICES = ("window", "pressure", "gutter", "roof")
+
+
+def _record(i: int) -> Dict[str, Any]:
+    service = SERVICES[i % len(SERVICES)]
+    qty = i % 200 + 1
+    return {
+        "prompt": f"{qty} {service} jobs",
+        "result": {
+            "customer": "Test Customer",
+            "items": [{"service": service, "qty": qty, "subtotal": qty * 4.0}],
+            "total": qty * 4.0,
+        },
+        "created_at": 1_700_000_000 + i * 60,
+    }
+
+
+def _timed(fn: Callable[[], Any], repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def run(store: Any, records: int, saves: int) -> List[float]:
+    mid = records // 2
+    results = [
+        _timed(lambda: [store.save(_record(i)) for i in range(saves)]) / saves,
+    ]
+
+    def bulk() -> None:
+        with store.writer(max_batch=5000) as writer:
+            writer.write_many(_record(i) for i in range(saves, records))
+
+    results.append(_timed(bulk))
+    assert len(store) == records
+    results.append(_timed(lambda: sum(1 for _ in store.iter_records())))
+    results.append(
+        _timed(
+            lambda: sum(r["result.total"] for r in store.iter_records(["result.total"]))
+        )
+    )
+    results.append(
+        _timed(
+            lambda: store.filter(service="gutter", min_total=700, limit=100), repeat=5
+        )
+    )
+    results.append(
+        _timed(
+            lambda: store.filter(
+                since=1_700_000_000 + mid * 60, until=1_700_086_400 + mid * 60
+            ),
+            repeat=5,
+        )
+    )
+    results.append(_timed(lambda: [store.get(mid + i) for i in range(1000)]))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--saves", type=int, default=1000, help="per-record saves")
+    args = parser.parse_args()
+
+    labels = [
+        "save() per record (ms)",
+        f"JobWriter {args.records - args.saves:,} records (ms)",
+        "iter_records full scan (ms)",
+        "iter_records projected (ms)",
+        "filter service+total limit 100 (ms)",
+        "filter 1-day date range (ms)",
+        "get(row) x1000 (ms)",
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = run(JobStore(Path(tmp) / "quotes.jsonl"), args.records, args.saves)
+        sqlite_store = SQLiteJobStore(Path(tmp) / "quotes.db")
+        sqlite = run(sqlite_store, args.records, args.saves)
+        sqlite_store.close()
+    print(f"{'workload':<40} {'jsonl':>10} {'sqlite':>10}")
+    for label, a, b in zip(labels, jsonl, sqlite):
+        print(f"{label:<40} {a:10.2f} {b:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
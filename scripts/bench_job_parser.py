@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for ``logic.job_parser.parse_prompt``.
+
+Builds a prompt corpus from ``data/quotes.jsonl`` (plus ``requests.jsonl``
+titles/bodies when present) and reports per-prompt latency with a cold and a
+warm extractor memo.
+
+    python scripts/bench_job_parser.py --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logic.job_parser import _extract, parse_prompt  # noqa: E402
+
+
+def load_corpus() -> List[str]:
+    prompts: List[str] = []
+    quotes = ROOT / "data" / "quotes.jsonl"
+    if quotes.exists():
+        for line in quotes.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                prompts.append(str(json.loads(line).get("prompt", "")))
+    requests = ROOT / "requests.jsonl"
+    if requests.exists():
+        for line in requests.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                req = json.loads(line)
+                prompts.extend([req.get("title", ""), req.get("body", "")])
+    prompts.extend(
+        [
+            "Clean 10 windows on a two storey house",
+            "Pressure wash 5 large areas, urgent",
+            "Quote for 12 large windows, urgent, two storey.",
+            "25 large windows, exterior only, 2nd storey, urgent",
+        ]
+    )
+    return prompts
+
+
+def time_per_prompt(prompts: List[str], repeat: int, warm: bool) -> List[float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        if not warm:
+            _extract.cache_clear()
+        for prompt in prompts:
+            start = time.perf_counter()
+            parse_prompt(prompt)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    mean = statistics.fmean(samples) * 1e6
+    print(f"{label:<6} mean={mean:7.2f}us  p50={p50:7.2f}us  p99={p99:7.2f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    prompts = load_corpus()
+    print(f"{len(prompts)} prompts, {args.repeat} rounds")
+    report("cold", time_per_prompt(prompts, args.repeat, warm=False))
+    parse_prompt(prompts[0])
+    report("warm", time_per_prompt(prompts, args.repeat, warm=True))
+
+
+if __name__ == "__main__":
+    main()
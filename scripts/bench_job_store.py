@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark ``JobStore`` reads on a synthetic quote log.
+
+Compares a full ``list_all`` scan (the only read path before the index) with
+indexed ``get``/``page``/``filter``. The log is generated once and reused.
+``--writes N`` instead measures ingestion: per-record ``save`` (with and
+without fsync) against the group-committing ``JobWriter``.
+
+    python scripts/bench_job_store.py --records 10000000 --path /tmp/quotes.jsonl
+    python scripts/bench_job_store.py --writes 20000 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storage.job_store import JobStore  # noqa: E402
+
+SERVICES = ("window", "pressure", "gutter", "roof")
+
+
+def generate(path: Path, records: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(records):
+            service = SERVICES[i % len(SERVICES)]
+            qty = rng.randint(1, 200)
+            total = round(qty * 4.0, 2)
+            record = {
+                "prompt": f"{qty} {service} jobs",
+                "result": {
+                    "customer": "Test Customer",
+                    "items": [{"service": service, "qty": qty, "subtotal": total}],
+                    "total": total,
+                },
+                "created_at": 1_700_000_000 + i * 60,
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def _record(i: int) -> Dict[str, Any]:
+    service = SERVICES[i % len(SERVICES)]
+    return {
+        "prompt": f"{i} {service} jobs",
+        "result": {"items": [{"service": service, "qty": i}], "total": i * 4.0},
+    }
+
+
+def bench_writes(count: int, threads: int, max_batch: int) -> None:
+    """Print records/s for each write path into a fresh temporary log."""
+
+    def run(
+        label: str,
+        write_one: Callable[[Dict[str, Any]], Any],
+        finish: Callable[[], Any] = lambda: None,
+    ) -> None:
+        per_thread = count // threads
+
+        def worker(t: int) -> None:
+            for i in range(per_thread):
+                write_one(_record(t * per_thread + i))
+
+        start = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        finish()
+        elapsed = time.perf_counter() - start
+        rate = per_thread * threads / elapsed
+        print(f"{label:<34} {rate:12,.0f} records/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(Path(tmp) / "save.jsonl")
+        run("save() per record", store.save)
+        synced = JobStore(Path(tmp) / "save_fsync.jsonl")
+        run("save() + fsync per record", lambda r: synced.commit([r], fsync=True))
+        batched = JobStore(Path(tmp) / "writer.jsonl")
+        writer = batched.writer(max_batch=max_batch)
+        run(f"JobWriter(max_batch={max_batch}) + fsync", writer.write, writer.close)
+        print(f"  {writer.batches} group commits for {writer.records} records")
+        assert len(batched) == len(store)
+
+
+def _timed(label: str, fn: Callable[[], Any], repeat: int = 1) -> Any:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<34} {elapsed * 1e3:12.2f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--path", default="/tmp/bench_quotes.jsonl")
+    parser.add_argument("--skip-scan", action="store_true", help="skip list_all")
+    parser.add_argument("--writes", type=int, help="benchmark N writes instead")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.writes:
+        bench_writes(args.writes, args.threads, args.max_batch)
+        return
+
+    path = Path(args.path)
+    if not path.exists() or sum(1 for _ in path.open("rb")) != args.records:
+        print(f"generating {args.records:,} records in {path} ...")
+        generate(path, args.records)
+
+    store = JobStore(path)
+    _timed("index build (first open)", lambda: len(store))
+    reopened = JobStore(path)
+    _timed("reopen (mmap sidecar)", lambda: len(reopened))
+
+    mid = args.records // 2
+    _timed("get(row) x1000", lambda: [reopened.get(mid + i) for i in range(1000)])
+    _timed("page(mid, 100)", lambda: reopened.page(mid, 100), repeat=20)
+    hits = _timed(
+        "filter service+total, limit 100",
+        lambda: reopened.filter(service="gutter", min_total=700, limit=100),
+        repeat=5,
+    )
+    _timed(
+        "filter date range (1 day)",
+        lambda: reopened.filter(
+            since=1_700_000_000 + mid * 60, until=1_700_086_400 + mid * 60
+        ),
+        repeat=5,
+    )
+    if not args.skip_scan:
+        rows = _timed("list_all (full parse)", reopened.list_all)
+        _timed(
+            "iter_records(fields=[total]) sum",
+            lambda: sum(
+                r["result.total"] for r in reopened.iter_records(["result.total"])
+            ),
+        )
+        _timed(
+            "list_all + python filter",
+            lambda: [
+                r
+                for r in reopened.list_all()
+                if r["result"]["items"][0]["service"] == "gutter"
+                and r["result"]["total"] >= 700
+            ][:100],
+        )
+        assert len(rows) == args.records
+    assert len(hits) == 100
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark ``logic.kb_ingestor`` on a synthetic document tree.
+
+Runs a cold ingest serially and with a process pool, then re-ingests after
+touching ``--changed`` files so only the delta is loaded and embedded. Each
+run prints the per-stage report. Uses ``FakeEmbeddings`` unless
+``OPENAI_API_KEY`` is set.
+
+    python scripts/bench_kb_ingest.py --files 2000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from logic.kb_ingestor import ingest_incremental  # noqa: E402
+
+WORDS = "gutter window roof pressure wash tile slate moss ladder quote".split()
+
+
+def generate(root: Path, files: int, paragraphs: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    for i in range(files):
+        path = root / f"dir{i % 20}" / f"doc{i}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = "\n\n".join(
+            " ".join(rng.choice(WORDS) for _ in range(120)) for _ in range(paragraphs)
+        )
+        path.write_text(text, encoding="utf-8")
+
+
+def _run(label: str, docs: Path, store: Path, workers: int) -> None:
+    start = time.perf_counter()
+    stats = ingest_incremental(docs, str(store), workers=workers)
+    print(f"--- {label}: {time.perf_counter() - start:.2f} s wall")
+    print(stats.report())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--paragraphs", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = Path(tmp) / "docs"
+        generate(docs, args.files, args.paragraphs)
+        _run("cold, serial", docs, Path(tmp) / "serial", workers=1)
+        store = Path(tmp) / "pool"
+        _run(f"cold, {args.workers} workers", docs, store, args.workers)
+        _run("re-ingest, nothing changed", docs, store, args.workers)
+        for path in sorted(docs.rglob("*.txt"))[: args.changed]:
+            path.write_text(path.read_text(encoding="utf-8") + "\n\nrevised")
+        _run(f"re-ingest, {args.changed} changed", docs, store, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark small inserts into a large FAISS store via ``add_documents``.
+
+Times single-document inserts with ``persist="full"`` (save_local on every
+call) and ``persist="delta"`` (append to ``<store>/delta/``), plus the old
+per-insert docstore scan for the placeholder, and reload time with a delta.
+
+    python scripts/bench_memory_add.py --docs 50000 --inserts 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_community.vectorstores import FAISS  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+
+from modular_ai_agent.memory.memory_setup import (  # noqa: E402
+    add_documents,
+    compact,
+    get_vectorstore,
+)
+
+
+def _legacy_scan(store: FAISS) -> None:
+    # The placeholder lookup add_documents used to run after every insert.
+    for _, doc_id in list(store.index_to_docstore_id.items()):
+        doc = store.docstore.search(doc_id)
+        if isinstance(doc, Document) and doc.page_content == "dummy":
+            store.delete([doc_id])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--inserts", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "vs"
+        store = get_vectorstore(path)
+        base = [f"document {i}" for i in range(args.docs)]
+        start = time.perf_counter()
+        add_documents(store, base, path, persist="full")
+        print(f"seed {args.docs:,} docs: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        for _ in range(args.inserts):
+            _legacy_scan(store)
+        scan = (time.perf_counter() - start) / args.inserts
+        print(f"{'old placeholder scan':<28} {scan * 1e3:10.2f} ms/insert")
+
+        for mode in ("full", "delta"):
+            start = time.perf_counter()
+            for i in range(args.inserts):
+                add_documents(store, [f"{mode} insert {i}"], path, persist=mode)
+            per = (time.perf_counter() - start) / args.inserts
+            print(f"{'add_documents ' + mode:<28} {per * 1e3:10.2f} ms/insert")
+
+        start = time.perf_counter()
+        reloaded = get_vectorstore(path)
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"{'reload + delta replay':<28} {elapsed:10.2f} ms")
+        assert reloaded.index.ntotal == store.index.ntotal
+        compact(store, path)
+
+
+if __name__ == "__main__":
+    main()
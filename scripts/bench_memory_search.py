@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Latency and recall benchmark for filtered and hybrid memory search.
+
+Builds a synthetic corpus of general KB chunks plus ``doc_type: pricing``
+rows (one ``material`` each) with bag-of-words hash embeddings, then runs
+``price per m2 <material>`` queries through:
+
+* ``unfiltered``  - plain top-k vector search (the old ``memory_search``)
+* ``post-filter`` - vector top ``k * overfetch``, then drop non-pricing rows
+* ``pre-filter``  - `HybridSearcher` with the metadata index (exact path and
+                    FAISS ``IDSelector`` path)
+* ``bm25`` / ``hybrid`` - keyword and RRF-fused search, pre-filtered
+
+``recall`` is against an exact brute-force search over the pricing rows;
+``precision`` is the share of returned rows whose material matches the
+query.
+
+    python scripts/bench_memory_search.py --docs 100000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_community.vectorstores import FAISS  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from modular_ai_agent.memory.hybrid_search import (  # noqa: E402
+    HybridSearcher,
+    tokenize,
+)
+
+
+class HashEmbeddings(Embeddings):
+    """Mean of fixed random token vectors; shared words mean similar vectors."""
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self._tokens: Dict[str, np.ndarray] = {}
+
+    def _token(self, token: str) -> np.ndarray:
+        vector = self._tokens.get(token)
+        if vector is None:
+            rng = np.random.default_rng(zlib.crc32(token.encode()))
+            vector = rng.standard_normal(self.dim).astype(np.float32)
+            self._tokens[token] = vector
+        return vector
+
+    def vector(self, text: str) -> np.ndarray:
+        tokens = tokenize(text) or [""]
+        mean: np.ndarray = np.mean([self._token(t) for t in tokens], axis=0)
+        return mean
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.vector(t).tolist() for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        query: List[float] = self.vector(text).tolist()
+        return query
+
+
+def corpus(
+    n: int, materials: int, pricing: float, seed: int
+) -> Tuple[List[str], List[str], List[Dict[str, str]]]:
+    rng = np.random.default_rng(seed)
+    names = [f"material{i}" for i in range(materials)]
+    vocab = [f"word{i}" for i in range(5000)]
+    texts: List[str] = []
+    metadatas: List[Dict[str, str]] = []
+    for _ in range(n):
+        filler = " ".join(rng.choice(vocab, 12))
+        if rng.random() < pricing:
+            name = names[rng.integers(materials)]
+            texts.append(f"{name} price per m2 is {rng.integers(5, 200)} {filler}")
+            metadatas.append({"doc_type": "pricing", "material": name})
+        else:
+            # KB chunks also mention materials and prices, which is what
+            # makes unfiltered search return them for pricing queries.
+            name = names[rng.integers(materials)]
+            texts.append(f"{filler} price per m2 for {name} varies {filler}")
+            metadatas.append({"doc_type": "kb"})
+    return names, texts, metadatas
+
+
+def timed(
+    fn: Callable[[str], Sequence[Any]], queries: List[str]
+) -> Tuple[List[List[Any]], float]:
+    results: List[List[Any]] = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append(list(fn(query)))
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--materials", type=int, default=500)
+    parser.add_argument("--pricing", type=float, default=0.05)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--overfetch", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    names, texts, metadatas = corpus(args.docs, args.materials, args.pricing, args.seed)
+    embeddings = HashEmbeddings(args.dim)
+    start = time.perf_counter()
+    vectors = np.stack([embeddings.vector(t) for t in texts])
+    store = FAISS.from_embeddings(
+        list(zip(texts, vectors.tolist())), embeddings, metadatas=metadatas
+    )
+    print(
+        f"{args.docs} docs, {args.dim}d: store built in "
+        f"{time.perf_counter() - start:.1f}s"
+    )
+
+    searcher = HybridSearcher(store)
+    start = time.perf_counter()
+    metadata, bm25 = searcher.metadata, searcher.bm25
+    print(f"metadata + BM25 indexes built in {time.perf_counter() - start:.1f}s")
+    selector = HybridSearcher(store, exact_max=0)
+    selector._metadata, selector._bm25 = searcher._metadata, searcher._bm25
+    row_of = {doc_id: row for row, doc_id in store.index_to_docstore_id.items()}
+
+    filters = {"doc_type": "pricing"}
+    rng = np.random.default_rng(args.seed + 1)
+    wanted = [names[i] for i in rng.integers(len(names), size=args.queries)]
+    queries = [f"price per m2 {name}" for name in wanted]
+    k = args.k
+
+    rows, scan_ms = timed(
+        lambda q: [[i for i, m in enumerate(metadatas) if m["doc_type"] == "pricing"]],
+        queries[:10],
+    )
+    _, index_ms = timed(lambda q: [metadata.rows(filters)], queries)
+    pricing_rows = np.asarray(rows[0][0])
+    print(
+        f"filter {filters}: {len(pricing_rows)} rows; linear scan "
+        f"{scan_ms:.2f} ms, inverted index {index_ms:.4f} ms"
+    )
+
+    pricing_vectors = vectors[pricing_rows]
+    truth = []
+    for query in queries:
+        q = embeddings.vector(query)
+        order = np.argsort(((pricing_vectors - q) ** 2).sum(axis=1), kind="stable")
+        truth.append(set(pricing_rows[order[:k]].tolist()))
+
+    def post_filter(query: str) -> List[int]:
+        hits = searcher.vector_search(query, k * args.overfetch)
+        return [r for r, _ in hits if metadatas[r]["doc_type"] == "pricing"][:k]
+
+    def ranked(s: HybridSearcher, mode: str) -> Callable[[str], List[int]]:
+        def run(query: str) -> List[int]:
+            rows = s.metadata.rows(filters)
+            if mode == "vector":
+                return [r for r, _ in s.vector_search(query, k, rows)]
+            docs = s.search(query, k, filters, mode)
+            return [row_of[str(d.id)] for d in docs]
+
+        return run
+
+    runs = {
+        "unfiltered": lambda q: [r for r, _ in searcher.vector_search(q, k)],
+        f"post-filter x{args.overfetch}": post_filter,
+        "pre-filter exact": ranked(searcher, "vector"),
+        "pre-filter selector": ranked(selector, "vector"),
+        "pre-filter bm25": ranked(searcher, "bm25"),
+        "pre-filter hybrid": ranked(searcher, "hybrid"),
+    }
+    print(
+        f"\n{'mode':<22}{'ms/query':>10}{'recall@' + str(k):>11}"
+        f"{'precision':>11}{'pricing':>9}"
+    )
+    for name, fn in runs.items():
+        results, ms = timed(fn, queries)
+        recall = np.mean([len(t & set(r)) / k for t, r in zip(truth, results)])
+        precision = np.mean(
+            [
+                sum(metadatas[x].get("material") == m for x in r) / k
+                for m, r in zip(wanted, results)
+            ]
+        )
+        share = np.mean(
+            [sum(metadatas[x]["doc_type"] == "pricing" for x in r) / k for r in results]
+        )
+        print(f"{name:<22}{ms:>10.2f}{recall:>11.3f}{precision:>11.3f}{share:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
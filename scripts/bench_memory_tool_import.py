@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for ``modular_ai_agent.tools.memory_tool``.
+
+Each measurement runs in a fresh interpreter so module caches do not leak
+between runs. Reports the median import time of the tool and of
+``logic.pricing_rules`` (which imports it), then the cost of the first
+search (lazy FAISS load) and of a warm search.
+
+    python scripts/bench_memory_tool_import.py --runs 5 --store memory/vector_store
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter() - start
+from modular_ai_agent.tools import memory_tool
+start = time.perf_counter()
+memory_tool.memory_search.invoke("gutter cleaning")
+first = time.perf_counter() - start
+start = time.perf_counter()
+memory_tool.memory_search.invoke("gutter cleaning")
+warm = time.perf_counter() - start
+print(json.dumps([imported, first, warm]))
+"""
+
+
+def _probe(module: str, store: str) -> List[float]:
+    env = {**os.environ, "VECTOR_STORE_PATH": store}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: List[float] = json.loads(out.stdout.strip().splitlines()[-1])
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--store", default="memory/vector_store")
+    args = parser.parse_args()
+
+    print(f"{'module':<36} {'import s':>9} {'1st search s':>13} {'warm ms':>8}")
+    for module in ("modular_ai_agent.tools.memory_tool", "logic.pricing_rules"):
+        runs = [_probe(module, args.store) for _ in range(args.runs)]
+        imported, first, warm = (statistics.median(col) for col in zip(*runs))
+        print(f"{module:<36} {imported:9.3f} {first:13.3f} {warm * 1e3:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory and cold start: regular FAISS load vs memory-mapped load.
+
+Builds a synthetic store, exports it for mmap loading, then starts
+``--workers`` processes that each load the store, run a few searches and
+report load time, RSS and PSS (``/proc/self/smaps_rollup``; PSS splits
+shared pages between the processes mapping them, so it shows the sharing).
+All workers stay alive until every one has reported. Linux only.
+
+    python scripts/bench_mmap_workers.py --docs 50000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_community.vectorstores import FAISS  # noqa: E402
+
+from modular_ai_agent.memory.memory_setup import (  # noqa: E402
+    _get_embeddings,
+    get_vectorstore,
+)
+from modular_ai_agent.memory.mmap_store import export_mmap, load_mmap  # noqa: E402
+
+
+def _memory_mb() -> Dict[str, float]:
+    out = {}
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss"):
+                out[name] = int(value.split()[0]) / 1024
+    return out
+
+
+def _worker(path: str, mode: str, barrier: Any, queue: Any) -> None:
+    before = _memory_mb()
+    start = time.perf_counter()
+    if mode == "mmap":
+        store = load_mmap(path, _get_embeddings())
+        assert store is not None, "main() exports before starting workers"
+    else:
+        store = get_vectorstore(path)
+    load = time.perf_counter() - start
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        store.similarity_search_by_vector(rng.standard_normal(store.index.d), k=4)
+    barrier.wait()  # every worker holds its store now
+    after = _memory_mb()
+    queue.put((load, after["Rss"] - before["Rss"], after["Pss"] - before["Pss"]))
+    barrier.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((args.docs, args.dim)).astype(np.float32)
+        texts = [f"document {i} " + "lorem ipsum " * 20 for i in range(args.docs)]
+        store = FAISS.from_embeddings(
+            zip(texts, vectors.tolist()),
+            _get_embeddings(),
+            metadatas=[{"doc_type": "note", "n": i} for i in range(args.docs)],
+        )
+        store.save_local(tmp)
+        export_mmap(store, tmp)
+        del store, vectors
+
+        ctx = mp.get_context("spawn")
+        print(f"{args.docs:,} docs x {args.dim}d, {args.workers} workers")
+        print(f"{'mode':<8} {'load s':>8} {'RSS MB':>9} {'PSS MB':>9}  (per worker)")
+        for mode in ("regular", "mmap"):
+            barrier, queue = ctx.Barrier(args.workers), ctx.Queue()
+            procs = [
+                ctx.Process(target=_worker, args=(tmp, mode, barrier, queue))
+                for _ in range(args.workers)
+            ]
+            for proc in procs:
+                proc.start()
+            stats = np.array([queue.get() for _ in procs])
+            for proc in procs:
+                proc.join()
+            load, rss, pss = stats.mean(axis=0)
+            print(f"{mode:<8} {load:8.3f} {rss:9.1f} {pss:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
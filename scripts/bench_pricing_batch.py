@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark vectorized batch pricing against the scalar ``calculate_price`` path.
+
+    python scripts/bench_pricing_batch.py --jobs 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from logic.pricing_batch import (
+    JobBatch,
+    calculate_prices_batch,  # noqa: E402
+    surcharge_keys,
+)
+from logic.pricing_engine import default_engine  # noqa: E402
+
+
+def synthetic_batch(n: int, seed: int = 0) -> JobBatch:
+    rules = default_engine().rules
+    rng = np.random.default_rng(seed)
+    services = np.array(list(rules.services), dtype=object)
+    return JobBatch(
+        service=services[rng.integers(0, len(services), n)],
+        qty=rng.integers(1, 500, n),
+        large=rng.random(n) < 0.3,
+        storey=rng.integers(1, 4, n),
+        surcharges=rng.integers(0, 1 << len(surcharge_keys(rules)), n),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument(
+        "--scalar-sample",
+        type=int,
+        default=100_000,
+        help="Jobs priced with the scalar path (throughput is extrapolated)",
+    )
+    args = parser.parse_args()
+
+    engine = default_engine()
+    rules = engine.rules
+    keys = surcharge_keys(rules)
+    batch = synthetic_batch(args.jobs)
+
+    start = time.perf_counter()
+    calculate_prices_batch(batch, rules)
+    batch_s = time.perf_counter() - start
+
+    sample = min(args.scalar_sample, args.jobs)
+    scopes = [
+        {
+            "service": batch.service[i],
+            "qty": int(batch.qty[i]),
+            "size": "large" if batch.large[i] else "",
+            "storey": int(batch.storey[i]),
+            "surcharges": {
+                k: True for b, k in enumerate(keys) if batch.surcharges[i] & (1 << b)
+            },
+        }
+        for i in range(sample)
+    ]
+    start = time.perf_counter()
+    for scope in scopes:
+        rules.quote(scope)
+    scalar_s = time.perf_counter() - start
+
+    print(
+        f"batch : {args.jobs:>10,} jobs in {batch_s:.3f}s "
+        f"({args.jobs / batch_s:,.0f} jobs/s)"
+    )
+    print(
+        f"scalar: {sample:>10,} jobs in {scalar_s:.3f}s "
+        f"({sample / scalar_s:,.0f} jobs/s)"
+    )
+    print(f"speedup: {(args.jobs / batch_s) / (sample / scalar_s):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
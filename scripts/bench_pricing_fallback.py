@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Time ``calculate_price`` for services missing from the pricing config.
+
+Compares the material index (``pricing_index.json``) with the FAISS memory
+search it replaces. The quote and memory caches are cleared before every
+call, so each one takes the full fallback path.
+
+    python scripts/bench_pricing_fallback.py --calls 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import logic.pricing_rules as pricing_rules  # noqa: E402
+from modular_ai_agent.memory.load_pricing import ingest  # noqa: E402
+
+
+def _time(calls: int, service: str) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        pricing_rules.clear_quote_cache()
+        pricing_rules.calculate_price({"service": service, "qty": 3})
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--csv", default="data/pricing_rules.csv")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ingest(args.csv, tmp)
+        pricing_rules.PRICING_STORE_PATH = Path(tmp)
+        indexed = _time(args.calls, "epoxy")
+        fuzzy = _time(args.calls, "epoxies")
+        pricing_rules.PRICING_STORE_PATH = Path(tmp) / "missing"
+        vector = _time(args.calls, "epoxy")
+
+    print(f"index (exact) : {indexed * 1e6:9.1f} us/call")
+    print(f"index (fuzzy) : {fuzzy * 1e6:9.1f} us/call")
+    print(f"memory search : {vector * 1e6:9.1f} us/call")
+    print(f"speed-up      : {vector / indexed:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Show ``QuoteVectorStore.build_index`` cost per request as the quote log grows.
+
+Each simulated request appends one quote and then calls ``build_index`` and
+``query``, as ``/quote/similar`` and the GUI do. A hashing embedder is used by
+default so the numbers reflect indexing overhead; pass ``--hf`` to use the
+real all-MiniLM-L6-v2 model.
+
+    python scripts/bench_quote_index.py --sizes 100 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from vector_store.quote_embedder import QuoteVectorStore  # noqa: E402
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic embeddings; ``call_overhead`` mimics a model's per-call cost."""
+
+    def __init__(self, dim: int = 384, call_overhead: float = 0.0) -> None:
+        self.dim = dim
+        self.call_overhead = call_overhead
+
+    def _embed(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [digest[i % len(digest)] / 255.0 for i in range(self.dim)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Spin rather than sleep: inference competes for the CPU.
+        deadline = time.perf_counter() + self.call_overhead
+        while time.perf_counter() < deadline:
+            pass
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def append_quotes(path: Path, start: int, count: int) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for i in range(start, start + count):
+            record = {"prompt": f"clean {i} windows", "result": {"total": i * 4.0}}
+            f.write(json.dumps(record) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--hf", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "quotes.jsonl"
+        data.touch()
+        vs = QuoteVectorStore(
+            data_path=str(data),
+            persist_dir=str(Path(tmp) / "chroma"),
+            embedding_model=None if args.hf else HashEmbeddings(),
+        )
+        written = 0
+        for size in sorted(args.sizes):
+            append_quotes(data, written, size - written)
+            written = size
+            vs.build_index()  # catch up outside the timing
+            timings = []
+            for _ in range(args.requests):
+                append_quotes(data, written, 1)
+                written += 1
+                start = time.perf_counter()
+                vs.build_index()
+                vs.query("clean windows", top_k=3)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(
+                f"{size:>8,} quotes  p50 {timings[len(timings) // 2] * 1e3:7.2f} ms"
+                f"  max {timings[-1] * 1e3:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark weblink ``query_related`` lookups on synthetic issue graphs.
+
+Fills an ``IssueIndex`` with random unit vectors and times exact (matmul +
+argpartition) and, when FAISS is installed, approximate (HNSW) queries.
+
+    python scripts/bench_weblink_query.py --sizes 1000 100000 1000000 --dim 384
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.weblink_index import IssueIndex  # noqa: E402
+
+
+def build_index(n: int, dim: int, ann_threshold: int | None) -> IssueIndex:
+    rng = np.random.default_rng(0)
+    index = IssueIndex(ann_threshold=ann_threshold)
+    batch = 100_000
+    for start in range(0, n, batch):
+        vecs = rng.normal(size=(min(batch, n - start), dim)).astype(np.float32)
+        for i, vec in enumerate(vecs, start):
+            index.add(str(i), f"issue {i}", vec)
+    return index
+
+
+def time_queries(index: IssueIndex, dim: int, queries: int, top_k: int) -> float:
+    rng = np.random.default_rng(1)
+    qs = rng.normal(size=(queries, dim)).astype(np.float32)
+    index.search(qs[0], top_k)  # build ANN / warm caches outside the timing
+    start = time.perf_counter()
+    for q in qs:
+        index.search(q, top_k)
+    return (time.perf_counter() - start) / queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--ann", action="store_true", help="Also time HNSW")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        index = build_index(n, args.dim, ann_threshold=None)
+        exact = time_queries(index, args.dim, args.queries, args.top_k)
+        line = f"{n:>9,} nodes  exact {exact * 1e3:8.3f} ms/query"
+        if args.ann:
+            index.ann_threshold = 0
+            ann = time_queries(index, args.dim, args.queries, args.top_k)
+            line += f"  hnsw {ann * 1e3:8.3f} ms/query"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Load-test ``POST /quote/similar`` in-process and report latency percentiles.
+
+``cold`` reproduces the old behaviour (a new ``QuoteVectorStore`` per
+request); ``shared`` uses the store created once in the app lifespan and
+``batched`` additionally routes its queries through the micro-batcher. A
+hashing embedder is used by default so the run works offline; pass
+``--embedder hf`` to load all-MiniLM-L6-v2 (that is where the cold path
+really hurts). ``--distinct`` limits the prompt pool so identical concurrent
+requests are coalesced.
+
+    PYTHONPATH=. python scripts/load_test_quote_api.py --requests 200 --concurrency 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app_quote_api  # noqa: E402
+from modular_ai_agent.memory.embedding_batcher import micro_batch  # noqa: E402
+from scripts.bench_quote_index import HashEmbeddings, append_quotes  # noqa: E402
+from vector_store.quote_embedder import QuoteVectorStore  # noqa: E402
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    idx = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[idx]
+
+
+def _run(
+    client: TestClient, requests: int, concurrency: int, distinct: int
+) -> List[float]:
+    def one(i: int) -> float:
+        prompt = f"clean {i % distinct if distinct else i} windows"
+        start = time.perf_counter()
+        response = client.post("/quote/similar", json={"prompt": prompt, "top_k": 3})
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return sorted(pool.map(one, range(requests)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--quotes", type=int, default=1000)
+    parser.add_argument(
+        "--distinct",
+        type=int,
+        default=0,
+        help="cycle through this many prompts (0 = all distinct)",
+    )
+    parser.add_argument("--embedder", choices=["hash", "hf"], default="hash")
+    parser.add_argument(
+        "--call-overhead-ms",
+        type=float,
+        default=0.0,
+        help="fixed cost per hash-embedder call, to mimic model inference",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "quotes.jsonl"
+        append_quotes(data, 0, args.quotes)
+        hashed = (
+            HashEmbeddings(call_overhead=args.call_overhead_ms / 1000)
+            if args.embedder == "hash"
+            else None
+        )
+
+        def make_store() -> QuoteVectorStore:
+            return QuoteVectorStore(
+                data_path=str(data),
+                persist_dir=str(Path(tmp) / "chroma"),
+                embedding_model=hashed,
+            )
+
+        app = app_quote_api.app
+        modes = (
+            ("cold", True, False),
+            ("shared", False, False),
+            ("batched", False, True),
+        )
+        for name, per_request, batched in modes:
+            store = make_store()
+            if batched:
+                store.embedding_model = micro_batch(store.embedding_model)
+            app.state.quote_store = store
+            if per_request:
+                app.dependency_overrides[app_quote_api.get_quote_store] = make_store
+            try:
+                with TestClient(app) as client:
+                    start = time.perf_counter()
+                    timings = _run(
+                        client, args.requests, args.concurrency, args.distinct
+                    )
+                    elapsed = time.perf_counter() - start
+                    batches = client.get("/stats").json()["embedding_batches"]
+            finally:
+                app.dependency_overrides.clear()
+            print(
+                f"{name:>6}: p50 {_percentile(timings, 50) * 1e3:8.2f} ms  "
+                f"p99 {_percentile(timings, 99) * 1e3:8.2f} ms  "
+                f"{args.requests / elapsed:7.1f} req/s  "
+                f"({args.requests} requests, concurrency {args.concurrency})"
+            )
+            if "quotes" in batches:
+                print(f"        mean batch {batches['quotes']['mean_batch_size']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+CLI helper that parses a JSONL backlog of free-text job prompts.
+"""
+
+from logic.job_parser import parse_jsonl_cli
+
+if __name__ == "__main__":
+    parse_jsonl_cli()
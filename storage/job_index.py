@@ -0,0 +1,337 @@
+"""
+Sidecar index for an append-only JSONL job log.
+
+Next to ``quotes.jsonl`` lives ``quotes.jsonl.idx/``::
+
+    meta.json      {"rows", "end", "checksum", "services"}
+    offsets.u64    byte offset of every record line
+    service.i32    code into meta["services"] (-1 = none)
+    total.f64      quoted total (NaN = none)
+    date.i64       created-at, epoch seconds (-1 = none)
+
+Columns are appended as records arrive and memory-mapped on load, so
+fetching by row, paging and filtering never parse the whole log. Lines
+written by other processes (the GUI appends to the log directly) are picked
+up on the next refresh; a log that was rewritten in place is re-indexed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+CHECKSUM_WINDOW = 4096
+REFRESH_BATCH = 100_000
+COLUMNS: Dict[str, Any] = {
+    "offsets": np.uint64,
+    "service": np.int32,
+    "total": np.float64,
+    "date": np.int64,
+}
+_SUFFIX = {"offsets": "u64", "service": "i32", "total": "f64", "date": "i64"}
+DATE_FIELDS = ("created_at", "date", "timestamp")
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """Convert an ISO string, datetime or number to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return None
+
+
+def date_bound(value: Any, name: str) -> Optional[int]:
+    """Return a ``since``/``until`` bound as epoch seconds (None = unbounded).
+
+    Raises ``ValueError`` for a value `to_epoch` cannot parse.
+    """
+    if value is None:
+        return None
+    epoch = to_epoch(value)
+    if epoch is None:
+        raise ValueError(f"unparseable {name}: {value!r}")
+    return epoch
+
+
+def complete_lines(path: Path, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, line) for each whole line of ``path`` from ``offset``.
+
+    A final line without a newline is whole only when it parses as JSON and
+    the file stopped growing while it was read; otherwise a writer is
+    mid-append and the line is left for the next call.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                try:
+                    json.loads(raw)
+                except ValueError:
+                    return
+                if os.fstat(f.fileno()).st_size != size:
+                    return
+            yield offset, raw
+            offset += len(raw)
+
+
+def record_fields(record: Dict[str, Any]) -> Tuple[str, float, int]:
+    """Return the (service, total, date) a record is indexed under."""
+    result = record.get("result")
+    source = result if isinstance(result, dict) else record
+    items = source.get("items") or []
+    service = ""
+    if items and isinstance(items[0], dict):
+        service = str(items[0].get("service") or "")
+    elif record.get("service"):
+        service = str(record["service"])
+    total = float("nan")
+    value = source.get("total")
+    if isinstance(value, (int, float, str)):
+        try:
+            total = float(value)
+        except ValueError:
+            pass
+    date = -1
+    for field in DATE_FIELDS:
+        epoch = to_epoch(record.get(field))
+        if epoch is not None:
+            date = epoch
+            break
+    return service, total, date
+
+
+class JobIndex:
+    """Columnar row index over a JSONL file; see the module docstring."""
+
+    def __init__(self, data_path: Path) -> None:
+        self.data_path = Path(data_path)
+        self.directory = self.data_path.with_name(self.data_path.name + ".idx")
+        self.rows = 0
+        self.end = 0
+        self.checksum = ""
+        self.resets = 0
+        self.services: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        self._loaded = False
+
+    # -- persistence -----------------------------------------------------
+
+    def _column_path(self, name: str) -> Path:
+        return self.directory / f"{name}.{_SUFFIX[name]}"
+
+    def _checksum(self, offset: int) -> str:
+        if offset == 0:
+            return hashlib.sha256(b"").hexdigest()
+        start = max(0, offset - CHECKSUM_WINDOW)
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def _load(self) -> None:
+        self._loaded = True
+        meta_path = self.directory / "meta.json"
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return self._reset()
+        size = self.data_path.stat().st_size if self.data_path.exists() else 0
+        end = int(meta.get("end", 0))
+        if end > size or meta.get("checksum") != self._checksum(end):
+            return self._reset()
+        rows = int(meta["rows"])
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            if (
+                not path.exists()
+                or path.stat().st_size < rows * np.dtype(dtype).itemsize
+            ):
+                return self._reset()
+        self.rows, self.end, self.checksum = rows, end, meta["checksum"]
+        self.services = list(meta.get("services", []))
+        self._codes = {name: i for i, name in enumerate(self.services)}
+        self._map_columns()
+
+    def _map_columns(self) -> None:
+        for name, dtype in COLUMNS.items():
+            self._columns[name] = (
+                np.memmap(
+                    self._column_path(name), dtype=dtype, mode="r", shape=(self.rows,)
+                )
+                if self.rows
+                else np.zeros(0, dtype=dtype)
+            )
+
+    def _reset(self) -> None:
+        self.rows = self.end = 0
+        self.checksum = ""
+        self.resets += 1
+        self.services, self._codes = [], {}
+        self._columns = {n: np.zeros(0, dtype=d) for n, d in COLUMNS.items()}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            self._column_path(name).write_bytes(b"")
+
+    def _write_meta(self) -> None:
+        self.checksum = self._checksum(self.end)
+        meta = {
+            "rows": self.rows,
+            "end": self.end,
+            "checksum": self.checksum,
+            "services": self.services,
+        }
+        tmp = self.directory / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.directory / "meta.json")
+
+    # -- updates ---------------------------------------------------------
+
+    def _code(self, service: str) -> int:
+        if not service:
+            return -1
+        code = self._codes.get(service)
+        if code is None:
+            code = self._codes[service] = len(self.services)
+            self.services.append(service)
+        return code
+
+    def _append(self, entries: List[Tuple[int, Dict[str, Any]]], end: int) -> None:
+        """Append (offset, record) pairs and persist; columns first, then meta."""
+        cols: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+        for offset, record in entries:
+            service, total, date = record_fields(record)
+            cols["offsets"].append(offset)
+            cols["service"].append(self._code(service))
+            cols["total"].append(total)
+            cols["date"].append(date)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, dtype in COLUMNS.items():
+            new = np.asarray(cols[name], dtype=dtype)
+            path = self._column_path(name)
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                # Drop bytes past ``rows`` left by an interrupted append.
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(new.tobytes())
+        self.rows += len(entries)
+        self.end = end
+        self._write_meta()
+        self._map_columns()
+
+    def refresh(self) -> int:
+        """Index lines appended since the last refresh; return how many.
+
+        Callers sharing the sidecar across processes must hold the store's
+        file lock (see `storage.job_store`).
+        """
+        if not self.stale():
+            return 0
+        # Another process may have indexed further: start from the sidecar.
+        self._load()
+        size = self.data_path.stat().st_size if self.data_path.exists() else 0
+        if size == self.end:
+            return 0
+        added = 0
+        entries: List[Tuple[int, Dict[str, Any]]] = []
+        offset = self.end
+        for start, raw in complete_lines(self.data_path, offset):
+            if raw.strip():
+                try:
+                    entries.append((start, json.loads(raw)))
+                except ValueError:
+                    pass  # corrupt line: not a row
+            offset = start + len(raw)
+            if len(entries) >= REFRESH_BATCH:
+                self._append(entries, offset)
+                added += len(entries)
+                entries = []
+        if offset != self.end:
+            self._append(entries, offset)
+            added += len(entries)
+        return added
+
+    def stale(self) -> bool:
+        """Return True when the log size differs from the indexed end."""
+        if not self._loaded:
+            return True
+        size = self.data_path.stat().st_size if self.data_path.exists() else 0
+        return size != self.end
+
+    def append_written(
+        self, entries: List[Tuple[int, Dict[str, Any]]], end: int
+    ) -> List[int]:
+        """Index (offset, record) lines this process just wrote; return rows."""
+        if not entries:
+            return []
+        if entries[0][0] != self.end:
+            self.refresh()  # an unlocked writer appended first
+            offsets = self._columns["offsets"]
+            rows = np.searchsorted(offsets, [o for o, _ in entries])
+            return [int(row) for row in rows]
+        self._append(entries, end)
+        return list(range(self.rows - len(entries), self.rows))
+
+    # -- reads -----------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def span(self, row: int) -> Tuple[int, int]:
+        """Return the byte range from ``row`` up to the next row.
+
+        The range also covers any skipped (corrupt or blank) lines after the
+        record; readers stop at the first newline.
+        """
+        offsets = self._columns["offsets"]
+        start = int(offsets[row])
+        stop = int(offsets[row + 1]) if row + 1 < self.rows else self.end
+        return start, stop
+
+    def select(
+        self,
+        service: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        min_total: Optional[float] = None,
+        max_total: Optional[float] = None,
+    ) -> np.ndarray:
+        """Return row numbers matching every given condition, in order."""
+        mask = np.ones(self.rows, dtype=bool)
+        if service is not None:
+            code = self._codes.get(service)
+            if code is None:
+                return np.zeros(0, dtype=np.int64)
+            mask &= self._columns["service"] == code
+        date = self._columns["date"]
+        start, stop = date_bound(since, "since"), date_bound(until, "until")
+        if start is not None:
+            mask &= date >= start
+        if stop is not None:
+            mask &= (date < stop) & (date >= 0)
+        total = self._columns["total"]
+        if min_total is not None:
+            mask &= total >= min_total
+        if max_total is not None:
+            mask &= total <= max_total
+        return np.flatnonzero(mask)
@@ -1,21 +1,370 @@
 import json
+import mmap
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-STORE_PATH = Path(__file__).parent.parent / "data" / "quotes.jsonl"
+from storage.job_index import DATE_FIELDS, JobIndex, complete_lines
+from storage.locks import file_lock
+
+ROOT = Path(__file__).parent.parent
+STORE_PATH = ROOT / "data" / "quotes.jsonl"
 STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+SQLITE_PATH = ROOT / "data" / "quotes.db"
+CONFIG_PATH = ROOT / "configs" / "job_store.json"
+
+
+def _stamp(record: Dict[str, Any]) -> Dict[str, Any]:
+    if any(field in record for field in DATE_FIELDS):
+        return record
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    return {**record, "created_at": now}
+
+
+def _project(record: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for field in fields:
+        value: Any = record
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        out[field] = value
+    return out
 
 
 class JobStore:
+    """Append-only JSONL job log with a sidecar index (see `storage.job_index`).
+
+    Records are addressed by row number (their position in the log). `get`,
+    `page` and `filter` read only the rows they return, through a memory map
+    of the log. Writers in other threads and processes are serialised with
+    an advisory lock on ``<log>.lock``.
+    """
+
     def __init__(self, path: Path = STORE_PATH):
-        self.path = path
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.index = JobIndex(self.path)
+        self._lock = threading.Lock()
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_resets = 0
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock, file_lock(self.lock_path):
+            yield
+
+    def _sync(self) -> None:
+        """Bring the index up to date; caller holds ``self._lock``."""
+        if self.index.stale():
+            with file_lock(self.lock_path):
+                self.index.refresh()
+
+    def commit(
+        self, records: Sequence[Dict[str, Any]], fsync: bool = False
+    ) -> List[int]:
+        """Append ``records`` with one write (and optional fsync); return rows.
+
+        A ``created_at`` timestamp is added to records that carry no date,
+        so they can be range-filtered later. A torn last line left by an
+        interrupted writer is closed off with a newline first, so it stays
+        a skipped corrupt line instead of swallowing the first record.
+        """
+        stamped = [_stamp(r) for r in records]
+        lines = [(json.dumps(r) + "\n").encode("utf-8") for r in stamped]
+        with self._locked():
+            self.index.refresh()
+            with self.path.open("a+b") as f:
+                offset = f.seek(0, os.SEEK_END)
+                if offset:
+                    f.seek(offset - 1)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                        offset += 1
+                f.write(b"".join(lines))
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            entries: List[Tuple[int, Dict[str, Any]]] = []
+            for record, line in zip(stamped, lines):
+                entries.append((offset, record))
+                offset += len(line)
+            return self.index.append_written(entries, offset)
 
-    def save(self, record: Dict[str, Any]) -> None:
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record) + "\n")
+    def save(self, record: Dict[str, Any]) -> int:
+        """Append ``record`` and return its row number."""
+        return self.commit([record])[0]
+
+    def iter_records(
+        self, fields: Optional[Sequence[str]] = None, start: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream records from row ``start`` without materialising the log.
+
+        ``fields`` projects each record onto the given keys; dotted paths
+        such as ``"result.total"`` reach into nested dicts (missing -> None).
+        Corrupt lines are skipped, so the stream matches the indexed rows.
+        """
+        if not self.path.exists():
+            return
+        offset = 0
+        if start:
+            with self._lock:
+                self._sync()
+                if start >= self.index.rows:
+                    return
+                offset = self.index.span(start)[0]
+        for _, line in complete_lines(self.path, offset):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # corrupt line: not a row
+            yield record if fields is None else _project(record, fields)
 
     def list_all(self) -> List[Dict[str, Any]]:
+        """Return every record; a corrupt line raises ``ValueError``."""
         if not self.path.exists():
             return []
         with self.path.open("r", encoding="utf-8") as f:
             return [json.loads(line) for line in f]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return self.index.rows
+
+    def _view(self) -> mmap.mmap:
+        stale = self._mm is None or self._mm_resets != self.index.resets
+        if stale or len(self._mm) < self.index.end:  # type: ignore[arg-type]
+            if self._mm is not None:
+                self._mm.close()
+            with self.path.open("rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mm_resets = self.index.resets
+        return self._mm  # type: ignore[return-value]
+
+    def _read(self, rows: Any) -> List[Dict[str, Any]]:
+        if not len(rows):
+            return []
+        view = self._view()
+        out = []
+        for row in rows:
+            start, stop = self.index.span(int(row))
+            newline = view.find(b"\n", start, stop)
+            out.append(json.loads(view[start : newline if newline >= 0 else stop]))
+        return out
+
+    def get(self, row: int) -> Dict[str, Any]:
+        """Return the record at ``row``; raise ``IndexError`` if absent."""
+        with self._lock:
+            self._sync()
+            if not 0 <= row < self.index.rows:
+                raise IndexError(f"No job at row {row}")
+            return self._read([row])[0]
+
+    def page(self, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` records starting at row ``offset``."""
+        with self._lock:
+            self._sync()
+            stop = min(self.index.rows, offset + limit)
+            return self._read(range(max(0, offset), stop))
+
+    def filter(
+        self,
+        service: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        min_total: Optional[float] = None,
+        max_total: Optional[float] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return records matching every given condition, oldest first.
+
+        ``since``/``until`` take ISO strings, datetimes or epoch seconds
+        (anything else raises ``ValueError``); records without a date never
+        match a date condition.
+        """
+        with self._lock:
+            self._sync()
+            rows = self.index.select(service, since, until, min_total, max_total)
+            end = None if limit is None else offset + limit
+            return self._read(rows[offset:end])
+
+    def writer(self, **kwargs: Any) -> "JobWriter":
+        """Return a `JobWriter` that group-commits into this store."""
+        return JobWriter(self, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+
+
+def _load_config() -> Dict[str, Any]:
+    if CONFIG_PATH.exists():
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            return dict(json.load(f))
+    return {}
+
+
+def open_job_store(
+    backend: Optional[str] = None, path: Optional[str | Path] = None
+) -> Any:
+    """Return the configured job store backend.
+
+    ``backend`` is ``"jsonl"`` (`JobStore`) or ``"sqlite"``
+    (`storage.sqlite_job_store.SQLiteJobStore`). Arguments win over
+    ``JOB_STORE_BACKEND``/``JOB_STORE_PATH``, which win over
+    ``configs/job_store.json``; the default is the JSONL log.
+    """
+    config = _load_config()
+    backend = backend or os.getenv("JOB_STORE_BACKEND") or config.get("backend")
+    path = path or os.getenv("JOB_STORE_PATH") or config.get("path")
+    if path is not None and not Path(path).is_absolute():
+        path = ROOT / path
+    backend = (backend or "jsonl").lower()
+    if backend == "jsonl":
+        return JobStore(Path(path) if path else STORE_PATH)
+    if backend == "sqlite":
+        from storage.sqlite_job_store import SQLiteJobStore
+
+        return SQLiteJobStore(path or SQLITE_PATH)
+    raise ValueError(f"Unknown job store backend: {backend!r}")
+
+
+class JobWriter:
+    """Buffered writer that group-commits records into a job store.
+
+    Any store with ``commit(records, fsync)`` works (`JobStore` or
+    `storage.sqlite_job_store.SQLiteJobStore`).
+
+    ``write`` only queues a record. A background thread commits the queue
+    with one write and one fsync once ``max_batch`` records are waiting or
+    ``flush_interval`` seconds (the durability window) have passed since the
+    oldest one arrived. ``flush`` blocks until everything written so far is
+    on disk. Writers block while ``max_pending`` records are queued.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        max_batch: int = 1000,
+        flush_interval: float = 0.05,
+        fsync: bool = True,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        self.store = store
+        self.max_batch = max(1, max_batch)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_pending = max_pending or 4 * self.max_batch
+        self.batches = 0
+        self.records = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._first_at = 0.0
+        self._written = 0
+        self._durable = 0
+        self._flush_wanted = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="job-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.write_many([record])
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        with self._cond:
+            for record in records:
+                while (
+                    len(self._pending) >= self.max_pending
+                    and not self._closed
+                    and self._error is None
+                ):
+                    self._cond.notify_all()  # the flusher may be idle-waiting
+                    self._cond.wait()
+                if self._error is not None:
+                    raise self._error  # the flusher stopped; nothing drains
+                if self._closed:
+                    raise ValueError("JobWriter is closed")
+                if not self._pending:
+                    self._first_at = time.monotonic()
+                self._pending.append(record)
+                self._written += 1
+                if len(self._pending) == self.max_batch:
+                    self._cond.notify_all()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Commit queued records now and wait until they are durable."""
+        with self._cond:
+            target = self._written
+            self._flush_wanted = True
+            self._cond.notify_all()
+            while self._durable < target and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+
+    def _due(self) -> bool:
+        return bool(self._pending) and (
+            self._flush_wanted
+            or self._closed
+            or len(self._pending) >= self.max_batch
+            or time.monotonic() - self._first_at >= self.flush_interval
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due():
+                    if self._closed and not self._pending:
+                        return
+                    timeout = None
+                    if self._pending:
+                        timeout = self._first_at + self.flush_interval
+                        timeout -= time.monotonic()
+                    self._cond.wait(timeout)
+                batch = self._pending[: self.max_batch]
+                del self._pending[: len(batch)]
+                if self._pending:
+                    self._first_at = time.monotonic()
+                else:
+                    self._flush_wanted = False
+                self._cond.notify_all()
+            try:
+                self.store.commit(batch, fsync=self.fsync)
+            except BaseException as exc:  # surface to flush()/close()
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._durable += len(batch)
+                self.batches += 1
+                self.records += len(batch)
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Commit everything still queued and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "JobWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,289 @@
+"""
+SQLite backend for the job log, API-compatible with `storage.job_store.JobStore`.
+
+One ``jobs`` table holds the raw record JSON plus the columns `JobIndex`
+keeps (service, total, date), with B-tree indexes for filtered queries. The
+database runs in WAL mode so readers never block the writer, and each
+thread gets its own connection. Row numbers are ``id - 1``; ids are dense
+because the table is append-only.
+
+Import an existing JSONL log. Records keep their own dates (none is made
+up for records without one), and the byte offset reached in the log is
+committed with each batch, so an import can be resumed or re-run as the log
+grows::
+
+    python -m storage.sqlite_job_store data/quotes.jsonl data/quotes.db
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from storage.job_index import complete_lines, date_bound, record_fields
+from storage.job_store import JobWriter, _project, _stamp
+
+FETCH_SIZE = 1000
+MIGRATE_BATCH = 10_000
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    " id INTEGER PRIMARY KEY,"
+    " service TEXT,"
+    " total REAL,"
+    " date INTEGER,"
+    " record TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS jobs_service_total ON jobs (service, total)",
+    "CREATE INDEX IF NOT EXISTS jobs_date ON jobs (date)",
+    "CREATE TABLE IF NOT EXISTS imports ("
+    " source TEXT PRIMARY KEY,"
+    " position INTEGER NOT NULL)",
+)
+_INSERT = "INSERT INTO jobs (id, service, total, date, record) VALUES (?, ?, ?, ?, ?)"
+_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM jobs"
+
+
+def _row_values(row_id: int, record: Dict[str, Any]) -> Tuple[Any, ...]:
+    service, total, date = record_fields(record)
+    return (
+        row_id,
+        service or None,
+        None if total != total else total,  # NaN -> NULL
+        None if date < 0 else date,
+        json.dumps(record),
+    )
+
+
+class SQLiteJobStore:
+    """Job log in a SQLite database; see the module docstring."""
+
+    def __init__(self, path: str | Path, synchronous: str = "NORMAL") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.synchronous = synchronous
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+        conn = self._conn()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=30,
+                isolation_level=None,  # transactions are explicit
+                check_same_thread=False,  # only so close() can reach it
+                cached_statements=64,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.conn = conn
+            with self._conn_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _write(self, fsync: bool) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        if fsync:
+            conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            if fsync:
+                conn.execute(f"PRAGMA synchronous={self.synchronous}")
+
+    def commit(
+        self, records: Sequence[Dict[str, Any]], fsync: bool = False
+    ) -> List[int]:
+        """Insert ``records`` in one transaction and return their rows.
+
+        ``fsync`` makes this commit durable against power loss
+        (``synchronous=FULL``); otherwise WAL commits survive process crashes.
+        """
+        if not records:
+            return []
+        with self._write(fsync) as conn:
+            first = conn.execute(_MAX_ID).fetchone()[0] + 1
+            conn.executemany(
+                _INSERT,
+                (_row_values(first + i, _stamp(r)) for i, r in enumerate(records)),
+            )
+        return list(range(first - 1, first - 1 + len(records)))
+
+    def _imported(self, source: str) -> int:
+        """Return the byte offset `migrate` reached in ``source``."""
+        row = (
+            self._conn()
+            .execute("SELECT position FROM imports WHERE source = ?", (source,))
+            .fetchone()
+        )
+        return int(row[0]) if row else 0
+
+    def _import(
+        self,
+        records: Sequence[Dict[str, Any]],
+        source: str,
+        position: int,
+        fsync: bool = False,
+    ) -> int:
+        """Insert ``records`` as they are and record ``position`` atomically."""
+        with self._write(fsync) as conn:
+            first = conn.execute(_MAX_ID).fetchone()[0] + 1
+            conn.executemany(
+                _INSERT, (_row_values(first + i, r) for i, r in enumerate(records))
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO imports (source, position) VALUES (?, ?)",
+                (source, position),
+            )
+        return len(records)
+
+    def save(self, record: Dict[str, Any]) -> int:
+        """Append ``record`` and return its row number."""
+        return self.commit([record])[0]
+
+    def iter_records(
+        self, fields: Optional[Sequence[str]] = None, start: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream records from row ``start``; ``fields`` as in `JobStore`."""
+        cursor = self._conn().execute(
+            "SELECT record FROM jobs WHERE id > ? ORDER BY id", (start,)
+        )
+        try:
+            while True:
+                batch = cursor.fetchmany(FETCH_SIZE)
+                if not batch:
+                    return
+                for (raw,) in batch:
+                    record = json.loads(raw)
+                    yield record if fields is None else _project(record, fields)
+        finally:
+            cursor.close()
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        return list(self.iter_records())
+
+    def __len__(self) -> int:
+        return int(self._conn().execute(_MAX_ID).fetchone()[0])
+
+    def _records(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(sql, params).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def get(self, row: int) -> Dict[str, Any]:
+        """Return the record at ``row``; raise ``IndexError`` if absent."""
+        found = self._records("SELECT record FROM jobs WHERE id = ?", (row + 1,))
+        if row < 0 or not found:
+            raise IndexError(f"No job at row {row}")
+        return found[0]
+
+    def page(self, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` records starting at row ``offset``."""
+        offset = max(0, offset)
+        return self._records(
+            "SELECT record FROM jobs WHERE id > ? AND id <= ? ORDER BY id",
+            (offset, offset + limit),
+        )
+
+    def filter(
+        self,
+        service: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        min_total: Optional[float] = None,
+        max_total: Optional[float] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return records matching every given condition, oldest first."""
+        where: List[str] = []
+        params: List[Any] = []
+        for clause, value in (
+            ("service = ?", service),
+            ("date >= ?", date_bound(since, "since")),
+            ("date < ?", date_bound(until, "until")),
+            ("total >= ?", min_total),
+            ("total <= ?", max_total),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = "SELECT record FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        return self._records(sql, params)
+
+    def writer(self, **kwargs: Any) -> JobWriter:
+        """Return a `JobWriter` that group-commits into this store."""
+        return JobWriter(self, **kwargs)
+
+    def close(self) -> None:
+        """Close every thread's connection; later calls reopen lazily."""
+        with self._conn_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def migrate(
+    source: str | Path, dest: str | Path, batch: int = MIGRATE_BATCH
+) -> Tuple[int, int]:
+    """Copy a JSONL job log into a SQLite store; return (imported, total).
+
+    Lines are read as `JobStore` reads them (corrupt lines are skipped) and
+    records are stored unchanged. Each batch commits together with the byte
+    offset it reached in ``source``, so an interrupted migration resumes
+    where it stopped, and a re-run imports only lines appended since. Rows
+    the application already wrote to ``dest`` do not affect this.
+    """
+    path = Path(source)
+    key = str(path.resolve())
+    target = SQLiteJobStore(dest)
+    imported = 0
+    chunk: List[Dict[str, Any]] = []
+    try:
+        position = target._imported(key)
+        size = path.stat().st_size
+        if position > size:
+            raise ValueError(f"{source} is shorter than the imported part")
+        for start, raw in complete_lines(path, position):
+            position = start + len(raw)
+            if raw.strip():
+                try:
+                    chunk.append(json.loads(raw))
+                except ValueError:
+                    pass  # corrupt line: not a row
+            if len(chunk) >= batch:
+                imported += target._import(chunk, key, position)
+                chunk = []
+        imported += target._import(chunk, key, position, fsync=True)
+        return imported, len(target)
+    finally:
+        target.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python -m storage.sqlite_job_store <quotes.jsonl> <jobs.db>")
+    done, rows = migrate(sys.argv[1], sys.argv[2])
+    print(f"Imported {done} records into {sys.argv[2]} ({rows} total)")
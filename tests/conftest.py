@@ -0,0 +1,12 @@
+from typing import Iterator
+
+import pytest
+
+from logic.pricing_rules import clear_quote_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_quote_cache() -> Iterator[None]:
+    # Tests patch memory_search and pricing configs; never serve stale quotes.
+    clear_quote_cache()
+    yield
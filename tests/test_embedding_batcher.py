@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from modular_ai_agent.memory.embedding_batcher import (
+    MicroBatchEmbedder,
+    batcher_of,
+    micro_batch,
+)
+from modular_ai_agent.memory.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class SlowEmbeddings(Embeddings):
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.batches: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if "boom" in texts:
+            raise RuntimeError("model failed")
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_concurrent_queries_are_batched() -> None:
+    inner = SlowEmbeddings()
+    batcher = MicroBatchEmbedder(inner, max_batch=8, max_wait=0.05)
+    texts = [f"job {'x' * i}" for i in range(16)]
+    barrier = threading.Barrier(16)
+
+    def one(text: str) -> List[float]:
+        barrier.wait()
+        return batcher.embed_query(text)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(one, texts))
+    batcher.close()
+
+    assert results == [[float(len(t)), 1.0] for t in texts]
+    assert sorted(t for b in inner.batches for t in b) == sorted(texts)
+    assert len(inner.batches) < len(texts)
+    assert all(len(b) <= 8 for b in inner.batches)
+    stats = batcher.stats()
+    assert stats["texts"] == 16
+    assert stats["batches"] == len(inner.batches)
+    assert sum(stats["batch_size_histogram"].values()) == stats["batches"]
+    assert stats["max_queue_depth"] >= 2
+    assert stats["queue_depth"] == 0
+
+
+def test_errors_reach_every_caller_and_close_falls_back() -> None:
+    inner = SlowEmbeddings(delay=0.0)
+    batcher = MicroBatchEmbedder(inner, max_batch=4, max_wait=0.0)
+    with pytest.raises(RuntimeError, match="model failed"):
+        batcher.embed_query("boom")
+    batcher.close()
+    assert batcher.embed_query("gutter") == [6.0, 1.0]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_micro_batch_sits_under_the_cache() -> None:
+    inner = SlowEmbeddings(delay=0.0)
+    cached = CachedEmbeddings(inner, "slow", cache=EmbeddingCache())
+    wrapped = micro_batch(cached)
+    batcher = batcher_of(wrapped)
+    assert isinstance(wrapped, CachedEmbeddings) and batcher is not None
+    assert micro_batch(wrapped) is wrapped
+
+    wrapped.embed_query("roof")
+    wrapped.embed_query("roof")
+    batcher.close()
+    assert inner.batches == [["roof"]]
+    assert batcher.stats()["texts"] == 1
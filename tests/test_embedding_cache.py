@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from modular_ai_agent.memory.embedding_cache import CachedEmbeddings, EmbeddingCache
+from modular_ai_agent.memory.memory_setup import _get_embeddings
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_repeated_text_is_embedded_once() -> None:
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(inner, "counting", cache=EmbeddingCache())
+
+    first = cached.embed_query("ten windows")
+    assert cached.embed_query("ten windows") == first
+    assert cached.embed_documents(["ten windows", "gutters", "gutters"]) == [
+        first,
+        [7.0, 1.0],
+        [7.0, 1.0],
+    ]
+    assert inner.calls == ["ten windows", "gutters"]
+    stats = cached.cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 3
+
+
+def test_models_do_not_share_entries() -> None:
+    cache = EmbeddingCache()
+    inner = CountingEmbeddings()
+    CachedEmbeddings(inner, "a", cache=cache).embed_query("x")
+    CachedEmbeddings(inner, "b", cache=cache).embed_query("x")
+    assert inner.calls == ["x", "x"]
+
+
+def test_lru_eviction_and_disk_tier(tmp_path: Path) -> None:
+    db = tmp_path / "emb.sqlite"
+    cache = EmbeddingCache(max_entries=1, sqlite_path=db)
+    inner = CountingEmbeddings()
+    cached = CachedEmbeddings(inner, "m", cache=cache)
+    cached.embed_query("one")
+    cached.embed_query("two")  # evicts "one" from memory
+    assert cached.embed_query("one") == [3.0, 1.0]
+    assert cache.disk_hits == 1
+
+    fresh = CachedEmbeddings(inner, "m", cache=EmbeddingCache(sqlite_path=db))
+    assert fresh.embed_query("two") == [3.0, 1.0]
+    assert inner.calls == ["one", "two"]
+
+
+def test_default_embeddings_are_cached() -> None:
+    emb = _get_embeddings()
+    assert isinstance(emb, CachedEmbeddings)
+    assert emb.embed_query("same prompt") == emb.embed_query("same prompt")
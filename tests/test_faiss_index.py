@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pytest
+
+from modular_ai_agent.memory.faiss_index import (
+    build_index,
+    index_vectors,
+    rebuild_vectorstore,
+)
+from modular_ai_agent.memory.memory_setup import (
+    add_documents,
+    get_vectorstore,
+    placeholder_id,
+)
+
+
+def test_build_index_trains_on_a_sample() -> None:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2000, 16)).astype(np.float32)
+    index = build_index(vectors, "IVF8,Flat", train_size=500, params={"nprobe": 8})
+    assert index.ntotal == 2000 and index.is_trained
+    assert faiss.extract_index_ivf(index).nprobe == 8
+    # Probing every list is exact, and row order is preserved.
+    _, found = index.search(vectors[:20], 1)
+    assert found[:, 0].tolist() == list(range(20))
+    assert np.allclose(index_vectors(index)[:5], vectors[:5])
+
+
+def test_rebuild_vectorstore_in_place(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    path = tmp_path / "vs"
+    store = get_vectorstore(path)
+    add_documents(store, [f"doc {i}" for i in range(300)], path)
+    ids = dict(store.index_to_docstore_id)
+
+    rebuilt = rebuild_vectorstore(path, "IVF4,Flat", params={"nprobe": 4})
+    assert rebuilt.index_to_docstore_id == ids
+
+    reloaded = get_vectorstore(path)
+    ivf = faiss.extract_index_ivf(reloaded.index)
+    assert (reloaded.index.ntotal, ivf.nlist, ivf.nprobe) == (300, 4, 4)
+    assert placeholder_id(reloaded) is None
+    vector = index_vectors(reloaded.index)[42]
+    hit = reloaded.similarity_search_by_vector(vector.tolist(), k=1)[0]
+    assert hit.page_content == "doc 42"
+
+    add_documents(reloaded, ["one more"], path)
+    assert get_vectorstore(path).index.ntotal == 301
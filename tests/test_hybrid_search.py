@@ -0,0 +1,141 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from modular_ai_agent.memory.hybrid_search import (
+    BM25Index,
+    HybridSearcher,
+    MetadataIndex,
+    rrf,
+)
+from modular_ai_agent.memory.memory_setup import add_documents, get_vectorstore
+from modular_ai_agent.tools import memory_tool
+
+MATERIALS = ["slate", "epoxy", "granite", "cedar"]
+
+
+def _store() -> FAISS:
+    docs = [
+        (
+            Document(
+                page_content=f"{MATERIALS[i % 4]} price per m2 is {i}",
+                metadata={"doc_type": "pricing", "material": MATERIALS[i % 4]},
+            )
+            if i % 5 == 0
+            else Document(page_content=f"general note {i}", metadata={"doc_type": "kb"})
+        )
+        for i in range(200)
+    ]
+    return FAISS.from_documents(docs, DeterministicFakeEmbedding(size=32))
+
+
+def test_metadata_index_intersects_fields_and_unions_values() -> None:
+    index = MetadataIndex(
+        [
+            {"doc_type": "pricing", "material": "slate"},
+            {"doc_type": "kb"},
+            {"doc_type": "pricing", "material": "epoxy", "tags": ["x"]},
+        ]
+    )
+    assert index.rows({"doc_type": "pricing"}).tolist() == [0, 2]
+    assert index.rows({"doc_type": "pricing", "material": "epoxy"}).tolist() == [2]
+    assert index.rows({"material": ["slate", "epoxy"]}).tolist() == [0, 2]
+    assert index.rows({"doc_type": "kb", "material": "slate"}).tolist() == []
+    assert index.rows({"tags": "x"}).tolist() == []  # non-scalar values skipped
+
+
+def test_filtered_vector_search_matches_brute_force() -> None:
+    store = _store()
+    exact = HybridSearcher(store)
+    selector = HybridSearcher(store, exact_max=0)
+    embedding = DeterministicFakeEmbedding(size=32)
+    filters = {"doc_type": "pricing", "material": ["slate", "epoxy"]}
+    for query in ("slate price", "general", "epoxy roof"):
+        vector = np.asarray(embedding.embed_query(query), dtype=np.float32)
+        rows = [r for r in range(200) if r % 5 == 0 and r % 20 in (0, 5)]
+        stored = store.index.reconstruct_batch(np.asarray(rows))
+        order = np.argsort(((stored - vector) ** 2).sum(axis=1), kind="stable")
+        expected = [rows[i] for i in order[:4]]
+        assert [r for r, _ in exact.vector_search(query, 4, np.asarray(rows))] == (
+            expected
+        )
+        docs = selector.search(query, k=4, filters=filters)
+        assert [d.page_content for d in docs] == [
+            exact.document(r).page_content for r in expected
+        ]
+
+
+def test_bm25_and_hybrid_rank_keyword_matches() -> None:
+    bm25 = BM25Index(["slate roof", "slate slate tiles", "cedar deck", ""])
+    assert [r for r, _ in bm25.search("slate", 5)] == [1, 0]
+    assert [r for r, _ in bm25.search("slate", 5, np.asarray([0, 2]))] == [0]
+    assert rrf([[1, 2, 3], [3, 1]]) == [1, 3, 2]
+
+    searcher = HybridSearcher(_store())
+    docs = searcher.search("granite", k=4, mode="hybrid")
+    assert "granite" in [d.metadata.get("material") for d in docs[:2]]
+    docs = searcher.search("granite", k=4, filters={"doc_type": "pricing"}, mode="bm25")
+    assert {d.metadata["material"] for d in docs} == {"granite"}
+    assert searcher.search("granite", filters={"doc_type": "missing"}) == []
+    with pytest.raises(ValueError):
+        searcher.search("granite", mode="fuzzy")
+
+
+def test_indexes_follow_store_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    store = get_vectorstore(tmp_path)
+    add_documents(store, [Document(page_content="kb chunk")], tmp_path)
+    searcher = HybridSearcher(store)
+    pricing = {"doc_type": "pricing"}
+    assert searcher.search("slate", filters=pricing) == []
+    assert searcher.search("slate", mode="bm25") == []
+
+    store.add_documents([Document(page_content="slate 55 per m2", metadata=pricing)])
+    assert [d.page_content for d in searcher.search("slate", filters=pricing)] == [
+        "slate 55 per m2"
+    ]
+    assert searcher.search("slate", mode="bm25")[0].page_content == ("slate 55 per m2")
+    # Deleting shifts rows; cached row numbers must not point at other docs.
+    store.delete([store.index_to_docstore_id[0]])
+    found = searcher.search("slate", filters=pricing, mode="bm25")
+    assert [d.page_content for d in found] == ["slate 55 per m2"]
+
+
+def test_memory_search_parses_inline_filters(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("VECTOR_STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(memory_tool, "_retrievers", {})
+    monkeypatch.setattr(memory_tool, "_searchers", {})
+    assert memory_tool.parse_query("doc_type:pricing material:a material:b m2") == (
+        "m2",
+        {"doc_type": "pricing", "material": ["a", "b"]},
+    )
+    assert memory_tool.parse_query("see https://x.io") == ("see https://x.io", {})
+
+    store = get_vectorstore(tmp_path)
+    docs = [Document(page_content=f"kb chunk {i}") for i in range(10)]
+    docs.append(
+        Document(page_content="slate 55 per m2", metadata={"doc_type": "pricing"})
+    )
+    add_documents(store, docs, tmp_path)
+    result = memory_tool.memory_search.invoke("doc_type:pricing price per m2 slate")
+    assert result == "slate 55 per m2"
+    assert memory_tool.memory_search.invoke("doc_type:none slate") == (
+        "No documents found."
+    )
+    # Unknown fields are free text, not a filter that matches nothing.
+    assert memory_tool.memory_search.invoke("note:slate roof") != (
+        "No documents found."
+    )
+    assert memory_tool.parse_query("note:slate roof", {"doc_type"}) == (
+        "note:slate roof",
+        {},
+    )
@@ -1,4 +1,18 @@
-from logic.job_parser import parse_prompt
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from logic.job_parser import (
+    ChunkStats,
+    parse_followup,
+    parse_jsonl,
+    parse_prompt,
+    parse_prompts_stream,
+)
 
 
 def test_window_qty_storey():
@@ -24,3 +38,150 @@ def test_default_values():
     assert job["service"] == "window"
     assert job["qty"] == 1
     assert job["storey"] == 1
+
+
+def _legacy_parse_prompt(prompt: str) -> Dict[str, Any]:
+    """Reference implementation the single-pass extractor must match."""
+    prompt = prompt.lower()
+    result: Dict[str, Any] = {}
+    if "window" in prompt:
+        result["service"] = "window"
+    elif "pressure" in prompt or "power wash" in prompt:
+        result["service"] = "pressure"
+    else:
+        result["service"] = ""
+    qty_match = re.search(r"(\d+)\s*(windows?|jobs?|areas?)", prompt)
+    if not qty_match:
+        qty_match = re.search(r"(\d+)\b", prompt)
+    result["qty"] = int(qty_match.group(1)) if qty_match else 1
+    result["size"] = "large" if "large" in prompt else ""
+    storey_match = re.search(r"(\d+)\s*(storey|story|floor)s?", prompt)
+    if storey_match:
+        result["storey"] = int(storey_match.group(1))
+    elif "two storey" in prompt or "2-storey" in prompt or "second floor" in prompt:
+        result["storey"] = 2
+    else:
+        result["storey"] = 1
+    if "rush" in prompt or "urgent" in prompt or "asap" in prompt:
+        result.setdefault("surcharges", {})["urgent"] = True
+    return result
+
+
+def _legacy_parse_followup(prompt: str, last_scope: Dict[str, Any]) -> Dict[str, Any]:
+    updates = _legacy_parse_prompt(prompt)
+    merged = dict(last_scope)
+    if updates.get("service"):
+        merged["service"] = updates["service"]
+    if re.search(r"\d", prompt):
+        merged["qty"] = updates.get("qty", merged.get("qty", 1))
+    if "large" in prompt:
+        merged["size"] = updates.get("size", merged.get("size", ""))
+    if re.search(r"(storey|story|floor)", prompt):
+        merged["storey"] = updates.get("storey", merged.get("storey", 1))
+    if updates.get("surcharges"):
+        sur = merged.get("surcharges", {}).copy()
+        sur.update(updates["surcharges"])
+        merged["surcharges"] = sur
+    return merged
+
+
+_TOKENS = [
+    "clean",
+    "10",
+    "12windows",
+    "windows",
+    "window",
+    "Windows",
+    "pressure",
+    "power wash",
+    "Power Wash",
+    "large",
+    "LARGE",
+    "2",
+    "storey",
+    "story",
+    "floors",
+    "Storey",
+    "two storey",
+    "2-storey",
+    "second floor",
+    "rush",
+    "brush",
+    "urgent",
+    "ASAP",
+    "jobs",
+    "areas",
+    "2nd",
+    "3 floor",
+    "x",
+    "-",
+    "abc7",
+    "5areas",
+    "house",
+    ",",
+    "  ",
+]
+
+
+def _fuzz_prompts(n: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(_TOKENS) for _ in range(rng.randint(0, 9)))
+        for _ in range(n)
+    ]
+
+
+def test_single_pass_matches_legacy_parser() -> None:
+    for prompt in _fuzz_prompts(5000):
+        assert parse_prompt(prompt) == _legacy_parse_prompt(prompt), prompt
+
+
+def test_followup_matches_legacy_parser() -> None:
+    last = {"service": "window", "qty": 20, "size": "", "storey": 1}
+    for prompt in _fuzz_prompts(2000, seed=2):
+        expected = _legacy_parse_followup(prompt, last)
+        assert parse_followup(prompt, last) == expected, prompt
+
+
+def test_memoized_result_is_not_shared() -> None:
+    first = parse_prompt("urgent 3 windows")
+    first["surcharges"]["extra"] = True
+    assert parse_prompt("urgent 3 windows")["surcharges"] == {"urgent": True}
+
+
+def test_parse_prompts_stream_is_lazy() -> None:
+    stream = parse_prompts_stream(iter(["10 windows", "pressure wash"]))
+    assert next(stream)["qty"] == 10
+    assert next(stream)["service"] == "pressure"
+
+
+def _write_backlog(path: Path, count: int) -> None:
+    lines: List[str] = []
+    for i in range(count):
+        if i % 7 == 3:
+            lines.append("{not json")
+        elif i % 11 == 5:
+            lines.append(json.dumps({"prompt": 42}))
+        else:
+            lines.append(json.dumps({"prompt": f"clean {i + 1} windows"}))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_jsonl_ordered_with_inline_errors(tmp_path: Path, workers: int) -> None:
+    path = tmp_path / "backlog.jsonl"
+    _write_backlog(path, 50)
+    chunks: List[ChunkStats] = []
+    records = list(
+        parse_jsonl(path, workers=workers, chunk_size=4, on_chunk=chunks.append)
+    )
+
+    assert [r["line"] for r in records] == list(range(1, 51))
+    for r in records:
+        i = r["line"] - 1
+        if i % 7 == 3 or i % 11 == 5:
+            assert "error" in r
+        else:
+            assert r["job"]["qty"] == i + 1
+    assert [c.index for c in chunks] == list(range(13))
+    assert sum(c.errors for c in chunks) == sum("error" in r for r in records)
@@ -0,0 +1,205 @@
+import json
+import multiprocessing
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from storage.job_store import JobStore, JobWriter
+
+
+def _quote(service: str, total: float, day: int) -> Dict[str, Any]:
+    return {
+        "prompt": f"{service} job",
+        "result": {"items": [{"service": service, "qty": 1}], "total": total},
+        "created_at": f"2024-01-{day:02d}T09:00:00+00:00",
+    }
+
+
+def test_save_get_page_filter(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "quotes.jsonl")
+    rows = [
+        store.save(_quote("window", 40.0, 1)),
+        store.save(_quote("pressure", 120.0, 2)),
+        store.save(_quote("window", 75.5, 3)),
+    ]
+    assert rows == [0, 1, 2]
+    assert len(store) == 3
+    assert store.get(1)["result"]["total"] == 120.0
+    with pytest.raises(IndexError):
+        store.get(3)
+    assert [r["prompt"] for r in store.page(1, 5)] == ["pressure job", "window job"]
+
+    windows = store.filter(service="window")
+    assert [r["result"]["total"] for r in windows] == [40.0, 75.5]
+    assert store.filter(service="gutter") == []
+    assert len(store.filter(min_total=50, max_total=100)) == 1
+    assert len(store.filter(since="2024-01-02", until="2024-01-03")) == 1
+    assert len(store.filter(service="window", limit=1, offset=1)) == 1
+    with pytest.raises(ValueError):
+        store.filter(since="bad")
+
+    # list_all stays compatible and the index survives a reopen.
+    assert len(store.list_all()) == 3
+    reopened = JobStore(tmp_path / "quotes.jsonl")
+    assert reopened.get(2)["result"]["total"] == 75.5
+
+
+def test_external_appends_and_rewrites_are_indexed(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.jsonl"
+    store = JobStore(path)
+    row = store.save({"prompt": "first", "result": {"items": [], "total": 0.0}})
+    assert "created_at" in store.get(row)
+
+    # Another process (e.g. the GUI) appends straight to the log.
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(_quote("window", 10.0, 5)) + "\n")
+        f.write('{"prompt": "half')
+    assert len(store) == 2
+    assert store.filter(service="window")[0]["result"]["total"] == 10.0
+
+    path.write_text(json.dumps(_quote("pressure", 9.0, 6)) + "\n", encoding="utf-8")
+    assert len(store) == 1
+    assert store.get(0)["result"]["total"] == 9.0
+    assert store.filter(service="window") == []
+
+
+def test_corrupt_lines_do_not_leak_into_rows(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.jsonl"
+    path.write_text('{"a": 1}\n{broken\n{"a": 2}\n{"a": 3}\nnot json\n')
+    store = JobStore(path)
+    assert len(store) == 3
+    assert store.get(0) == {"a": 1}
+    assert store.get(2) == {"a": 3}
+    assert store.page(0, 10) == [{"a": 1}, {"a": 2}, {"a": 3}]
+    assert len(store.filter()) == 3
+
+
+def test_save_after_torn_tail_keeps_the_record(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.jsonl"
+    store = JobStore(path)
+    store.save({"prompt": "a"})
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"prompt": "torn')  # a writer died mid-append
+
+    row = store.save({"prompt": "b"})
+    assert row == 1
+    assert len(store) == 2
+    assert store.get(1)["prompt"] == "b"
+    assert JobStore(path).get(1)["prompt"] == "b"
+
+
+def test_iter_records_streams_and_projects(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.jsonl"
+    store = JobStore(path)
+    for day, service in enumerate(["window", "pressure", "gutter"], start=1):
+        store.save(_quote(service, float(day), day))
+    with path.open("a", encoding="utf-8") as f:
+        f.write("{corrupt\n\n")
+
+    records = store.iter_records(fields=["prompt", "result.total", "missing.key"])
+    assert next(records) == {
+        "prompt": "window job",
+        "result.total": 1.0,
+        "missing.key": None,
+    }
+    assert [r["prompt"] for r in store.iter_records(start=1)] == [
+        "pressure job",
+        "gutter job",
+    ]
+    assert list(store.iter_records(start=3)) == []
+    with pytest.raises(ValueError):
+        store.list_all()  # as before the index: a corrupt line raises
+
+
+def test_final_record_without_newline_is_read(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.jsonl"
+    path.write_text('{"prompt": "a"}\n{"prompt": "b"}', encoding="utf-8")
+    store = JobStore(path)
+    assert store.list_all() == [{"prompt": "a"}, {"prompt": "b"}]
+    assert [r["prompt"] for r in store.iter_records()] == ["a", "b"]
+    assert len(store) == 2
+    assert store.get(1) == {"prompt": "b"}
+
+    store.save({"prompt": "c"})
+    assert [r["prompt"] for r in store.list_all()] == ["a", "b", "c"]
+    assert store.get(2)["prompt"] == "c"
+
+
+def test_writer_group_commits_concurrent_threads(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "quotes.jsonl")
+    with store.writer(max_batch=50, flush_interval=0.01) as writer:
+        threads = [
+            threading.Thread(
+                target=lambda t=t: writer.write_many(
+                    _quote("window", float(t * 1000 + i), 1) for i in range(200)
+                )
+            )
+            for t in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.flush()
+        assert len(store) == 800
+    assert writer.records == 800
+    assert writer.batches < 800
+    totals = sorted(r["result"]["total"] for r in store.iter_records())
+    assert totals == sorted(float(t * 1000 + i) for t in range(4) for i in range(200))
+    with pytest.raises(ValueError):
+        writer.write(_quote("window", 1.0, 1))
+
+
+def _write_from_process(path: str, worker: int) -> None:
+    with JobStore(Path(path)).writer(max_batch=25, flush_interval=0.01) as writer:
+        for i in range(100):
+            writer.write(_quote("pressure", float(worker * 1000 + i), 2))
+
+
+def test_writers_in_separate_processes_do_not_interleave(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.jsonl"
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_write_from_process, args=(str(path), w)) for w in range(3)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(60)
+        assert proc.exitcode == 0
+
+    store = JobStore(path)
+    assert len(store) == 300
+    assert len(list(store.iter_records())) == 300
+    assert len(store.filter(service="pressure")) == 300
+
+
+def test_writer_backpressure_does_not_stall(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "quotes.jsonl")
+    with store.writer(max_batch=10, flush_interval=60, max_pending=20) as writer:
+        writer.write_many(_quote("roof", float(i), 1) for i in range(100))
+    assert len(store) == 100
+
+
+def test_writer_raises_commit_error_instead_of_blocking(tmp_path: Path) -> None:
+    class FailingStore:
+        def commit(
+            self, records: List[Dict[str, Any]], fsync: bool = False
+        ) -> List[int]:
+            raise OSError("disk full")
+
+    writer = JobWriter(FailingStore(), max_batch=2, max_pending=4)
+    done = threading.Event()
+
+    def fill() -> None:
+        with pytest.raises(OSError):
+            writer.write_many({"n": i} for i in range(100))
+        done.set()
+
+    thread = threading.Thread(target=fill, daemon=True)
+    thread.start()
+    assert done.wait(10)
+    with pytest.raises(OSError):
+        writer.close()
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from logic import kb_ingestor
+from modular_ai_agent.memory.memory_setup import get_vectorstore
+
+
+def _contents(store: Path) -> List[str]:
+    docs = get_vectorstore(store).docstore._dict  # type: ignore[attr-defined]
+    return sorted(d.page_content for d in docs.values())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reingest_only_pays_for_the_delta(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "a.txt").write_text("alpha gutters", encoding="utf-8")
+    (docs / "b.txt").write_text("beta windows", encoding="utf-8")
+    (docs / "sub" / "c.txt").write_text("gamma roofs", encoding="utf-8")
+    store = tmp_path / "store"
+
+    first = kb_ingestor.ingest_incremental(docs, str(store), workers=workers)
+    assert (first.files, first.skipped, first.chunks) == (3, 0, 3)
+    assert first.stages["embed"].items == 3
+
+    again = kb_ingestor.ingest_incremental(docs, str(store), workers=workers)
+    assert (again.skipped, again.chunks) == (3, 0)
+    assert again.stages["load"].items == 0
+
+    (docs / "a.txt").write_text("alpha gutters, revised", encoding="utf-8")
+    (docs / "b.txt").unlink()
+    delta = kb_ingestor.ingest_incremental(docs, str(store), workers=workers)
+    assert (delta.skipped, delta.removed, delta.chunks) == (1, 1, 1)
+    assert _contents(store) == ["alpha gutters, revised", "dummy", "gamma roofs"]
+
+    assert kb_ingestor.ingest_incremental(docs, str(store), full=True).chunks == 2
+    assert _contents(store) == ["alpha gutters, revised", "dummy", "gamma roofs"]
+
+
+def test_large_files_are_chunked_and_embedded_in_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    text = "\n\n".join(f"paragraph {i} " + "x" * 80 for i in range(20))
+    (tmp_path / "big.txt").write_text(text, encoding="utf-8")
+    calls: List[int] = []
+
+    def spy(path: Path) -> FAISS:
+        vs = get_vectorstore(path)
+        add = vs.add_documents
+
+        def counted(docs: List[Document], **kw: Any) -> List[str]:
+            calls.append(len(docs))
+            return add(docs, **kw)
+
+        monkeypatch.setattr(vs, "add_documents", counted)
+        return vs
+
+    monkeypatch.setattr(kb_ingestor, "get_vectorstore", spy)
+    stats = kb_ingestor.ingest_incremental(
+        tmp_path / "big.txt",
+        str(tmp_path / "store"),
+        workers=1,
+        embed_batch=4,
+        chunk_size=200,
+        chunk_overlap=0,
+    )
+    assert stats.chunks == sum(calls) > 4
+    assert max(calls) <= 4
+    assert "embed" in stats.report()
@@ -1,9 +1,26 @@
+import os
 from pathlib import Path
+from typing import Dict, List
 
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 
-from modular_ai_agent.memory.memory_setup import (add_documents, as_retriever,
-                                                  get_vectorstore)
+from modular_ai_agent.memory import memory_setup
+from modular_ai_agent.memory.faiss_delta import DeltaLog
+from modular_ai_agent.memory.memory_setup import (
+    PLACEHOLDER_ID,
+    add_documents,
+    as_retriever,
+    get_vectorstore,
+    placeholder_id,
+)
+
+
+def _docs(store: FAISS) -> Dict[str, Document]:
+    docs: Dict[str, Document] = store.docstore._dict  # type: ignore[attr-defined]
+    return docs
 
 
 def test_memory_roundtrip(tmp_path: Path) -> None:
@@ -15,3 +32,100 @@ def test_memory_roundtrip(tmp_path: Path) -> None:
     retriever = as_retriever(vs_reloaded, k=1)
     docs = retriever.invoke("tiny")
     assert any("tiny doc" in d.page_content for d in docs)
+
+
+def test_placeholder_is_dropped_by_known_id(tmp_path: Path) -> None:
+    store_path = tmp_path / "vs"
+    vs = get_vectorstore(store_path)
+    assert placeholder_id(vs) == PLACEHOLDER_ID
+    add_documents(vs, ["first", "second"], store_path)
+    assert placeholder_id(vs) is None
+    assert sorted(d.page_content for d in _docs(vs).values()) == [
+        "first",
+        "second",
+    ]
+
+    # Stores seeded before PLACEHOLDER_ID existed hold it at position 0.
+    legacy = FAISS.from_documents(
+        [Document(page_content="dummy")], FakeEmbeddings(size=8)
+    )
+    assert placeholder_id(legacy) == legacy.index_to_docstore_id[0]
+
+
+def test_delta_persist_appends_without_rewriting_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(memory_setup, "DELTA_COMPACT_RATIO", 0.5)
+    store_path = tmp_path / "vs"
+    vs = get_vectorstore(store_path)
+    add_documents(vs, [f"base {i}" for i in range(10)], store_path, persist="delta")
+    index_file = store_path / "index.faiss"
+    before = index_file.stat().st_size
+
+    add_documents(vs, ["delta one", "delta two"], store_path, persist="delta")
+    add_documents(
+        vs,
+        [Document(page_content="delta three", metadata={"doc_type": "note"})],
+        store_path,
+        persist="delta",
+    )
+    assert index_file.stat().st_size == before
+    assert DeltaLog(store_path).rows(vs.index.d) == 3
+
+    reloaded = get_vectorstore(store_path)
+    texts = sorted(d.page_content for d in _docs(reloaded).values())
+    assert texts == sorted(
+        [f"base {i}" for i in range(10)] + ["delta one", "delta two", "delta three"]
+    )
+    assert reloaded.index.ntotal == 13
+    found = reloaded.similarity_search("x", k=13, filter={"doc_type": "note"})
+    assert [d.page_content for d in found] == ["delta three"]
+    assert DeltaLog(store_path).replay(reloaded) == 0  # idempotent
+
+    # Once the delta outgrows the ratio, the index is rewritten and the log dropped.
+    add_documents(vs, [f"more {i}" for i in range(10)], store_path, persist="delta")
+    assert index_file.stat().st_size != before
+    assert not DeltaLog(store_path).exists()
+    assert get_vectorstore(store_path).index.ntotal == 23
+
+
+def test_delta_append_truncates_partial_row(tmp_path: Path) -> None:
+    log = DeltaLog(tmp_path)
+    log.append(["a"], ["first"], [{}], [[1.0, 1.0]])
+    with open(log.vectors_path, "ab") as f:
+        f.write(b"\x00\x00")  # crash mid-write of the next row
+    log.append(["b"], ["second"], [{}], [[2.0, 2.0]])
+    assert log.rows(2) == 2
+
+    store = FAISS.from_texts(["seed"], FakeEmbeddings(size=2), ids=["seed"])
+    assert log.replay(store) == 2
+    vector = store.index.reconstruct(store.index.ntotal - 1)
+    assert vector.tolist() == [2.0, 2.0]
+
+
+def test_delta_append_fsyncs_vectors_before_ops(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    synced: List[int] = []
+    fsync = os.fsync
+
+    def record(fd: int) -> None:
+        synced.append(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    monkeypatch.setattr("modular_ai_agent.memory.faiss_delta.os.fsync", record)
+    log = DeltaLog(tmp_path)
+    log.append(["a"], ["first"], [{}], [[1.0, 1.0]])
+    assert synced == [log.vectors_path.stat().st_ino, log.ops_path.stat().st_ino]
+
+
+def test_delta_skips_torn_op_line(tmp_path: Path) -> None:
+    log = DeltaLog(tmp_path)
+    log.append(["a"], ["first"], [{}], [[1.0, 1.0]])
+    with open(log.ops_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "id": "to')  # crash mid-append
+    log.append(["b"], ["second"], [{}], [[2.0, 2.0]])
+
+    store = FAISS.from_texts(["seed"], FakeEmbeddings(size=2), ids=["seed"])
+    assert log.replay(store) == 2
+    assert sorted(_docs(store)) == ["a", "b", "seed"]
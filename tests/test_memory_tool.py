@@ -1,3 +1,11 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from modular_ai_agent.memory.memory_setup import add_documents, get_vectorstore
+from modular_ai_agent.tools import memory_tool
 from modular_ai_agent.tools.memory_tool import tool
 
 
@@ -5,3 +13,35 @@ def test_tool_returns_text() -> None:
     result = tool.invoke("hello")
     assert isinstance(result, str)
     assert bool(result)
+
+
+def test_importing_does_not_load_the_store() -> None:
+    code = (
+        "import sys, modular_ai_agent.tools.memory_tool as m; "
+        "print(bool(m._retrievers), 'langchain_community.vectorstores' in sys.modules)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_retrievers_are_cached_per_path_and_reloaded_on_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(memory_tool, "_retrievers", {})
+    first, second = tmp_path / "a", tmp_path / "b"
+    memory_tool.warm_up(first)
+    retriever = memory_tool.get_cached_retriever(first)
+    assert memory_tool.get_cached_retriever(first) is retriever
+    assert memory_tool.get_cached_retriever(second) is not retriever
+    assert memory_tool.reload(first) is False
+
+    store = get_vectorstore(first)
+    add_documents(store, ["gutter cleaning costs 40"], first)
+    assert memory_tool.reload(first) is True
+    reloaded = memory_tool.get_cached_retriever(first)
+    assert reloaded is not retriever
+    assert "gutter" in reloaded.invoke("gutter")[0].page_content
+    assert memory_tool.reload(tmp_path / "never-loaded") is False
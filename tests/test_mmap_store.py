@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+
+from modular_ai_agent.memory.memory_setup import (
+    _get_embeddings,
+    add_documents,
+    get_retriever,
+    get_vectorstore,
+)
+from modular_ai_agent.memory.mmap_store import (
+    MmapDocstore,
+    export_mmap,
+    load_mmap,
+    mmap_ready,
+)
+
+
+def test_mmap_load_matches_regular_load(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    path = tmp_path / "vs"
+    store = get_vectorstore(path)
+    docs = [
+        Document(page_content=f"doc {i}", metadata={"doc_type": "note", "n": i})
+        for i in range(50)
+    ]
+    add_documents(store, docs, path)
+    assert load_mmap(path, _get_embeddings()) is None  # not exported yet
+
+    assert export_mmap(store, path) == 50
+    mapped = load_mmap(path, _get_embeddings())
+    assert mapped is not None
+    assert isinstance(mapped.docstore, MmapDocstore)
+    for i in (0, 17, 49):
+        vector = store.index.reconstruct(i).tolist()
+        expected = store.similarity_search_by_vector(vector, k=3)
+        found = mapped.similarity_search_by_vector(vector, k=3)
+        assert [(d.id, d.page_content, d.metadata) for d in found] == [
+            (d.id, d.page_content, d.metadata) for d in expected
+        ]
+    some_id = store.index_to_docstore_id[3]
+    doc = mapped.docstore.search(some_id)
+    assert isinstance(doc, Document) and doc.page_content == "doc 3"
+    with pytest.raises(ValueError):
+        mapped.add_texts(["nope"])
+
+    retriever = get_retriever(path, k=2, mmap=True)
+    assert isinstance(retriever.vectorstore.docstore, MmapDocstore)
+
+
+def test_export_goes_stale_and_is_refreshed_on_full_save(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    path = tmp_path / "vs"
+    store = get_vectorstore(path)
+    add_documents(store, [f"doc {i}" for i in range(10)], path)
+    export_mmap(store, path)
+
+    add_documents(store, ["pending"], path, persist="delta")
+    assert not mmap_ready(path)
+    assert get_retriever(path, mmap=True).vectorstore.index.ntotal == 11
+
+    add_documents(store, ["saved"], path, persist="full")
+    assert mmap_ready(path)
+    mapped = load_mmap(path, _get_embeddings())
+    assert mapped is not None and mapped.index.ntotal == 12
@@ -0,0 +1,57 @@
+import random
+from typing import Any, Dict, List
+
+import numpy as np
+
+from logic.pricing_batch import batch_from_scopes, calculate_prices_batch
+from logic.pricing_engine import default_engine
+from logic.pricing_rules import calculate_price
+from llama3_model.utils.condition_logic import apply_conditions
+
+
+def _corpus(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    scopes = []
+    for _ in range(n):
+        scope = {
+            "service": rng.choice(["window", "pressure"]),
+            "qty": rng.randint(1, 500),
+            "size": rng.choice(["", "large", "small"]),
+            "storey": rng.randint(1, 3),
+        }
+        flags = {
+            key: True
+            for key in ("urgent", "heavy_soil", "two_storey")
+            if rng.random() < 0.3
+        }
+        if flags:
+            scope["surcharges"] = flags
+        scopes.append(scope)
+    return scopes
+
+
+def test_batch_matches_scalar_paths() -> None:
+    scopes = _corpus(2000)
+    prices = calculate_prices_batch(batch_from_scopes(scopes))
+    for i, scope in enumerate(scopes):
+        scalar = calculate_price(scope)
+        assert prices.subtotal[i] == scalar["items"][0]["subtotal"]
+        assert prices.total[i] == scalar["total"]
+        assert prices.total[i] == apply_conditions(scope)["total"]
+
+
+def test_unknown_service_is_flagged() -> None:
+    scopes = [{"service": "solar", "qty": 3}, {"service": "window", "qty": 2}]
+    prices = calculate_prices_batch(batch_from_scopes(scopes))
+    assert prices.known.tolist() == [False, True]
+    assert prices.total.tolist() == [0.0, 8.0]
+
+
+def test_integer_service_codes() -> None:
+    rules = default_engine().rules
+    names = list(rules.services)
+    scopes = _corpus(50, seed=3)
+    batch = batch_from_scopes(scopes)
+    batch.service = np.array([names.index(s) for s in batch.service])
+    expected = calculate_prices_batch(batch_from_scopes(scopes)).total
+    assert np.array_equal(calculate_prices_batch(batch).total, expected)
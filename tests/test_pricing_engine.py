@@ -0,0 +1,80 @@
+import json
+import os
+from pathlib import Path
+
+from logic.pricing_engine import PricingEngine
+
+
+def _write_config(path: Path, base_price: float) -> None:
+    config = {
+        "window": {"base_price": base_price, "large_multiplier": 1.25},
+        "surcharge": {"two_storey": 40, "urgent": 30},
+    }
+    path.write_text(json.dumps(config), encoding="utf-8")
+
+
+def test_compiled_rules_price_scope(tmp_path: Path) -> None:
+    cfg = tmp_path / "pricing.json"
+    _write_config(cfg, 4.0)
+    engine = PricingEngine(cfg)
+    result = engine.calculate(
+        {"service": "window", "qty": 20, "size": "large", "storey": 2}
+    )
+    assert result["items"][0]["subtotal"] == 100.0
+    assert result["surcharges"] == {"two_storey": True}
+    assert result["total"] == 140.0
+
+
+def test_hot_reload_on_config_change(tmp_path: Path) -> None:
+    cfg = tmp_path / "pricing.json"
+    _write_config(cfg, 4.0)
+    engine = PricingEngine(cfg, check_interval=0.0)
+    assert engine.calculate({"service": "window", "qty": 1})["total"] == 4.0
+    assert engine.calculate({"service": "window", "qty": 1})["total"] == 4.0
+
+    _write_config(cfg, 5.0)
+    st = cfg.stat()
+    os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert engine.calculate({"service": "window", "qty": 1})["total"] == 5.0
+
+    stats = engine.stats()
+    assert stats["reloads"] == 2
+    assert stats["version"] == 2
+    assert stats["cache_hits"] == 1
+
+
+def _touch(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_bad_config_keeps_last_good_rules(tmp_path: Path) -> None:
+    cfg = tmp_path / "pricing.json"
+    _write_config(cfg, 4.0)
+    engine = PricingEngine(cfg, check_interval=0.0)
+    assert engine.calculate({"service": "window", "qty": 1})["total"] == 4.0
+
+    cfg.write_text('{"window": {"base_pri', encoding="utf-8")  # half-written
+    _touch(cfg)
+    for _ in range(3):
+        assert engine.calculate({"service": "window", "qty": 1})["total"] == 4.0
+    stats = engine.stats()
+    assert stats["reload_errors"] == 1  # retried only when the file changes
+    assert stats["version"] == 1
+    assert "JSONDecodeError" in stats["last_error"]
+
+    cfg.write_text('{"window": {"base_price": "cheap"}}', encoding="utf-8")
+    _touch(cfg)
+    assert engine.calculate({"service": "window", "qty": 1})["total"] == 4.0
+    assert engine.stats()["reload_errors"] == 2
+
+    _write_config(cfg, 6.0)
+    _touch(cfg)
+    assert engine.calculate({"service": "window", "qty": 1})["total"] == 6.0
+
+
+def test_unknown_service_has_no_items(tmp_path: Path) -> None:
+    cfg = tmp_path / "pricing.json"
+    _write_config(cfg, 4.0)
+    result = PricingEngine(cfg).calculate({"service": "solar", "qty": 3})
+    assert result == {"items": [], "surcharges": {}, "total": 0.0}
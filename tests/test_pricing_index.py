@@ -0,0 +1,94 @@
+import difflib
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+import logic.pricing_rules as pricing_rules
+from modular_ai_agent.memory import pricing_index
+from modular_ai_agent.memory.load_pricing import ingest
+from modular_ai_agent.memory.pricing_index import (
+    PricingIndex,
+    load_pricing_index,
+    rebuild_pricing_index,
+)
+
+
+def _found(index: PricingIndex, material: str) -> Dict[str, Any]:
+    record = index.lookup(material)
+    assert record is not None, material
+    return record
+
+
+def test_lookup_exact_plural_and_fuzzy() -> None:
+    index = PricingIndex()
+    index.add("Epoxy", 50, "USD")
+    index.add("polyurethane", 70, "USD")
+    assert _found(index, "epoxy")["price_per_m2"] == 50
+    assert _found(index, "  EPOXY ")["material"] == "Epoxy"
+    assert _found(index, "polyurethanes")["price_per_m2"] == 70
+    assert _found(index, "epoxies")["price_per_m2"] == 50
+    assert _found(index, "polyurethan")["price_per_m2"] == 70
+    assert index.lookup("solar") is None
+    assert index.lookup("") is None
+
+
+def test_fuzzy_miss_scores_only_trigram_candidates(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    index = PricingIndex()
+    for i in range(5000):
+        index.add(f"material {i}", i)
+    index.add("travertine", 120)
+    assert index.lookup("tile") is None
+    scored: List[Any] = []
+    real = difflib.SequenceMatcher
+
+    def counting(*args: Any) -> Any:
+        scored.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(difflib, "SequenceMatcher", counting)
+    assert _found(index, "travertin")["price_per_m2"] == 120
+    assert _found(index, "materials 17")["price_per_m2"] == 17
+    assert len(scored) <= 2 * pricing_index.FUZZY_CANDIDATES
+
+
+def test_ingest_writes_sidecar(tmp_path: Path) -> None:
+    csv_path = tmp_path / "pricing.csv"
+    csv_path.write_text("material,price_per_m2,currency\nepoxy,42,USD\n")
+    store = tmp_path / "vs"
+    ingest(str(csv_path), str(store))
+    assert _found(load_pricing_index(store), "epoxy")["price_per_m2"] == 42
+
+    csv_path.write_text("material,price_per_m2,currency\nslate,90,EUR\n")
+    ingest(str(csv_path), str(store))
+    index = load_pricing_index(store)
+    assert {r["material"] for r in index.records.values()} == {"epoxy", "slate"}
+
+    (store / "pricing_index.json").unlink()
+    assert len(rebuild_pricing_index(store)) == 2
+
+
+def test_fallback_uses_index_before_memory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index = PricingIndex()
+    index.add("epoxy", 42, "USD")
+    index.save(tmp_path)
+    monkeypatch.setattr(pricing_rules, "PRICING_STORE_PATH", tmp_path)
+    searches: List[str] = []
+
+    def fake_search(query: str) -> str:
+        searches.append(query)
+        return "none"
+
+    monkeypatch.setattr(pricing_rules, "memory_search", fake_search)
+
+    result = pricing_rules.calculate_price({"service": "epoxy", "qty": 2})
+    assert result["memory_result"] == "epoxy costs 42 USD per m²."
+    assert searches == []
+
+    pricing_rules.calculate_price({"service": "solar", "qty": 2})
+    pricing_rules.calculate_price({"service": "solar", "qty": 5})
+    assert searches == ["doc_type:pricing price per m2 solar"]
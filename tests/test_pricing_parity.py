@@ -0,0 +1,102 @@
+"""Differential tests: agent pricing and llama3 fallback share one kernel."""
+
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from llama3_model.inference import generate_quote
+from llama3_model.model import Llama3QuoteModel
+from llama3_model.utils import condition_logic
+from llama3_model.utils.condition_logic import apply_conditions, parse_input
+from logic.job_parser import parse_prompt
+from logic.pricing_engine import PricingEngine
+from logic.pricing_rules import calculate_price
+
+SERVICES = ["window", "pressure", "solar", "gutter", ""]
+PROMPT_PARTS = [
+    "clean {n} windows",
+    "pressure wash {n} large areas",
+    "power wash the driveway",
+    "{n} small windows, heavy soiling",
+    "two storey house, {n} windows, urgent",
+    "rush job: {n} windows on the 2 story place",
+    "quote for {n} solar panels",
+]
+
+
+def _scopes(n: int, seed: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    scopes = []
+    for _ in range(n):
+        scope: Dict[str, Any] = {
+            "service": rng.choice(SERVICES),
+            "qty": rng.randint(1, 300),
+            "size": rng.choice(["", "large", "Large", "small"]),
+            "storey": rng.randint(1, 3),
+        }
+        surcharges: Dict[str, Any] = {}
+        for key in ("urgent", "heavy_soil", "two_storey", "ladder"):
+            roll = rng.random()
+            if roll < 0.2:
+                surcharges[key] = True
+            elif roll < 0.3:
+                surcharges[key] = rng.choice([0, 1, 2, 2.5])
+            elif roll < 0.35:
+                surcharges[key] = False
+        if surcharges:
+            scope["surcharges"] = surcharges
+        scopes.append(scope)
+    return scopes
+
+
+def _prompts(n: int, seed: int = 5) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(PROMPT_PARTS).format(n=rng.randint(1, 60)) for _ in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def _no_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("logic.pricing_rules.memory_search", lambda query: "no memory")
+
+
+def _agent(scope: Dict[str, Any]) -> Dict[str, Any]:
+    result = calculate_price(scope)
+    result.pop("memory_result", None)
+    return result
+
+
+def test_entry_points_agree_on_scopes() -> None:
+    for scope in _scopes(3000):
+        assert _agent(scope) == apply_conditions(scope), scope
+
+
+def test_entry_points_agree_on_parsed_prompts() -> None:
+    for prompt in _prompts(500):
+        for scope in (parse_prompt(prompt), parse_input(prompt)):
+            if scope:
+                assert _agent(scope) == apply_conditions(scope), prompt
+
+
+def test_numeric_surcharge_scales_amount() -> None:
+    scope = {"service": "window", "qty": 10, "surcharges": {"heavy_soil": 2}}
+    assert _agent(scope)["total"] == 40 + 1.5 * 2
+    assert apply_conditions(scope)["total"] == 40 + 1.5 * 2
+
+
+def test_generate_quote_prices_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = {"parse": 0, "price": 0}
+    parse, calculate = condition_logic.parse_input, PricingEngine.calculate
+
+    def counted_parse(text: str) -> Dict[str, Any]:
+        calls["parse"] += 1
+        return parse(text)
+
+    def counted_price(self: PricingEngine, scope: Dict[str, Any]) -> Dict[str, Any]:
+        calls["price"] += 1
+        return calculate(self, scope)
+
+    monkeypatch.setattr(condition_logic, "parse_input", counted_parse)
+    monkeypatch.setattr(PricingEngine, "calculate", counted_price)
+    generate_quote("clean 10 windows, urgent", Llama3QuoteModel())
+    assert calls == {"parse": 1, "price": 1}
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app_quote_api
+from agents import quote_agent, weblink_agent
+from modular_ai_agent.memory.embedding_batcher import batcher_of, micro_batch
+from tests.test_quote_embedder import KeywordEmbeddings
+from vector_store.quote_embedder import QuoteVectorStore
+
+
+def test_similar_quotes_reuse_shared_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    data = tmp_path / "quotes.jsonl"
+    data.write_text(
+        json.dumps({"prompt": "clean the gutter"})
+        + "\n"
+        + json.dumps({"prompt": "10 windows"})
+        + "\n",
+        encoding="utf-8",
+    )
+    model = KeywordEmbeddings()
+    store = QuoteVectorStore(
+        data_path=str(data),
+        persist_dir=str(tmp_path / "chroma"),
+        embedding_model=model,
+    )
+
+    def _no_new_stores(*args: Any, **kwargs: Any) -> QuoteVectorStore:
+        raise AssertionError("store must not be rebuilt per request")
+
+    monkeypatch.setattr(app_quote_api, "QuoteVectorStore", _no_new_stores)
+    monkeypatch.setattr(app_quote_api.app.state, "quote_store", store, raising=False)
+    # Startup wraps the weblink embedder; restore it for other tests.
+    monkeypatch.setattr(weblink_agent, "_embedder", weblink_agent._embedder)
+
+    with TestClient(app_quote_api.app) as client:
+        # Warm-up at startup already indexed the log.
+        assert store.count() == 2
+        for _ in range(3):
+            response = client.post(
+                "/quote/similar", json={"prompt": "gutter", "top_k": 1}
+            )
+            assert response.status_code == 200
+            assert response.json()["matches"][0]["content"] == "clean the gutter"
+    assert model.embedded == ["clean the gutter", "10 windows"]
+
+
+def test_single_flight_coalesces_concurrent_calls() -> None:
+    flights = app_quote_api.SingleFlight()
+    started = 0
+
+    async def work() -> Dict[str, float]:
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return {"total": 40.0}
+
+    async def main() -> List[Dict[str, float]]:
+        same = [flights.do("a", work) for _ in range(5)]
+        return await asyncio.gather(*same, flights.do("b", work))
+
+    results = asyncio.run(main())
+    assert results == [{"total": 40.0}] * 6
+    assert started == 2
+    assert (flights.calls, flights.coalesced) == (2, 4)
+    assert flights._inflight == {}
+
+
+def test_quote_endpoint_offloads_and_keeps_schema(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+    release = threading.Event()
+
+    def fake_run_quote(prompt: str) -> str:
+        calls.append(prompt)
+        release.wait(5)
+        return json.dumps({"customer": "C", "items": [], "total": 12.5})
+
+    monkeypatch.setenv("QUOTE_API_WARMUP", "0")
+    monkeypatch.setattr(app_quote_api, "run_quote", fake_run_quote)
+    with TestClient(app_quote_api.app) as client:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(client.post, "/quote", json={"prompt": "10 windows"})
+                for _ in range(4)
+            ]
+            time.sleep(0.2)
+            release.set()
+            responses = [f.result() for f in futures]
+    assert all(r.status_code == 200 for r in responses)
+    assert responses[0].json() == {
+        "customer": "C",
+        "items": [],
+        "total": 12.5,
+        "memory_result": None,
+    }
+    assert calls == ["10 windows"]
+
+
+def test_stats_reports_batching_and_coalescing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    data = tmp_path / "quotes.jsonl"
+    data.write_text(json.dumps({"prompt": "10 windows"}) + "\n", encoding="utf-8")
+    store = QuoteVectorStore(
+        data_path=str(data),
+        persist_dir=str(tmp_path / "chroma"),
+        embedding_model=micro_batch(KeywordEmbeddings()),
+    )
+    monkeypatch.setattr(app_quote_api.app.state, "quote_store", store, raising=False)
+    monkeypatch.setattr(weblink_agent, "_embedder", weblink_agent._embedder)
+
+    with TestClient(app_quote_api.app) as client:
+        client.post("/quote/similar", json={"prompt": "windows", "top_k": 1})
+        stats = client.get("/stats").json()
+    assert stats["single_flight"]["in_flight"] == 0
+    quotes = stats["embedding_batches"]["quotes"]
+    assert quotes["texts"] == 2  # warm-up query plus the request
+    assert set(stats["embedding_batches"]) == {"quotes", "weblink"}
+    assert "hit_rate" in stats["embedding_cache"]
+    assert "hit_rate" in stats["quote_cache"]
+
+
+def test_weblink_batcher_is_wired_without_warm_up(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("QUOTE_API_WARMUP", "0")
+    monkeypatch.setattr(weblink_agent, "_embedder", None)
+    for _ in range(2):  # a re-entered lifespan gets a fresh batcher
+        with TestClient(app_quote_api.app):
+            assert weblink_agent.current_embedder() is None  # nothing loaded yet
+            batcher = batcher_of(weblink_agent._get_embedder())
+            assert batcher is not None and not batcher._closed
+        assert weblink_agent.current_embedder() is None
+        assert batcher._closed
+
+
+def _isolated_weblink(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("QUOTE_API_WARMUP", "0")
+    monkeypatch.setattr(weblink_agent, "GRAPH_PATH", tmp_path / "graph.json")
+    monkeypatch.setattr(weblink_agent, "GRAPH_DIR", tmp_path / "graph")
+    monkeypatch.setattr(weblink_agent, "_store", None)
+    monkeypatch.setattr(weblink_agent, "_index", None)
+
+
+def test_batch_streams_ndjson_with_inline_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _isolated_weblink(tmp_path, monkeypatch)
+    monkeypatch.setattr(app_quote_api, "BATCH_CHUNK", 2)
+    body = ["12 large windows, urgent", {"prompt": "Pressure wash 5 areas"}, 42]
+
+    with TestClient(app_quote_api.app) as client:
+        response = client.post("/quote/batch", json=body)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        ndjson = b'"10 windows"\n{not json}\n{"prompt": "3 solar panels"}'
+        streamed = client.post(
+            "/quote/batch",
+            content=ndjson,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        streamed_lines = [json.loads(line) for line in streamed.text.splitlines()]
+
+        assert client.post("/quote/batch", json={"prompt": "x"}).status_code == 422
+
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["items"][0]["qty"] == 12
+    assert lines[0]["total"] > lines[0]["items"][0]["subtotal"]
+    assert lines[1]["items"][0]["service"] == "pressure"
+    assert lines[1]["related"][0][1] == "Pressure wash 5 areas"
+    assert "error" in lines[2]
+
+    assert [line["index"] for line in streamed_lines] == [0, 1, 2]
+    assert streamed_lines[0]["items"][0]["qty"] == 10
+    assert "error" in streamed_lines[1]
+    assert streamed_lines[2]["items"] == []
+    assert "memory_result" in streamed_lines[2]
+
+
+def test_batch_failures_stay_per_item(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _isolated_weblink(tmp_path, monkeypatch)
+    monkeypatch.setattr(quote_agent, "query_related_batch", _boom)
+    # A failing related lookup still returns the quotes, without links.
+    quotes = quote_agent.run_quote_batch(["10 windows", "Pressure wash 5 areas"])
+    assert [q["related"] for q in quotes] == [[], []]
+    assert quotes[0]["items"][0]["qty"] == 10
+
+    def flaky_batch(prompts: List[str]) -> List[Dict[str, float]]:
+        if "bad" in prompts:
+            raise RuntimeError("boom")
+        return [{"total": 1.0} for _ in prompts]
+
+    monkeypatch.setattr(app_quote_api, "run_quote_batch", flaky_batch)
+    lines = app_quote_api._quote_chunk([(0, "ok"), (1, "bad"), (2, "fine")])
+    parsed = [json.loads(line) for line in lines.splitlines()]
+    assert parsed == [
+        {"index": 0, "total": 1.0},
+        {"index": 1, "error": "boom"},
+        {"index": 2, "total": 1.0},
+    ]
+
+
+def _boom(*args: object) -> None:
+    raise RuntimeError("index unavailable")
@@ -0,0 +1,80 @@
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import logic.pricing_rules as pricing_rules
+from logic.job_parser import parse_prompt
+from logic.pricing_engine import PricingEngine
+from logic.quote_cache import QuoteCache, canonical_scope
+
+
+def test_reworded_prompts_share_a_key() -> None:
+    a = canonical_scope(parse_prompt("Quote 12 large windows, urgent please"))
+    b = canonical_scope(parse_prompt("need 12 LARGE windows cleaned asap, urgent"))
+    assert a == b
+    assert canonical_scope({"service": "window", "qty": 3}) == canonical_scope(
+        {"service": "window", "qty": "3", "size": "", "storey": 1}
+    )
+    flag = {"service": "pressure", "surcharges": {"heavy_soil": True}}
+    scaled = {"service": "pressure", "surcharges": {"heavy_soil": 1}}
+    assert canonical_scope(flag) != canonical_scope(scaled)
+    assert canonical_scope({"qty": "lots"}) is None
+
+
+def test_ttl_lru_and_version_invalidation(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("logic.quote_cache.time.monotonic", lambda: now[0])
+    cache = QuoteCache(max_entries=2, ttl=10)
+    cache.put("a", 1, {"total": 1.0})
+    cache.put("b", 1, {"total": 2.0})
+    assert cache.get("a", 1) == {"total": 1.0}
+    cache.put("c", 1, {"total": 3.0})  # evicts "b", the least recently used
+    assert cache.get("b", 1) is None
+
+    got = cache.get("a", 1)
+    assert got is not None
+    got["total"] = 99.0  # callers get copies
+    assert cache.get("a", 1) == {"total": 1.0}
+
+    now[0] += 11
+    assert cache.get("a", 1) is None
+    cache.put("a", 1, {"total": 1.0})
+    assert cache.get("a", 2) is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_calculate_price_skips_memory_and_reloads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cfg = tmp_path / "pricing.json"
+    cfg.write_text(json.dumps({"window": {"base_price": 4.0}}), encoding="utf-8")
+    monkeypatch.setattr(pricing_rules, "_engine", PricingEngine(cfg, 0.0))
+    searches: List[str] = []
+
+    def fake_search(query: str) -> str:
+        searches.append(query)
+        return "12 per m2"
+
+    monkeypatch.setattr(pricing_rules, "memory_search", fake_search)
+
+    for _ in range(3):
+        assert (
+            pricing_rules.calculate_price({"service": "solar", "qty": 2})[
+                "memory_result"
+            ]
+            == "12 per m2"
+        )
+    assert len(searches) == 1
+    assert pricing_rules.calculate_price({"service": "window", "qty": 2})["total"] == 8
+
+    cfg.write_text(json.dumps({"window": {"base_price": 5.0}}), encoding="utf-8")
+    st = cfg.stat()
+    os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert pricing_rules.calculate_price({"service": "window", "qty": 2})["total"] == 10
+    stats = pricing_rules.quote_cache_stats()
+    assert stats["hits"] == 2
+    assert stats["invalidations"] == 1
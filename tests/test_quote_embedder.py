@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from vector_store.quote_embedder import QuoteVectorStore
+
+
+class KeywordEmbeddings(Embeddings):
+    """Deterministic toy embeddings: counts of a few keywords."""
+
+    WORDS = ("window", "pressure", "gutter", "roof")
+
+    def __init__(self) -> None:
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [[t.count(w) + 0.01 for w in self.WORDS] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [text.count(w) + 0.01 for w in self.WORDS]
+
+
+def _append(path: Path, *prompts: str) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for prompt in prompts:
+            f.write(json.dumps({"prompt": prompt, "result": {"total": 1}}) + "\n")
+
+
+def _store(tmp_path: Path, model: Embeddings) -> QuoteVectorStore:
+    return QuoteVectorStore(
+        data_path=str(tmp_path / "quotes.jsonl"),
+        persist_dir=str(tmp_path / "chroma"),
+        embedding_model=model,
+    )
+
+
+def test_build_index_only_embeds_new_lines(tmp_path: Path) -> None:
+    data = tmp_path / "quotes.jsonl"
+    model = KeywordEmbeddings()
+    _append(data, "10 windows", "pressure wash patio")
+    vs = _store(tmp_path, model)
+
+    assert vs.build_index() == 2
+    assert vs.build_index() == 0
+    _append(data, "clean the gutter")
+    assert vs.build_index() == 1
+    assert model.embedded == ["10 windows", "pressure wash patio", "clean the gutter"]
+    assert vs.count() == 3
+    assert vs.query("gutter", top_k=1)[0]["content"] == "clean the gutter"
+
+    # A fresh instance (new process) resumes from the persisted high-water mark.
+    assert _store(tmp_path, model).build_index() == 0
+
+
+def test_rewritten_log_triggers_full_rebuild(tmp_path: Path) -> None:
+    data = tmp_path / "quotes.jsonl"
+    model = KeywordEmbeddings()
+    _append(data, "10 windows", "pressure wash patio")
+    vs = _store(tmp_path, model)
+    vs.build_index()
+
+    data.write_text("")
+    _append(data, "roof moss")
+    assert vs.build_index() == 1
+    assert vs.count() == 1
+    assert vs.query("roof", top_k=1)[0]["content"] == "roof moss"
+
+
+def test_partial_trailing_line_is_deferred(tmp_path: Path) -> None:
+    data = tmp_path / "quotes.jsonl"
+    _append(data, "10 windows")
+    with data.open("a", encoding="utf-8") as f:
+        f.write('{"prompt": "half wri')
+    vs = _store(tmp_path, KeywordEmbeddings())
+    assert vs.build_index() == 1
+    with data.open("a", encoding="utf-8") as f:
+        f.write('tten"}\n')
+    assert vs.build_index() == 1
+
+
+def test_final_record_without_newline_is_indexed(tmp_path: Path) -> None:
+    data = tmp_path / "quotes.jsonl"
+    _append(data, "10 windows")
+    with data.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"prompt": "roof moss"}))  # no trailing newline
+    vs = _store(tmp_path, KeywordEmbeddings())
+    assert vs.build_index() == 2
+    assert vs.build_index() == 0
+    with data.open("a", encoding="utf-8") as f:
+        f.write("\n")  # a later writer first terminates the line
+    _append(data, "clean the gutter")
+    assert vs.build_index() == 1
+    assert vs.count() == 3
+
+
+def test_repeated_ids_in_one_batch_do_not_block_indexing(tmp_path: Path) -> None:
+    data = tmp_path / "quotes.jsonl"
+    with data.open("w", encoding="utf-8") as f:
+        for id_, prompt in [
+            ("q1", "10 windows"),
+            ("q1", "roof moss"),
+            ("q2", "gutter"),
+        ]:
+            f.write(json.dumps({"id": id_, "prompt": prompt}) + "\n")
+    vs = _store(tmp_path, KeywordEmbeddings())
+    vs.build_index()
+    assert vs.count() == 2
+    assert vs.collection.get(ids=["q1"])["documents"] == ["10 windows"]
+    _append(data, "clean the gutter")
+    assert vs.build_index() == 1
+    assert vs.count() == 3
@@ -0,0 +1,134 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from storage import job_store
+from storage.job_store import JobStore, open_job_store
+from storage.sqlite_job_store import SQLiteJobStore, migrate
+from tests.test_job_store import _quote
+
+
+def test_matches_jsonl_store_queries(tmp_path: Path) -> None:
+    jsonl = JobStore(tmp_path / "quotes.jsonl")
+    sqlite = SQLiteJobStore(tmp_path / "quotes.db")
+    records = [
+        _quote("window", 40.0, 1),
+        _quote("pressure", 120.0, 2),
+        {"prompt": "no result"},
+        _quote("window", 75.5, 3),
+    ]
+    for store in (jsonl, sqlite):
+        assert [store.save(r) for r in records[:2]] == [0, 1]
+        assert store.commit(records[2:], fsync=True) == [2, 3]
+
+    queries: List[Dict[str, Any]] = [
+        {"service": "window"},
+        {"service": "gutter"},
+        {"min_total": 50, "max_total": 130},
+        {"since": "2024-01-02", "until": "2024-01-03"},
+        {"until": "2030-01-01"},
+        {"service": "window", "limit": 1, "offset": 1},
+    ]
+    for query in queries:
+        assert sqlite.filter(**query) == jsonl.filter(**query), query
+    for store in (jsonl, sqlite):
+        with pytest.raises(ValueError):
+            store.filter(since="bad")
+    assert len(sqlite) == 4
+    assert sqlite.get(3) == jsonl.get(3)
+    assert "created_at" in sqlite.get(2)
+    with pytest.raises(IndexError):
+        sqlite.get(4)
+    assert sqlite.page(1, 2) == jsonl.page(1, 2)
+    assert list(sqlite.iter_records(["result.total"], start=2)) == [
+        {"result.total": None},
+        {"result.total": 75.5},
+    ]
+    sqlite.close()
+    assert SQLiteJobStore(tmp_path / "quotes.db").list_all() == jsonl.list_all()
+
+
+def test_threads_share_store_with_own_connections(tmp_path: Path) -> None:
+    store = SQLiteJobStore(tmp_path / "quotes.db")
+    with store.writer(max_batch=40, flush_interval=0.01) as writer:
+
+        def work(t: int) -> None:
+            for i in range(100):
+                writer.write(_quote("gutter", float(t * 100 + i), 4))
+            store.filter(service="gutter")  # reads while others write
+
+        threads = [threading.Thread(target=work, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(store) == 400
+    assert len(store._connections) > 1
+    totals = sorted(r["result"]["total"] for r in store.iter_records())
+    assert totals == [float(n) for n in range(400)]
+    store.close()
+
+
+def test_migrate_is_resumable(tmp_path: Path) -> None:
+    source = tmp_path / "quotes.jsonl"
+    source.write_text(
+        "".join(json.dumps(_quote("roof", float(i), 5)) + "\n" for i in range(5))
+        + "{corrupt\n",
+        encoding="utf-8",
+    )
+    dest = tmp_path / "quotes.db"
+    assert migrate(source, dest, batch=2) == (5, 5)
+    with source.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(_quote("roof", 5.0, 6)) + "\n")
+    assert migrate(source, dest) == (1, 6)
+    store = SQLiteJobStore(dest)
+    assert [r["result"]["total"] for r in store.list_all()] == [0.0, 1, 2, 3, 4, 5]
+    store.close()
+
+
+def test_migrate_keeps_dates_and_ignores_app_rows(tmp_path: Path) -> None:
+    source = tmp_path / "quotes.jsonl"
+    legacy = [{"prompt": f"job {i}", "result": {"total": float(i)}} for i in range(3)]
+    source.write_text(
+        "".join(json.dumps(r) + "\n" for r in legacy)
+        + json.dumps(_quote("roof", 3.0, 7)),  # last line has no newline
+        encoding="utf-8",
+    )
+    dest = tmp_path / "quotes.db"
+    store = SQLiteJobStore(dest)
+    store.save({"prompt": "written by the app"})
+    store.close()
+
+    assert migrate(source, dest, batch=2) == (4, 5)
+    assert migrate(source, dest) == (0, 5)
+    store = SQLiteJobStore(dest)
+    assert store.list_all()[1:] == legacy + [_quote("roof", 3.0, 7)]
+    assert store.filter(since="2024-02-01") == [store.get(0)]
+    assert store.filter(until="2024-02-01") == [_quote("roof", 3.0, 7)]
+    store.close()
+
+
+def test_open_job_store_selects_backend(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = tmp_path / "job_store.json"
+    config.write_text(
+        json.dumps({"backend": "sqlite", "path": str(tmp_path / "jobs.db")}),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(job_store, "CONFIG_PATH", config)
+    monkeypatch.delenv("JOB_STORE_BACKEND", raising=False)
+    monkeypatch.delenv("JOB_STORE_PATH", raising=False)
+    store = open_job_store()
+    assert isinstance(store, SQLiteJobStore)
+    assert store.path == tmp_path / "jobs.db"
+    store.close()
+
+    monkeypatch.setenv("JOB_STORE_BACKEND", "jsonl")
+    monkeypatch.setenv("JOB_STORE_PATH", str(tmp_path / "jobs.jsonl"))
+    assert isinstance(open_job_store(), JobStore)
+    with pytest.raises(ValueError):
+        open_job_store(backend="csv")
@@ -1,7 +1,11 @@
 import importlib
 import os
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
 
 def test_index_and_query_roundtrip(tmp_path: Path) -> None:
     os.environ["WEBLINK_GRAPH_PATH"] = str(tmp_path / "graph.json")
@@ -16,3 +20,65 @@ def test_index_and_query_roundtrip(tmp_path: Path) -> None:
     first_id, snippet = results[0]
     assert first_id == "1"
     assert "faucet" in snippet
+
+
+def test_import_is_lazy(tmp_path: Path) -> None:
+    os.environ["WEBLINK_GRAPH_PATH"] = str(tmp_path / "graph.json")
+    module = importlib.reload(importlib.import_module("agents.weblink_agent"))
+
+    assert module._embedder is None
+    assert module._index is None
+    assert module.query_related("anything") == []
+    assert module._embedder is None  # empty graph needs no embedding
+
+
+def test_graph_survives_restart(tmp_path: Path) -> None:
+    os.environ["WEBLINK_GRAPH_PATH"] = str(tmp_path / "graph.json")
+    module = importlib.reload(importlib.import_module("agents.weblink_agent"))
+    module.index_issue({"id": "7", "description": "cracked window pane"})
+    module.index_issue({"id": "8", "description": "mossy driveway"})
+    module.flush()
+
+    module = importlib.reload(module)
+    index = module._get_index()
+    assert len(index) == 2
+    assert {node_id for node_id, _, _ in index.items()} == {"7", "8"}
+    assert (tmp_path / "graph" / "meta.json").exists()
+
+
+def test_batch_index_and_query(tmp_path: Path) -> None:
+    os.environ["WEBLINK_GRAPH_PATH"] = str(tmp_path / "graph.json")
+    module = importlib.reload(importlib.import_module("agents.weblink_agent"))
+    module.index_issues(
+        [
+            {"id": "a", "description": "blocked gutter"},
+            {"id": "b", "description": "streaky windows"},
+        ]
+    )
+    related = module.query_related_batch(["streaky windows", "blocked gutter"], 1)
+    assert [r[0][0] for r in related] == ["b", "a"]
+    assert module.query_related_batch([]) == []
+
+
+def test_store_is_created_once_under_concurrency(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    os.environ["WEBLINK_GRAPH_PATH"] = str(tmp_path / "graph.json")
+    module = importlib.reload(importlib.import_module("agents.weblink_agent"))
+    real = module.SegmentStore
+    created = []
+
+    def slow_store(*args: object, **kwargs: object) -> object:
+        time.sleep(0.05)
+        created.append(real(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(module, "SegmentStore", slow_store)
+    threads = [threading.Thread(target=module._get_store) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    module.index_issue({"id": "1", "description": "leaky faucet"})
+    assert module.query_related("faucet")[0][0] == "1"
@@ -0,0 +1,55 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from agents.weblink_index import IssueIndex
+
+
+def _brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> List[int]:
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    scores = vectors @ query / norms
+    return sorted(range(len(vectors)), key=lambda i: -scores[i])[:k]
+
+
+def test_top_k_matches_brute_force() -> None:
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 32))
+    index = IssueIndex()
+    for i, vec in enumerate(vectors):
+        index.add(str(i), f"issue {i}", vec.tolist())
+
+    query = rng.normal(size=32)
+    expected = [str(i) for i in _brute_force(vectors, query, 5)]
+    assert [node_id for node_id, _ in index.search(query, 5)] == expected
+
+
+def test_replacing_an_issue_retires_the_old_row() -> None:
+    index = IssueIndex()
+    index.add("a", "first", [1.0, 0.0])
+    index.add("b", "second", [0.0, 1.0])
+    index.add("a", "moved", [1.0, 1.0])
+
+    assert len(index) == 2
+    assert index.row_count == 3
+    assert index.search([1.0, 0.0], 3) == [("a", "moved"), ("b", "second")]
+
+
+def test_ann_candidates_are_rescored() -> None:
+    pytest.importorskip("faiss")
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    index = IssueIndex(ann_threshold=100)
+    for i, vec in enumerate(vectors):
+        index.add(str(i), "", vec)
+
+    query = vectors[42]
+    assert index.search(query, 3)[0][0] == "42"
+    assert index._ann is not None
+
+
+def test_dimension_mismatch_is_rejected() -> None:
+    index = IssueIndex()
+    index.add("a", "", [1.0, 0.0])
+    with pytest.raises(ValueError):
+        index.add("b", "", [1.0, 0.0, 0.0])
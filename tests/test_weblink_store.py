@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from agents.weblink_index import IssueIndex
+from agents.weblink_store import SegmentStore
+
+
+def _fill(store: SegmentStore, index: IssueIndex, count: int, dim: int = 8) -> None:
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        vec = index.add(str(i), f"issue {i}", rng.normal(size=dim))
+        store.append(str(i), f"issue {i}", vec)
+
+
+def test_append_and_mmap_reload(tmp_path: Path) -> None:
+    store = SegmentStore(tmp_path / "graph", fsync_every=4)
+    index = IssueIndex()
+    _fill(store, index, 10)
+    store.close()
+
+    reloaded = SegmentStore(tmp_path / "graph").load()
+    assert isinstance(reloaded._base, np.memmap)
+    assert reloaded.ids == index.ids
+    assert np.allclose(reloaded._base, index._tail[:10])
+
+
+def test_torn_tail_is_truncated(tmp_path: Path) -> None:
+    directory = tmp_path / "graph"
+    store = SegmentStore(directory)
+    index = IssueIndex()
+    _fill(store, index, 3)
+    store.close()
+    # Simulate a crash mid-append: an extra embedding row without its log line
+    # and a half-written log line.
+    with open(directory / "embeddings.0.f32", "ab") as f:
+        f.write(b"\x00" * 8 * 4)
+    with open(directory / "nodes.0.jsonl", "ab") as f:
+        f.write(b'{"id": "3", "sni')
+
+    store = SegmentStore(directory)
+    index = store.load()
+    assert index.ids == ["0", "1", "2"]
+    vec = index.add("3", "fresh", np.ones(8))
+    store.append("3", "fresh", vec)
+    store.close()
+    assert SegmentStore(directory).load().ids == ["0", "1", "2", "3"]
+
+
+def test_compaction_drops_retired_rows(tmp_path: Path) -> None:
+    directory = tmp_path / "graph"
+    store = SegmentStore(directory, compact_ratio=0.5)
+    index = IssueIndex()
+    _fill(store, index, 40)
+    _fill(store, index, 40)  # re-index every issue
+    assert store.should_compact(index)
+
+    index = store.compact(index)
+    assert index.row_count == len(index) == 40
+    assert json.loads((directory / "meta.json").read_text())["generation"] == 1
+    assert not (directory / "embeddings.0.f32").exists()
+    assert SegmentStore(directory).load().ids == [str(i) for i in range(40)]
+
+
+def test_stores_sharing_a_directory_keep_every_row(tmp_path: Path) -> None:
+    # Two stores on one directory stand in for two API worker processes.
+    directory = tmp_path / "graph"
+    first, second = SegmentStore(directory), SegmentStore(directory)
+    a, b = first.load(), second.load()
+    rng = np.random.default_rng(0)
+    for i in range(6):
+        store, index = (first, a) if i % 2 else (second, b)
+        store.append(str(i), f"issue {i}", index.add(str(i), "", rng.normal(size=8)))
+    # A crash mid-append leaves an embedding row without its node line.
+    with open(directory / "embeddings.0.f32", "ab") as f:
+        f.write(b"\x00" * 8 * 4)
+    six = rng.normal(size=8)
+    second.append("6", "issue 6", b.add("6", "", six))
+
+    a = first.compact(a)  # picks up the other store's rows from disk
+    assert sorted(a.ids) == [str(i) for i in range(7)]
+    second.append("7", "issue 7", b.add("7", "", rng.normal(size=8)))
+    first.close()
+    second.close()
+
+    reloaded = SegmentStore(directory).load()
+    assert sorted(reloaded.ids) == [str(i) for i in range(8)]
+    assert not (directory / "nodes.0.jsonl").exists()
+    assert reloaded.search(list(six), 1)[0][0] == "6"
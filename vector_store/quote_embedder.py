@@ -1,6 +1,8 @@
+import hashlib
 import json
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 from langchain.embeddings import HuggingFaceEmbeddings
 
@@ -14,9 +16,12 @@ import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
+from modular_ai_agent.memory.embedding_cache import CachedEmbeddings
+
+CHECKSUM_WINDOW = 4096
 
-class QuoteVectorStore:
 
+class QuoteVectorStore:
 
     def count(self) -> int:
         """Return the number of vectors in the collection."""
@@ -25,14 +30,19 @@ class QuoteVectorStore:
             return info if isinstance(info, int) else 0
         except Exception:
             return 0
+
     def __init__(
         self,
         data_path: str = "data/quotes.jsonl",
         persist_dir: str = "vector_store/chroma_index",
         embedding_type: Optional[str] = None,
+        embedding_model: Any = None,
+        batch_size: int = 256,
     ):
         self.data_path = data_path
         self.persist_dir = persist_dir
+        self.batch_size = batch_size
+        self._index_lock = threading.Lock()
         self.client = chromadb.PersistentClient(
             path=self.persist_dir, settings=Settings(allow_reset=True)
         )
@@ -42,30 +52,72 @@ class QuoteVectorStore:
             embedding_type
             or os.environ.get("QUOTE_EMBEDDING_TYPE", "huggingface").lower()
         )
-        if embedding_type == "openai" and OpenAIEmbeddings is not None:
-            self.embedding_model = OpenAIEmbeddings()
+        if embedding_model is not None:
+            self.embedding_model = embedding_model
+        elif embedding_type == "openai" and OpenAIEmbeddings is not None:
+            self.embedding_model = CachedEmbeddings(OpenAIEmbeddings())
         else:
-            self.embedding_model = HuggingFaceEmbeddings(
+            self.embedding_model = CachedEmbeddings(
+                HuggingFaceEmbeddings(
+                    model_name="all-MiniLM-L6-v2", model_kwargs={"device": "cpu"}
+                ),
                 model_name="all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"}
             )
 
-    def build_index(self) -> None:
-        if not os.path.exists(self.data_path):
-            return
-        with open(self.data_path, "r", encoding="utf-8") as f:
-            quotes = [json.loads(line) for line in f if line.strip()]
-        # Clear and re-add all (delete all docs by IDs)
+    def _state_path(self) -> str:
+        return os.path.join(self.persist_dir, "index_state.json")
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path(), "r", encoding="utf-8") as f:
+                state: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get("data_path") != os.path.abspath(self.data_path):
+            return {}
+        return state
+
+    def _save_state(self, offset: int, lines: int, checksum: str) -> None:
+        os.makedirs(self.persist_dir, exist_ok=True)
+        tmp = self._state_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "data_path": os.path.abspath(self.data_path),
+                    "offset": offset,
+                    "lines": lines,
+                    "checksum": checksum,
+                },
+                f,
+            )
+        os.replace(tmp, self._state_path())
+
+    def _checksum(self, offset: int) -> str:
+        """Hash the bytes just before ``offset`` to detect rewritten logs."""
+        start = max(0, offset - CHECKSUM_WINDOW)
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def _reset_collection(self) -> None:
         try:
-            all_docs = self.collection.get()
-            all_ids = all_docs.get("ids", [])
-            if all_ids:
-                self.collection.delete(ids=all_ids)
+            self.client.delete_collection("quotes")
         except Exception:
             pass
-        for i, quote in enumerate(quotes):
+        self.collection = self.client.get_or_create_collection("quotes")
+
+    def _add_batch(self, quotes: List[Tuple[int, Dict[str, Any]]]) -> None:
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Mapping[str, Any]] = []
+        seen: Set[str] = set()
+        for i, quote in quotes:
+            quote_id = str(quote.get("id", str(i)))
+            if quote_id in seen:
+                continue  # upsert rejects repeated ids; the first one wins
+            seen.add(quote_id)
             content = quote.get("content") or quote.get("prompt") or str(quote)
-            metadata = {"quote_id": quote.get("id", str(i))}
+            metadata: Dict[str, Any] = {"quote_id": quote.get("id", str(i))}
             for k, v in quote.items():
                 if k == "content":
                     continue
@@ -74,11 +126,77 @@ class QuoteVectorStore:
                     metadata[k] = json.dumps(v, ensure_ascii=False)
                 else:
                     metadata[k] = v
-            self.collection.add(
-                documents=[content],
-                metadatas=[metadata],
-                ids=[str(metadata["quote_id"])],
+            ids.append(quote_id)
+            documents.append(content)
+            metadatas.append(metadata)
+        self.collection.upsert(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=self.embedding_model.embed_documents(documents),
+        )
+
+    def build_index(self) -> int:
+        """Index quotes appended since the last call; return how many.
+
+        A high-water mark (byte offset, line count and a checksum of the
+        bytes before it) is kept next to the Chroma index. Unchanged logs are
+        skipped without reading them; a truncated or rewritten log triggers a
+        full rebuild.
+        """
+        if not os.path.exists(self.data_path):
+            return 0
+        with self._index_lock:
+            size = os.path.getsize(self.data_path)
+            state = self._load_state()
+            offset = int(state.get("offset", 0))
+            lines = int(state.get("lines", 0))
+            resume = (
+                bool(state)
+                and offset <= size
+                and state.get("checksum") == self._checksum(offset)
+                and (lines == 0 or self.count() > 0)
             )
+            if resume and offset == size:
+                return 0
+            if not resume:
+                self._reset_collection()
+                offset = lines = 0
+
+            added = 0
+            batch: List[Tuple[int, Dict[str, Any]]] = []
+            with open(self.data_path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        # A final line without a newline is indexed only when it
+                        # is a whole record and the log stopped growing;
+                        # otherwise a writer is mid-append: pick it up next time.
+                        try:
+                            json.loads(raw)
+                        except ValueError:
+                            break
+                        if os.fstat(f.fileno()).st_size != size:
+                            break
+                    offset += len(raw)
+                    if not raw.strip():
+                        continue
+                    batch.append((lines, json.loads(raw)))
+                    lines += 1
+                    if len(batch) >= self.batch_size:
+                        self._add_batch(batch)
+                        added += len(batch)
+                        batch = []
+            if batch:
+                self._add_batch(batch)
+                added += len(batch)
+            self._save_state(offset, lines, self._checksum(offset))
+            return added
+
+    def warm_up(self) -> None:
+        """Catch up the index and run one query so the model is loaded."""
+        self.build_index()
+        self.embedding_model.embed_query("warm up")
 
     def query(self, prompt: str, top_k: int = 3) -> List[Dict[str, Any]]:
         # Compute embedding using HuggingFaceEmbeddings (offline)